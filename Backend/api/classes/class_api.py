@@ -1,12 +1,13 @@
-from fastapi import APIRouter, Depends, HTTPException
-from typing import List
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import ORJSONResponse
+from typing import List, Optional
 from management.auth import get_current_user
-from dao.classes.interface import ClassCreateRequest, ClassJoinRequest, ClassResponse, ClassMemberResponse  # Changed 'class' to 'classes'
-from management.management import create_class, join_class, get_user_classes
-from dao.classes.class_dao import ClassDAO  # Changed 'class' to 'classes'
+from management.exports import export_response
+from management.rate_limit import limit_by_user, BULK_ENROLL_POLICY
+from dao.classes.interface import ClassCreateRequest, ClassJoinRequest, ClassResponse, ClassMemberResponse, ClassBulkEnrollRequest, ClassBulkEnrollResponse  # Changed 'class' to 'classes'
+from management.management import create_class, join_class, get_user_classes, remove_class_member, leave_class, delete_class, bulk_enroll, export_class_roster, ROSTER_COLUMNS, get_class_members
 
 router = APIRouter()
-class_dao = ClassDAO()
 
 @router.post("/create", response_model=ClassResponse)
 async def create(class_data: ClassCreateRequest, user_id: str = Depends(get_current_user)):
@@ -16,39 +17,45 @@ async def create(class_data: ClassCreateRequest, user_id: str = Depends(get_curr
 async def join(join_data: ClassJoinRequest, user_id: str = Depends(get_current_user)):
     return await join_class(join_data, user_id)
 
+# Hot read paths return ORJSONResponse directly: the rows are already in response shape,
+# so FastAPI's second validation pass is skipped. response_model still documents them.
 @router.get("/my-classes", response_model=List[ClassResponse])
-async def my_classes(user_id: str = Depends(get_current_user)):
-    return await get_user_classes(user_id)
-
+async def my_classes(limit: int = Query(50, ge=1, le=200), after: Optional[str] = None,
+                     user_id: str = Depends(get_current_user)):
+    classes, next_cursor = await get_user_classes(user_id, limit, after)
+    # Keyset cursor for the next page; pass it back as ?after=
+    return ORJSONResponse(classes, headers={"X-Next-Cursor": next_cursor} if next_cursor else None)
+
+# Members in user_id order, up to limit per page; continue with ?after=<X-Next-Cursor>.
+# include=profile adds each member's username so the roster renders without per-user lookups.
 @router.get("/{class_id}/members", response_model=List[ClassMemberResponse])
-async def members(class_id: str, user_id: str = Depends(get_current_user)):
-    members = await class_dao.get_class_members(class_id)
-    return [ClassMemberResponse(user_id=member["user_id"]) for member in members]
+async def members(class_id: str, limit: int = Query(100, ge=1, le=500), after: Optional[str] = None,
+                  include: Optional[str] = Query(None, pattern="^profile$"),
+                  user_id: str = Depends(get_current_user)):
+    members, next_cursor = await get_class_members(class_id, user_id, limit, after, include)
+    return ORJSONResponse(members, headers={"X-Next-Cursor": next_cursor} if next_cursor else None)
+
+# Roster download for the class creator, streamed so large classes never sit in memory
+@router.get("/{class_id}/members/export")
+async def export_members(class_id: str, format: str = Query("csv", pattern="^(csv|ndjson)$"),
+                         user_id: str = Depends(get_current_user)):
+    rows = await export_class_roster(class_id, user_id)
+    return export_response(rows, ROSTER_COLUMNS, format, f"class-{class_id}-roster")
+
+# Roster import: one request for the whole course, with a result per submitted id or email
+@router.post("/{class_id}/members/bulk", response_model=ClassBulkEnrollResponse)
+async def enroll_members(class_id: str, data: ClassBulkEnrollRequest, user_id: str = Depends(limit_by_user(BULK_ENROLL_POLICY))):
+    return await bulk_enroll(class_id, data, user_id)
 
 @router.delete("/{class_id}/members/{member_id}")
 async def remove_member(class_id: str, member_id: str, user_id: str = Depends(get_current_user)):
-    class_obj = await class_dao.find_by_id(class_id)
-    if not class_obj:
-        raise HTTPException(status_code=404, detail="Class not found")
-    if class_obj.created_by != user_id:
-        raise HTTPException(status_code=403, detail="Only class creator can remove members")
-    await class_dao.remove_user_from_class(class_id, member_id)
-    return {"message": "Member removed successfully"}
-
-@router.delete("/{class_id}")
+    return await remove_class_member(class_id, member_id, user_id)
+
+# Returns as soon as the class is gone; poll /api/jobs/{job_id} for the cleanup of its data
+@router.delete("/{class_id}", status_code=202)
 async def delete(class_id: str, user_id: str = Depends(get_current_user)):
-    class_obj = await class_dao.find_by_id(class_id)
-    if not class_obj:
-        raise HTTPException(status_code=404, detail="Class not found")
-    if class_obj.created_by != user_id:
-        raise HTTPException(status_code=403, detail="Only class creator can delete class")
-    await class_dao.delete_class(class_id)
-    return {"message": "Class deleted successfully"}
+    return await delete_class(class_id, user_id)
 
 @router.post("/{class_id}/leave")
 async def leave(class_id: str, user_id: str = Depends(get_current_user)):
-    class_obj = await class_dao.find_by_id(class_id)
-    if not class_obj:
-        raise HTTPException(status_code=404, detail="Class not found")
-    await class_dao.remove_user_from_class(class_id, user_id)
-    return {"message": "User left class successfully"}
\ No newline at end of file
+    return await leave_class(class_id, user_id)
\ No newline at end of file
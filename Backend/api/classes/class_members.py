@@ -1,16 +1,15 @@
-from fastapi import APIRouter, Depends, HTTPException
-from typing import List
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import ORJSONResponse
+from typing import List, Optional
 from management.auth import get_current_user
 from dao.classes.interface import ClassMemberResponse  # Changed 'class' to 'classes'
-from dao.classes.class_dao import ClassDAO  # Changed 'class' to 'classes'
+from management.management import get_class_members as list_class_members
 
 router = APIRouter()
-class_dao = ClassDAO()
 
 @router.get("/", response_model=List[ClassMemberResponse])
-async def get_class_members(class_id: str, user_id: str = Depends(get_current_user)):
-    class_obj = await class_dao.find_by_id(class_id)
-    if not class_obj:
-        raise HTTPException(status_code=404, detail="Class not found")
-    members = await class_dao.get_class_members(class_id)
-    return [ClassMemberResponse(user_id=member["user_id"]) for member in members]
\ No newline at end of file
+async def get_class_members(class_id: str, limit: int = Query(100, ge=1, le=500), after: Optional[str] = None,
+                            include: Optional[str] = Query(None, pattern="^profile$"),
+                            user_id: str = Depends(get_current_user)):
+    members, next_cursor = await list_class_members(class_id, user_id, limit, after, include)
+    return ORJSONResponse(members, headers={"X-Next-Cursor": next_cursor} if next_cursor else None)
\ No newline at end of file
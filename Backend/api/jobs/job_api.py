@@ -0,0 +1,11 @@
+from fastapi import APIRouter, Depends
+from management.auth import get_current_user
+from dao.jobs.interface import JobResponse
+from management.management import get_job
+
+router = APIRouter()
+
+# Progress of a background job started by the current user
+@router.get("/{job_id}", response_model=JobResponse)
+async def job_status(job_id: str, user_id: str = Depends(get_current_user)):
+    return await get_job(job_id, user_id)
\ No newline at end of file
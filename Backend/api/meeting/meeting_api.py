@@ -1,7 +1,11 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import ORJSONResponse
+from typing import List, Optional
+from datetime import datetime
 from management.auth import get_current_user
-from dao.meeting.interface import MeetingCreateRequest, MeetingResponse
-from management.management import create_meeting, join_meeting, leave_meeting
+from management.exports import export_response
+from dao.meeting.interface import MeetingCreateRequest, MeetingResponse, ChatMessageResponse, OnlineParticipantsResponse
+from management.management import create_meeting, join_meeting, leave_meeting, get_meeting_messages, get_online_participants, delete_meeting, get_agenda, export_meeting_transcript, TRANSCRIPT_COLUMNS
 
 router = APIRouter()
 
@@ -9,10 +13,45 @@ router = APIRouter()
 async def create(data: MeetingCreateRequest, user_id: str = Depends(get_current_user)):
     return await create_meeting(data, user_id)
 
+# Meetings of all the user's classes starting in [from, to), soonest first. Defaults to the
+# next AGENDA_DEFAULT_DAYS days; X-Next-Cursor continues the listing as ?after=.
+# Declared before the /{meeting_id} routes so "agenda" is never taken for an id.
+@router.get("/agenda", response_model=List[MeetingResponse])
+async def agenda(from_: Optional[datetime] = Query(None, alias="from"), to: Optional[datetime] = None,
+                 limit: int = Query(50, ge=1, le=200), after: Optional[str] = None,
+                 user_id: str = Depends(get_current_user)):
+    meetings, next_cursor = await get_agenda(user_id, from_, to, limit, after)
+    return ORJSONResponse(meetings, headers={"X-Next-Cursor": next_cursor} if next_cursor else None)
+
 @router.post("/{meeting_id}/join")
 async def join(meeting_id: str, user_id: str = Depends(get_current_user)):
     return await join_meeting(meeting_id, user_id)
 
 @router.post("/{meeting_id}/leave")
 async def leave(meeting_id: str, user_id: str = Depends(get_current_user)):
-    return await leave_meeting(meeting_id, user_id)
\ No newline at end of file
+    return await leave_meeting(meeting_id, user_id)
+
+@router.delete("/{meeting_id}", status_code=202)
+async def delete(meeting_id: str, user_id: str = Depends(get_current_user)):
+    return await delete_meeting(meeting_id, user_id)
+
+# Served from the in-memory presence registry, no database query
+@router.get("/{meeting_id}/online", response_model=OnlineParticipantsResponse)
+async def online(meeting_id: str, user_id: str = Depends(get_current_user)):
+    return ORJSONResponse(await get_online_participants(meeting_id, user_id))
+
+# Messages come back oldest first. Without a cursor the latest page is returned;
+# X-Next-Cursor continues in the same direction (older for before, newer for after).
+@router.get("/{meeting_id}/messages", response_model=List[ChatMessageResponse])
+async def messages(meeting_id: str, limit: int = Query(50, ge=1, le=200),
+                   before: Optional[str] = None, after: Optional[str] = None,
+                   user_id: str = Depends(get_current_user)):
+    messages, next_cursor = await get_meeting_messages(meeting_id, user_id, limit, before, after)
+    return ORJSONResponse(messages, headers={"X-Next-Cursor": next_cursor} if next_cursor else None)
+
+# Full chat history for the meeting creator, oldest first, streamed from the chat buckets
+@router.get("/{meeting_id}/transcript/export")
+async def export_transcript(meeting_id: str, format: str = Query("csv", pattern="^(csv|ndjson)$"),
+                            user_id: str = Depends(get_current_user)):
+    rows = await export_meeting_transcript(meeting_id, user_id)
+    return export_response(rows, TRANSCRIPT_COLUMNS, format, f"meeting-{meeting_id}-transcript")
\ No newline at end of file
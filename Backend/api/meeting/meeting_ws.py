@@ -1,40 +1,58 @@
-from fastapi import APIRouter, WebSocket, Depends, HTTPException
-from management.auth import get_current_user
-from dao.meeting.meeting_dao import MeetingDAO
+from fastapi import APIRouter, WebSocket, WebSocketDisconnect, Depends, status
+from management.auth import get_current_user_ws
+from management.room_hub import room_hub
+from management.rate_limit import rate_limiter, CHAT_POLICY
+from management.management import meeting_dao, chat_buffer, presence
+from dao.meeting.chat_buckets import CHAT_MAX_MESSAGE_BYTES
 from bson import ObjectId
 from datetime import datetime
 import logging
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
-meeting_dao = MeetingDAO()
 
 @router.websocket("/{meeting_id}/chat")
-async def meeting_chat(websocket: WebSocket, meeting_id: str, user_id: str = Depends(get_current_user)):
+async def meeting_chat(websocket: WebSocket, meeting_id: str, user_id: str = Depends(get_current_user_ws)):
     meeting = await meeting_dao.find_by_id(meeting_id)
     if not meeting:
         await websocket.close(code=1008)
         return
 
     await websocket.accept()
+    connection = await room_hub.connect(meeting_id, websocket, user_id)
+    presence.connect(meeting_id, user_id)
     try:
-        async def store_message(message: str):
-            await meeting_dao.db.chat_messages.insert_one({
+        while True:
+            data = await websocket.receive_text()
+            # The meeting was deleted while the socket was open
+            if connection.closed:
+                break
+            # Every frame costs a fan-out and a write; a client over its budget is disconnected
+            if rate_limiter.check(CHAT_POLICY, user_id):
+                logger.warning(f"User {user_id} exceeded the chat rate limit in meeting {meeting_id}")
+                await websocket.close(code=status.WS_1008_POLICY_VIOLATION, reason="Rate limit exceeded")
+                break
+            if len(data.encode()) > CHAT_MAX_MESSAGE_BYTES:
+                logger.warning(f"User {user_id} sent an oversized chat frame in meeting {meeting_id}")
+                await websocket.close(code=status.WS_1009_MESSAGE_TOO_BIG, reason="Message too large")
+                break
+            presence.heartbeat(meeting_id, user_id)
+            # An empty frame is a heartbeat that keeps the user online without chatting
+            if not data:
+                continue
+            room_hub.broadcast(meeting_id, f"{user_id}: {data}")
+            chat_buffer.add({
+                "_id": ObjectId(),
                 "meeting_id": meeting_id,
                 "user_id": user_id,
-                "message": message,
+                "message": data,
                 "timestamp": datetime.utcnow()
             })
-
-        async def broadcast(message: str):
-            participants = await meeting_dao.get_meeting_participants(meeting_id)
-            for participant in participants:
-                await websocket.send_text(f"{user_id}: {message}")
-
-        while True:
-            data = await websocket.receive_text()
-            await store_message(data)
-            await broadcast(data)
+    except WebSocketDisconnect:
+        pass
     except Exception as e:
         logger.error(f"WebSocket error in meeting {meeting_id}: {e}")
-        await websocket.close()
\ No newline at end of file
+        await websocket.close()
+    finally:
+        presence.disconnect(meeting_id, user_id)
+        await room_hub.disconnect(meeting_id, connection)
\ No newline at end of file
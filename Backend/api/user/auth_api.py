@@ -1,10 +1,12 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Depends, HTTPException
 from dao.user.interface import UserRegistrationRequest, UserLoginRequest, TokenResponse
 from management.management import register_user, login_user
+from management.auth import oauth2_scheme, revoke_token
+from management.rate_limit import limit_by_ip, LOGIN_POLICY, REGISTER_POLICY
 
 router = APIRouter()
 
-@router.post("/register", response_model=TokenResponse)
+@router.post("/register", response_model=TokenResponse, dependencies=[Depends(limit_by_ip(REGISTER_POLICY))])
 async def register(user_data: UserRegistrationRequest):
     try:
         return await register_user(user_data)
@@ -13,11 +15,17 @@ async def register(user_data: UserRegistrationRequest):
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-@router.post("/login", response_model=TokenResponse)
+# Limited per client address: every attempt costs a bcrypt verification
+@router.post("/login", response_model=TokenResponse, dependencies=[Depends(limit_by_ip(LOGIN_POLICY))])
 async def login(login_data: UserLoginRequest):
     try:
         return await login_user(login_data)
     except HTTPException as e:
         raise e
     except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.post("/logout")
+async def logout(token: str = Depends(oauth2_scheme)):
+    revoke_token(token)
+    return {"message": "Logged out successfully"}
\ No newline at end of file
@@ -1,14 +1,15 @@
 from fastapi import APIRouter, Depends, HTTPException
-from dao.user.user_dao import UserDAO
-from dao.user.object import User
+from fastapi.responses import ORJSONResponse
 from management.auth import get_current_user
+from management.management import user_dao
+from dao.user.object import User
 
 router = APIRouter()
-user_dao = UserDAO()
 
 @router.get("/profile")
 async def get_profile(user_id: str = Depends(get_current_user)):
-    user = await user_dao.find_by_id(user_id)
+    user = await user_dao.find_by_id(user_id, User.PROFILE_FIELDS)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
-    return user.to_dict()
\ No newline at end of file
+    # orjson writes the datetimes in the same ISO format jsonable_encoder did
+    return ORJSONResponse(user.to_dict())
\ No newline at end of file
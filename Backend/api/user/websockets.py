@@ -1,18 +1,42 @@
-from fastapi import APIRouter, WebSocket, Depends
-from management.auth import get_current_user
+from fastapi import APIRouter, WebSocket, WebSocketDisconnect, Depends
+from management.auth import get_current_user_ws
+from management.notifications import notification_bus, NOTIFY_HEARTBEAT_SECONDS, NOTIFY_IDLE_TIMEOUT_SECONDS
+import asyncio
 import logging
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
+async def push_events(websocket: WebSocket, subscription):
+    while True:
+        try:
+            event = await asyncio.wait_for(subscription.queue.get(), timeout=NOTIFY_HEARTBEAT_SECONDS)
+        except asyncio.TimeoutError:
+            event = {"type": "heartbeat"}
+        await websocket.send_json(event)
+
+# Events are pushed as they happen; the client only has to answer heartbeats (any frame will do)
+# at least once per NOTIFY_IDLE_TIMEOUT_SECONDS or the connection is closed.
 @router.websocket("/notifications")
-async def user_notifications(websocket: WebSocket, user_id: str = Depends(get_current_user)):
+async def user_notifications(websocket: WebSocket, user_id: str = Depends(get_current_user_ws)):
     await websocket.accept()
+    subscription = notification_bus.subscribe(user_id)
+    pusher = asyncio.create_task(push_events(websocket, subscription))
     try:
         while True:
-            # Placeholder for real-time notifications (e.g., new classes invites)
-            await websocket.send_text(f"Notification for user {user_id}: No new updates")
-            await websocket.receive_text()  # Keep connection alive
+            await asyncio.wait_for(websocket.receive_text(), timeout=NOTIFY_IDLE_TIMEOUT_SECONDS)
+    except asyncio.TimeoutError:
+        logger.info(f"Closing idle notifications socket for user {user_id}")
+        await websocket.close(code=1001)
+    except WebSocketDisconnect:
+        pass
     except Exception as e:
         logger.error(f"WebSocket error for user {user_id}: {e}")
-        await websocket.close()
\ No newline at end of file
+        await websocket.close()
+    finally:
+        pusher.cancel()
+        # Collect the pusher's outcome too, so a failed send is logged rather than left unretrieved
+        result, = await asyncio.gather(pusher, return_exceptions=True)
+        if isinstance(result, Exception):
+            logger.warning(f"Notification pusher for user {user_id} stopped: {result}")
+        notification_bus.unsubscribe(subscription)
\ No newline at end of file
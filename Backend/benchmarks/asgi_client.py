@@ -0,0 +1,86 @@
+# Drives the ASGI app in-process so benchmarks measure the application, not a network stack.
+import asyncio
+import json
+
+class ASGIClient:
+    def __init__(self, app):
+        self.app = app
+
+    def _scope(self, scope_type, path, token=None):
+        path, _, query = path.partition("?")
+        headers = [(b"host", b"bench"), (b"content-type", b"application/json")]
+        if token:
+            headers.append((b"authorization", f"Bearer {token}".encode()))
+        return {
+            "type": scope_type,
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "scheme": "http" if scope_type == "http" else "ws",
+            "path": path,
+            "raw_path": path.encode(),
+            "query_string": query.encode(),
+            "root_path": "",
+            "headers": headers,
+            "client": ("127.0.0.1", 50000),
+            "server": ("bench", 80),
+        }
+
+    async def request(self, method, path, json_body=None, token=None):
+        scope = self._scope("http", path, token)
+        scope["method"] = method
+        body = json.dumps(json_body).encode() if json_body is not None else b""
+        done = asyncio.Event()
+        request_sent = False
+        response = {"status": None, "headers": [], "body": b""}
+
+        async def receive():
+            nonlocal request_sent
+            if not request_sent:
+                request_sent = True
+                return {"type": "http.request", "body": body, "more_body": False}
+            await done.wait()
+            return {"type": "http.disconnect"}
+
+        async def send(message):
+            if message["type"] == "http.response.start":
+                response["status"] = message["status"]
+                response["headers"] = message.get("headers", [])
+            elif message["type"] == "http.response.body":
+                response["body"] += message.get("body", b"")
+                if not message.get("more_body"):
+                    done.set()
+
+        await self.app(scope, receive, send)
+        done.set()
+        return response
+
+    def websocket(self, path, token=None):
+        return WebSocketSession(self.app, self._scope("websocket", path, token))
+
+class WebSocketSession:
+    def __init__(self, app, scope):
+        self.app = app
+        self.scope = scope
+        self.inbound = asyncio.Queue()
+        self.outbound = asyncio.Queue()
+        self.task = None
+
+    async def connect(self):
+        self.task = asyncio.create_task(self.app(self.scope, self.inbound.get, self.outbound.put))
+        await self.inbound.put({"type": "websocket.connect"})
+        message = await self.outbound.get()
+        if message["type"] != "websocket.accept":
+            raise ConnectionError(f"WebSocket rejected: {message}")
+
+    async def send_text(self, text):
+        await self.inbound.put({"type": "websocket.receive", "text": text})
+
+    async def receive_text(self):
+        message = await self.outbound.get()
+        if message["type"] == "websocket.close":
+            raise ConnectionError(f"WebSocket closed: {message.get('code')}")
+        return message["text"]
+
+    async def close(self):
+        await self.inbound.put({"type": "websocket.disconnect", "code": 1000})
+        await self.task
\ No newline at end of file
@@ -0,0 +1,119 @@
+# Two-worker check of the Mongo change-stream backplane's ordering guarantee. Two
+# MongoChangeStreamBackplane instances share an in-memory stand-in for broadcast_events
+# whose insert order plays the oplog; every worker publishes into several meetings, and one
+# change stream is interrupted midway to exercise resuming.
+#
+# Run from Backend/: python -m benchmarks.backplane_order [--messages 200]
+# Exits 1 if the workers disagree on the order, reorder a publisher, or lose/duplicate events.
+import argparse
+import asyncio
+import json
+import random
+import sys
+from management.backplane import MongoChangeStreamBackplane
+
+class FakeEventLog:
+    def __init__(self, latency_ms: float = 1.0):
+        self.events = []
+        self.latency = latency_ms / 1000
+        self.changed = asyncio.Condition()
+        self.interrupt_after = None
+
+    async def insert_many(self, documents, ordered=True):
+        # Round-trip time, so the two workers' inserts interleave
+        await asyncio.sleep(random.uniform(0, self.latency))
+        async with self.changed:
+            self.events.extend(documents)
+            self.changed.notify_all()
+
+    def watch(self, pipeline, resume_after=None):
+        return FakeChangeStream(self, resume_after)
+
+class FakeChangeStream:
+    def __init__(self, log: FakeEventLog, resume_after):
+        self.log = log
+        # Like a real change stream: start now, or right after the resume token
+        self.position = resume_after + 1 if resume_after is not None else len(log.events)
+        self.resume_token = resume_after
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        if self.log.interrupt_after is not None and self.position >= self.log.interrupt_after:
+            self.log.interrupt_after = None
+            raise ConnectionError("simulated change stream interruption")
+        async with self.log.changed:
+            await self.log.changed.wait_for(lambda: self.position < len(self.log.events))
+        event = self.log.events[self.position]
+        self.resume_token = self.position
+        self.position += 1
+        return {"operationType": "insert", "fullDocument": event}
+
+async def run(args):
+    log = FakeEventLog(args.latency_ms)
+    workers = [MongoChangeStreamBackplane(log, batch_size=args.batch_size) for _ in range(2)]
+    received = [[] for _ in workers]
+    for index, worker in enumerate(workers):
+        worker.subscribe("chat", lambda key, payload, index=index: received[index].append((key, payload)))
+        await worker.start()
+    await asyncio.sleep(0)
+    log.interrupt_after = args.messages // 2
+
+    meetings = [f"meeting{i}" for i in range(args.meetings)]
+
+    async def publisher(index, worker):
+        for seq in range(args.messages):
+            worker.publish("chat", meetings[seq % len(meetings)], f"w{index}|{seq}")
+            if seq % 7 == 0:
+                await asyncio.sleep(0)
+
+    await asyncio.gather(*(publisher(index, worker) for index, worker in enumerate(workers)))
+    expected = len(workers) * args.messages
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + args.timeout
+    while any(len(events) < expected for events in received) and loop.time() < deadline:
+        # Resuming after the simulated interruption waits out the backplane's retry delay
+        await asyncio.sleep(0.05)
+    for worker in workers:
+        await worker.close()
+
+    out_of_order = 0
+    for events in received:
+        last = {}
+        for key, payload in events:
+            sender, seq = payload.split("|")
+            if int(seq) <= last.get((sender, key), -1):
+                out_of_order += 1
+            last[(sender, key)] = int(seq)
+    return {
+        "expected": expected,
+        "delivered": [len(events) for events in received],
+        "duplicates": sum(len(events) - len(set(events)) for events in received),
+        "workers_agree": received[0] == received[1],
+        "out_of_order": out_of_order,
+    }
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--messages", type=int, default=200, help="messages published by each worker")
+    parser.add_argument("--meetings", type=int, default=5)
+    parser.add_argument("--batch-size", type=int, default=16)
+    parser.add_argument("--latency-ms", type=float, default=1.0)
+    parser.add_argument("--timeout", type=float, default=10.0)
+    args = parser.parse_args()
+    result = asyncio.run(run(args))
+    print(json.dumps(result, indent=2))
+    ok = (result["workers_agree"] and not result["out_of_order"] and not result["duplicates"]
+          and all(count == result["expected"] for count in result["delivered"]))
+    if not ok:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
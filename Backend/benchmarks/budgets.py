@@ -0,0 +1,14 @@
+# Most database commands a request to each endpoint may issue. Checked on the in-memory
+# DAOs by harness.py and on a real MongoDB by round_trips.py.
+ROUND_TRIP_BUDGETS = {
+    "register": 1,
+    "login": 1,
+    "create_class": 1,
+    "bulk_enroll": 3,
+    "my_classes": 1,
+    "class_members": 2,
+    "create_meeting": 3,
+    "meeting_join": 3,
+    "meeting_leave": 3,
+    "agenda": 1,
+}
\ No newline at end of file
@@ -0,0 +1,341 @@
+# Load-test and benchmark suite. Runs the real FastAPI app on the in-memory DAO backend
+# and reports p50/p99 latency, requests per second and Mongo round trips per request.
+#
+# Run from Backend/:
+#   python -m benchmarks.harness                    # run and compare with benchmarks/baseline.json
+#   python -m benchmarks.harness --save             # overwrite the baseline
+#   python -m benchmarks.harness --check            # exit 1 on regression
+#
+# Round trips are deterministic and are the main regression signal; latency and
+# throughput depend on the machine, so they are only flagged past --tolerance.
+# ROUND_TRIP_BUDGETS (benchmarks/budgets.py) additionally pins how many database commands
+# an endpoint may make per request, independent of whatever the baseline recorded. --check
+# also runs benchmarks/round_trips.py, which holds the real Mongo DAOs to the same budgets
+# when a local mongod is available.
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import time
+
+os.environ["DAO_BACKEND"] = "memory"
+os.environ.setdefault("SECRET_KEY", "benchmark-secret")
+os.environ.setdefault("JWT_EXPIRATION", "60")
+os.environ.setdefault("BCRYPT_ROUNDS", "4")
+# Idle job polls are background traffic, keep them out of the per-request round trips
+os.environ.setdefault("JOB_POLL_SECONDS", "3600")
+# Every simulated client shares one address; keep the limiters on but out of the way
+for policy in ("LOGIN", "REGISTER", "CHAT", "BULK_ENROLL"):
+    os.environ.setdefault(f"RATE_LIMIT_{policy}", "1000000/1")
+
+from benchmarks.asgi_client import ASGIClient
+from benchmarks.budgets import ROUND_TRIP_BUDGETS
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), "baseline.json")
+
+def percentile(samples, fraction):
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, int(round(fraction * len(ordered))) - 1))
+    return ordered[index]
+
+class Recorder:
+    def __init__(self, store):
+        self.store = store
+        self.latencies = []
+        self.errors = 0
+
+    async def timed(self, call, expected=200):
+        started = time.perf_counter()
+        response = await call
+        self.latencies.append((time.perf_counter() - started) * 1000)
+        if response["status"] != expected:
+            self.errors += 1
+        return response
+
+    async def run(self, calls, concurrency):
+        self.store.reset_counters()
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def bounded(factory):
+            async with semaphore:
+                return await factory()
+
+        started = time.perf_counter()
+        responses = await asyncio.gather(*(bounded(factory) for factory in calls))
+        elapsed = time.perf_counter() - started
+        count = len(calls)
+        result = {
+            "requests": count,
+            "errors": self.errors,
+            "rps": round(count / elapsed, 1) if elapsed else 0.0,
+            "p50_ms": round(percentile(self.latencies, 0.50), 3),
+            "p99_ms": round(percentile(self.latencies, 0.99), 3),
+            "round_trips_per_request": round(self.store.round_trips() / count, 3) if count else 0.0,
+        }
+        return result, responses
+
+async def scenario_register_login(client, store, args, state):
+    register = Recorder(store)
+    calls = [
+        (lambda i=i: register.timed(client.request("POST", "/api/auth/register", {
+            "username": f"student{i}", "email": f"student{i}@example.com", "password": "password123"
+        })))
+        for i in range(args.users)
+    ]
+    register_result, responses = await register.run(calls, args.concurrency)
+    state["tokens"] = [json.loads(r["body"])["token"] for r in responses if r["status"] == 200]
+
+    login = Recorder(store)
+    calls = [
+        (lambda i=i: login.timed(client.request("POST", "/api/auth/login", {
+            "email": f"student{i}@example.com", "password": "password123"
+        })))
+        for i in range(args.users)
+    ]
+    login_result, _ = await login.run(calls, args.concurrency)
+    return {"register": register_result, "login": login_result}
+
+async def scenario_my_classes(client, store, args, state):
+    tokens = state["tokens"]
+    instructor = tokens[0]
+    create = Recorder(store)
+    calls = [
+        (lambda i=i: create.timed(client.request("POST", "/api/class/create", {"class_name": f"Class {i}", "description": ""}, instructor)))
+        for i in range(args.classes)
+    ]
+    create_result, responses = await create.run(calls, 1)
+    created = [json.loads(r["body"]) for r in responses]
+    codes = [c["class_code"] for c in created]
+    state["class_ids"] = [c["class_id"] for c in created]
+    await asyncio.gather(*(
+        client.request("POST", "/api/class/join", {"class_code": code}, token)
+        for token in tokens[1:] for code in codes
+    ))
+
+    recorder = Recorder(store)
+    calls = [
+        (lambda token=tokens[1 + i % (len(tokens) - 1)]: recorder.timed(client.request("GET", "/api/class/my-classes?limit=50", token=token)))
+        for i in range(args.requests)
+    ]
+    result, _ = await recorder.run(calls, args.concurrency)
+    return {"create_class": create_result, "my_classes": result}
+
+async def scenario_bulk_enroll(client, store, args, state):
+    response = await client.request("POST", "/api/class/create", {"class_name": "Roster import", "description": ""}, state["tokens"][0])
+    state["roster_class_id"] = class_id = json.loads(response["body"])["class_id"]
+    emails = [f"student{i}@example.com" for i in range(1, args.users)] + ["unknown@example.com"]
+
+    recorder = Recorder(store)
+    calls = [(lambda: recorder.timed(client.request("POST", f"/api/class/{class_id}/members/bulk", {"emails": emails}, state["tokens"][0])))]
+    result, responses = await recorder.run(calls, 1)
+    body = json.loads(responses[0]["body"])
+    result.update(added=body["added"], unknown_user=body["unknown_user"])
+    return {"bulk_enroll": result}
+
+async def scenario_class_members(client, store, args, state):
+    class_id = state["roster_class_id"]
+    recorder = Recorder(store)
+    calls = [
+        (lambda token=state["tokens"][i % len(state["tokens"])]: recorder.timed(client.request(
+            "GET", f"/api/class/{class_id}/members?limit=100&include=profile", token=token)))
+        for i in range(args.requests)
+    ]
+    result, _ = await recorder.run(calls, args.concurrency)
+    return {"class_members": result}
+
+async def scenario_join_leave_storm(client, store, args, state):
+    tokens = state["tokens"]
+    response = await client.request("POST", "/api/meeting/create", {
+        "title": "Lecture", "class_id": state["class_ids"][0],
+        "start_time": "2030-01-01T09:00:00", "end_time": "2030-01-01T10:00:00"
+    }, tokens[0])
+    state["meeting_id"] = meeting_id = json.loads(response["body"])["meeting_id"]
+
+    join = Recorder(store)
+    calls = [(lambda token=token: join.timed(client.request("POST", f"/api/meeting/{meeting_id}/join", token=token))) for token in tokens]
+    join_result, _ = await join.run(calls, len(tokens))
+
+    leave = Recorder(store)
+    calls = [(lambda token=token: leave.timed(client.request("POST", f"/api/meeting/{meeting_id}/leave", token=token))) for token in tokens]
+    leave_result, _ = await leave.run(calls, len(tokens))
+    return {"meeting_join": join_result, "meeting_leave": leave_result}
+
+async def scenario_agenda(client, store, args, state):
+    tokens = state["tokens"]
+    create = Recorder(store)
+    calls = [
+        (lambda i=i, class_id=class_id, week=week: create.timed(client.request("POST", "/api/meeting/create", {
+            "title": f"Lecture {i}.{week}", "class_id": class_id,
+            "start_time": f"2030-01-{1 + week * 7 + i % 7:02d}T{8 + i % 10:02d}:00:00",
+            "end_time": f"2030-01-{1 + week * 7 + i % 7:02d}T{9 + i % 10:02d}:00:00"
+        }, tokens[0])))
+        for i, class_id in enumerate(state["class_ids"]) for week in range(2)
+    ]
+    create_result, _ = await create.run(calls, 1)
+
+    recorder = Recorder(store)
+    calls = [
+        (lambda token=tokens[1 + i % (len(tokens) - 1)]: recorder.timed(client.request(
+            "GET", "/api/meeting/agenda?from=2030-01-01T00:00:00&to=2030-01-15T00:00:00&limit=20", token=token)))
+        for i in range(args.requests)
+    ]
+    result, _ = await recorder.run(calls, args.concurrency)
+    return {"create_meeting": create_result, "agenda": result}
+
+async def scenario_chat_fanout(client, store, args, state):
+    tokens = state["tokens"][:args.clients]
+    meeting_id = state["meeting_id"]
+    sessions = [client.websocket(f"/api/meeting/{meeting_id}/chat", token) for token in tokens]
+    for session in sessions:
+        await session.connect()
+
+    expected = len(sessions) * args.messages
+    latencies = []
+    out_of_order = 0
+
+    async def reader(session):
+        nonlocal out_of_order
+        last_seq = {}
+        for _ in range(expected):
+            text = await session.receive_text()
+            sender, seq, sent_at = text.split(": ", 1)[1].split("|")
+            latencies.append((time.perf_counter() - float(sent_at)) * 1000)
+            if int(seq) <= last_seq.get(sender, -1):
+                out_of_order += 1
+            last_seq[sender] = int(seq)
+
+    async def writer(index, session):
+        for seq in range(args.messages):
+            await session.send_text(f"{index}|{seq}|{time.perf_counter()}")
+            await asyncio.sleep(0)
+
+    store.reset_counters()
+    started = time.perf_counter()
+    readers = [asyncio.create_task(reader(session)) for session in sessions]
+    await asyncio.gather(*(writer(i, session) for i, session in enumerate(sessions)))
+    await asyncio.gather(*readers)
+    elapsed = time.perf_counter() - started
+    for session in sessions:
+        await session.close()
+
+    delivered = len(latencies)
+    return {"chat_fanout": {
+        "clients": len(sessions),
+        "messages_sent": expected,
+        "deliveries": delivered,
+        "out_of_order": out_of_order,
+        "deliveries_per_second": round(delivered / elapsed, 1) if elapsed else 0.0,
+        "p50_ms": round(percentile(latencies, 0.50), 3),
+        "p99_ms": round(percentile(latencies, 0.99), 3),
+        "round_trips_per_message": round(store.round_trips() / expected, 3) if expected else 0.0,
+    }}
+
+async def scenario_backplane_two_workers(client, store, args, state):
+    # Cross-worker ordering of the change-stream backplane, against a stand-in event log
+    from benchmarks.backplane_order import run as run_backplane
+    result = await run_backplane(argparse.Namespace(messages=200, meetings=5, batch_size=16, latency_ms=1.0, timeout=10.0))
+    lost = sum(result["expected"] - count for count in result["delivered"])
+    return {"backplane_two_workers": {
+        "messages_sent": result["expected"],
+        "errors": lost + result["duplicates"] + (0 if result["workers_agree"] else 1),
+        "out_of_order": result["out_of_order"],
+    }}
+
+SCENARIOS = [scenario_register_login, scenario_my_classes, scenario_bulk_enroll, scenario_class_members, scenario_join_leave_storm, scenario_agenda, scenario_chat_fanout, scenario_backplane_two_workers]
+
+async def run(args):
+    import main
+    from dao.memory_store import memory_store
+
+    memory_store.clear()
+    client = ASGIClient(main.app)
+    state = {}
+    results = {}
+    async with main.lifespan(main.app):
+        # Let background workers finish their startup pass (e.g. resuming jobs) first
+        await asyncio.sleep(0.1)
+        for scenario in SCENARIOS:
+            results.update(await scenario(client, memory_store, args, state))
+    return results
+
+def compare(results, baseline, tolerance, slack_ms):
+    regressions = []
+    for name, result in results.items():
+        previous = baseline.get(name)
+        if previous is None:
+            print(f"{name}: no baseline")
+            continue
+        for key, value in result.items():
+            before = previous.get(key)
+            if not isinstance(value, (int, float)) or before is None:
+                continue
+            if key in ("round_trips_per_request", "errors", "out_of_order"):
+                worse = value > before
+            elif key == "round_trips_per_message":
+                # Chat writes are batched on a timer, so the flush count varies slightly
+                worse = value > before * (1 + tolerance)
+            elif key.endswith("_ms"):
+                worse = value > before * (1 + tolerance) and value - before > slack_ms
+            elif key in ("rps", "deliveries_per_second"):
+                worse = value < before * (1 - tolerance)
+            else:
+                continue
+            if worse:
+                regressions.append(f"{name}.{key}: {before} -> {value}")
+    return regressions
+
+def over_budget(results):
+    violations = []
+    for name, budget in ROUND_TRIP_BUDGETS.items():
+        used = results.get(name, {}).get("round_trips_per_request")
+        if used is not None and used > budget:
+            violations.append(f"{name}.round_trips_per_request: {used} > budget {budget}")
+    return violations
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--users", type=int, default=100)
+    parser.add_argument("--classes", type=int, default=20)
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--clients", type=int, default=50)
+    parser.add_argument("--messages", type=int, default=20)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--tolerance", type=float, default=0.5, help="allowed relative latency/throughput drift")
+    parser.add_argument("--slack-ms", type=float, default=5.0, help="latency increases below this are never flagged")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--save", action="store_true", help="write results as the new baseline")
+    parser.add_argument("--check", action="store_true", help="exit 1 if any metric regressed")
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args))
+    print(json.dumps(results, indent=2))
+
+    violations = over_budget(results)
+    for violation in violations:
+        print(f"OVER BUDGET {violation}")
+    if violations and (args.check or args.save):
+        sys.exit(1)
+    # Separate process: the DAO backend is chosen when the app is imported
+    if args.check and subprocess.run([sys.executable, "-m", "benchmarks.round_trips"]).returncode:
+        sys.exit(1)
+
+    if args.save:
+        with open(args.baseline, "w") as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+            f.write("\n")
+        print(f"Baseline written to {args.baseline}")
+        return
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.tolerance, args.slack_ms)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if regressions and args.check:
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
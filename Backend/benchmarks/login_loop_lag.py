@@ -0,0 +1,50 @@
+# Measures how far the event loop falls behind while logins verify passwords.
+# Run from Backend/: python -m benchmarks.login_loop_lag --logins 32
+import argparse
+import asyncio
+import statistics
+import time
+import bcrypt
+from management.passwords import PasswordHasher
+
+TICK = 0.005
+
+async def measure_lag(stop: asyncio.Event, samples: list):
+    while not stop.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(TICK)
+        samples.append((time.perf_counter() - started - TICK) * 1000)
+
+async def inline_verify(password: str, password_hash: bytes):
+    return bcrypt.checkpw(password.encode("utf-8"), password_hash)
+
+async def run(label, verify, logins, password, password_hash):
+    samples = []
+    stop = asyncio.Event()
+    ticker = asyncio.create_task(measure_lag(stop, samples))
+    started = time.perf_counter()
+    await asyncio.gather(*(verify(password, password_hash) for _ in range(logins)))
+    elapsed = time.perf_counter() - started
+    stop.set()
+    await ticker
+    samples.sort()
+    p99 = samples[int(len(samples) * 0.99) - 1] if samples else 0.0
+    print(f"{label:>8}: {logins} logins in {elapsed:.2f}s, loop lag p50={statistics.median(samples or [0]):.1f}ms "
+          f"p99={p99:.1f}ms max={max(samples or [0]):.1f}ms ticks={len(samples)}")
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--logins", type=int, default=32)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--executor", choices=["thread", "process"], default="thread")
+    args = parser.parse_args()
+
+    password = "correct horse battery staple"
+    password_hash = bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt())
+    hasher = PasswordHasher(executor=args.executor, workers=args.workers, max_pending=args.logins)
+    await run("inline", inline_verify, args.logins, password, password_hash)
+    await run(args.executor, hasher.verify, args.logins, password, password_hash)
+    hasher.close()
+
+if __name__ == "__main__":
+    asyncio.run(main())
\ No newline at end of file
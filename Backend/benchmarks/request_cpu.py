@@ -0,0 +1,78 @@
+# Per-request CPU time for the hot read endpoints, measured in-process on the in-memory
+# DAO backend so only application work (records, response building, JSON) is counted.
+# Run from Backend/: python -m benchmarks.request_cpu --requests 2000
+import argparse
+import asyncio
+import json
+import os
+import time
+
+os.environ["DAO_BACKEND"] = "memory"
+os.environ.setdefault("SECRET_KEY", "benchmark-secret")
+os.environ.setdefault("JWT_EXPIRATION", "60")
+os.environ.setdefault("BCRYPT_ROUNDS", "4")
+os.environ.setdefault("JOB_POLL_SECONDS", "3600")
+# Every simulated client shares one address; keep the limiters on but out of the way
+for policy in ("LOGIN", "REGISTER", "CHAT", "BULK_ENROLL"):
+    os.environ.setdefault(f"RATE_LIMIT_{policy}", "1000000/1")
+
+from benchmarks.asgi_client import ASGIClient
+
+async def seed(client, args):
+    response = await client.request("POST", "/api/auth/register", {
+        "username": "student0", "email": "student0@example.com", "password": "password123"
+    })
+    token = json.loads(response["body"])["token"]
+    class_ids = []
+    for i in range(args.classes):
+        response = await client.request("POST", "/api/class/create", {"class_name": f"Class {i}", "description": "Lecture notes"}, token)
+        class_ids.append(json.loads(response["body"])["class_id"])
+        await client.request("POST", "/api/class/join", {"class_code": json.loads(response["body"])["class_code"]}, token)
+    response = await client.request("POST", "/api/meeting/create", {
+        "title": "Lecture", "class_id": class_ids[0], "start_time": "2030-01-01T09:00:00", "end_time": "2030-01-01T10:00:00"
+    }, token)
+    meeting_id = json.loads(response["body"])["meeting_id"]
+    chat = client.websocket(f"/api/meeting/{meeting_id}/chat", token)
+    await chat.connect()
+    for i in range(args.messages):
+        await chat.send_text(f"message {i}")
+    await chat.close()
+    return token, class_ids[0], meeting_id
+
+async def run(args):
+    import main
+    from dao.memory_store import memory_store
+
+    memory_store.clear()
+    client = ASGIClient(main.app)
+    results = {}
+    async with main.lifespan(main.app):
+        token, class_id, meeting_id = await seed(client, args)
+        await main.chat_buffer.flush()
+        endpoints = {
+            "profile": "/api/user/profile",
+            "my_classes": f"/api/class/my-classes?limit={args.classes}",
+            "class_members": f"/api/class/{class_id}/members",
+            "messages": f"/api/meeting/{meeting_id}/messages?limit={args.messages}",
+        }
+        for name, path in endpoints.items():
+            for _ in range(50):
+                await client.request("GET", path, token=token)
+            started = time.process_time()
+            for _ in range(args.requests):
+                response = await client.request("GET", path, token=token)
+            elapsed = time.process_time() - started
+            assert response["status"] == 200, response
+            results[name] = {"cpu_us_per_request": round(elapsed * 1_000_000 / args.requests, 1), "bytes": len(response["body"])}
+    return results
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--classes", type=int, default=50)
+    parser.add_argument("--messages", type=int, default=100)
+    args = parser.parse_args()
+    print(json.dumps(asyncio.run(run(args)), indent=2))
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
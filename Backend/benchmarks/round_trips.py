@@ -0,0 +1,149 @@
+# Counts the database commands behind every endpoint in ROUND_TRIP_BUDGETS on the Mongo DAOs,
+# through the driver's command listener (dao.monitoring.command_monitor). The harness counts
+# calls into the in-memory DAOs; this checks that the real queries stay within the same budgets.
+#
+# Run from Backend/ with a local mongod:
+#   python -m benchmarks.round_trips
+#   ROUND_TRIPS_MONGODB_URI=mongodb://host:27017/scratch python -m benchmarks.round_trips
+#
+# The database is dropped before and after the run, so it never uses MONGODB_URI. Without a
+# reachable server the check is skipped and exits 0; harness --check runs it too.
+import argparse
+import asyncio
+import json
+import os
+import sys
+
+ROUND_TRIPS_MONGODB_URI = os.getenv("ROUND_TRIPS_MONGODB_URI", "mongodb://localhost:27017/classmeet_round_trips")
+
+os.environ["DAO_BACKEND"] = "mongo"
+os.environ["MONGODB_URI"] = ROUND_TRIPS_MONGODB_URI
+os.environ["SCHEMA_BOOTSTRAP"] = "true"
+os.environ["BACKPLANE"] = "inprocess"
+os.environ.setdefault("SECRET_KEY", "benchmark-secret")
+os.environ.setdefault("JWT_EXPIRATION", "60")
+os.environ.setdefault("BCRYPT_ROUNDS", "4")
+# Keep background writers (job polls, presence snapshots) out of the per-request counts
+os.environ["JOB_POLL_SECONDS"] = "3600"
+os.environ["PRESENCE_FLUSH_INTERVAL_SECONDS"] = "3600"
+for policy in ("LOGIN", "REGISTER", "CHAT", "BULK_ENROLL"):
+    os.environ.setdefault(f"RATE_LIMIT_{policy}", "1000000/1")
+
+from pymongo import MongoClient
+from pymongo.errors import PyMongoError
+from benchmarks.asgi_client import ASGIClient
+from benchmarks.budgets import ROUND_TRIP_BUDGETS
+
+def server_available(uri: str) -> bool:
+    client = MongoClient(uri, serverSelectionTimeoutMS=1000)
+    try:
+        client.admin.command("ping")
+        return True
+    except PyMongoError:
+        return False
+    finally:
+        client.close()
+
+def commands_issued():
+    from dao.monitoring import command_monitor
+    return sum(entry["count"] for entry in command_monitor.stats().values())
+
+# Requests run one at a time, so nothing is coalesced or batched with a concurrent request
+# and each average is the worst case per request
+async def measure(calls, expected=200):
+    before = commands_issued()
+    responses = []
+    for call in calls:
+        response = await call()
+        if response["status"] != expected:
+            raise RuntimeError(f"Unexpected status {response['status']}: {response['body'][:200]}")
+        responses.append(response)
+    return round((commands_issued() - before) / len(calls), 3), responses
+
+async def run(args):
+    import main
+    from dao.db_config import Database
+
+    db = Database.get_instance().db
+    await db.client.drop_database(db.name)
+    client = ASGIClient(main.app)
+    results = {}
+    try:
+        async with main.lifespan(main.app):
+            # Let the job runner finish its startup claim first
+            await asyncio.sleep(0.1)
+            users = range(args.users)
+            results["register"], responses = await measure([
+                (lambda i=i: client.request("POST", "/api/auth/register", {
+                    "username": f"student{i}", "email": f"student{i}@example.com", "password": "password123"}))
+                for i in users
+            ])
+            tokens = [json.loads(r["body"])["token"] for r in responses]
+            results["login"], _ = await measure([
+                (lambda i=i: client.request("POST", "/api/auth/login", {"email": f"student{i}@example.com", "password": "password123"}))
+                for i in users
+            ])
+            results["create_class"], responses = await measure([
+                (lambda i=i: client.request("POST", "/api/class/create", {"class_name": f"Class {i}", "description": ""}, tokens[0]))
+                for i in range(args.classes)
+            ])
+            classes = [json.loads(r["body"]) for r in responses]
+            for token in tokens[1:]:
+                for class_obj in classes[1:]:
+                    await client.request("POST", "/api/class/join", {"class_code": class_obj["class_code"]}, token)
+            class_id = classes[0]["class_id"]
+            emails = [f"student{i}@example.com" for i in range(1, args.users)] + ["unknown@example.com"]
+            results["bulk_enroll"], _ = await measure([
+                lambda: client.request("POST", f"/api/class/{class_id}/members/bulk", {"emails": emails}, tokens[0])
+            ])
+            results["my_classes"], _ = await measure([
+                (lambda token=token: client.request("GET", "/api/class/my-classes?limit=50", token=token)) for token in tokens[1:]
+            ])
+            results["class_members"], _ = await measure([
+                (lambda token=token: client.request("GET", f"/api/class/{class_id}/members?limit=100&include=profile", token=token))
+                for token in tokens
+            ])
+            results["create_meeting"], responses = await measure([
+                (lambda i=i, class_obj=class_obj: client.request("POST", "/api/meeting/create", {
+                    "title": f"Lecture {i}", "class_id": class_obj["class_id"],
+                    "start_time": f"2030-01-{1 + i % 14:02d}T09:00:00", "end_time": f"2030-01-{1 + i % 14:02d}T10:00:00"
+                }, tokens[0]))
+                for i, class_obj in enumerate(classes)
+            ])
+            meeting_id = json.loads(responses[0]["body"])["meeting_id"]
+            results["meeting_join"], _ = await measure([
+                (lambda token=token: client.request("POST", f"/api/meeting/{meeting_id}/join", token=token)) for token in tokens
+            ])
+            results["meeting_leave"], _ = await measure([
+                (lambda token=token: client.request("POST", f"/api/meeting/{meeting_id}/leave", token=token)) for token in tokens
+            ])
+            results["agenda"], _ = await measure([
+                (lambda token=token: client.request(
+                    "GET", "/api/meeting/agenda?from=2030-01-01T00:00:00&to=2030-01-15T00:00:00&limit=20", token=token))
+                for token in tokens[1:]
+            ])
+    finally:
+        await db.client.drop_database(db.name)
+    return results
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--classes", type=int, default=5)
+    args = parser.parse_args()
+
+    if not server_available(ROUND_TRIPS_MONGODB_URI):
+        print(f"No MongoDB at {ROUND_TRIPS_MONGODB_URI}, skipping the round trip check")
+        return
+    results = asyncio.run(run(args))
+    violations = 0
+    for name, budget in ROUND_TRIP_BUDGETS.items():
+        used = results[name]
+        status = "ok" if used <= budget else "OVER"
+        violations += status != "ok"
+        print(f"{status:>4}  {name}: {used} commands per request (budget {budget})")
+    if violations:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
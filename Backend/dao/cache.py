@@ -0,0 +1,166 @@
+from collections import OrderedDict
+import asyncio
+import logging
+import os
+import time
+from dotenv import load_dotenv
+
+# Load environment variables from .env
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+DAO_CACHE_ENABLED = os.getenv("DAO_CACHE_ENABLED", "True").lower() in ("1", "true", "yes")
+DAO_CACHE_TTL = float(os.getenv("DAO_CACHE_TTL", 30))
+DAO_CACHE_SIZE = int(os.getenv("DAO_CACHE_SIZE", 5000))
+
+_MISSING = object()
+
+# Size-bounded LRU with a per-entry TTL. One instance per cached entity so hit
+# ratios can be tuned independently.
+#
+# Every invalidation bumps the key's generation. A read-through fill takes generation(key)
+# before it queries and passes it to set(), which drops the value if a write invalidated the
+# key in between; otherwise a slow read would put pre-write data back for a whole TTL.
+class TTLCache:
+    def __init__(self, name: str, max_size: int = DAO_CACHE_SIZE, ttl: float = DAO_CACHE_TTL):
+        self.name = name
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._generations = OrderedDict()
+        self._epoch = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self.stale_fills = 0
+        _caches.append(self)
+
+    def get(self, key, default=None):
+        entry = self._entries.get(key, _MISSING)
+        if entry is _MISSING or entry[1] <= time.monotonic():
+            if entry is not _MISSING:
+                del self._entries[key]
+            self.misses += 1
+            return default
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[0]
+
+    def generation(self, key):
+        return self._epoch, self._generations.get(key, 0)
+
+    def set(self, key, value, generation=None):
+        if generation is not None and generation != self.generation(key):
+            self.stale_fills += 1
+            return
+        self._entries[key] = (value, time.monotonic() + self.ttl)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def _bump(self, key):
+        self._generations[key] = self._generations.get(key, 0) + 1
+        self._generations.move_to_end(key)
+        if len(self._generations) > self.max_size:
+            # Forgetting a counter could make an old generation look current again, so the
+            # epoch moves instead and every fill in progress is treated as stale
+            self._generations.popitem(last=False)
+            self._epoch += 1
+
+    def invalidate(self, key):
+        self._bump(key)
+        if self._entries.pop(key, _MISSING) is not _MISSING:
+            self.invalidations += 1
+
+    # Fills in progress for keys the predicate would match are unknown, so they are all discarded
+    def invalidate_where(self, predicate):
+        self._epoch += 1
+        for key in [k for k, (value, _) in self._entries.items() if predicate(value)]:
+            self.invalidate(key)
+
+    def clear(self):
+        self._epoch += 1
+        self._entries.clear()
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+            "stale_fills": self.stale_fills,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+        }
+
+# Coalesces concurrent identical lookups: the first caller for a key runs the query and
+# everyone asking for the same key while it is in flight awaits its result instead of
+# issuing their own. If that first caller is cancelled, a waiting caller takes over.
+class SingleFlight:
+    def __init__(self, name: str):
+        self.name = name
+        self._calls = {}
+        self.executed = 0
+        self.coalesced = 0
+        _flights.append(self)
+
+    async def do(self, key, fetch):
+        if key in self._calls:
+            self.coalesced += 1
+        while key in self._calls:
+            future = self._calls[key]
+            try:
+                return await asyncio.shield(future)
+            except asyncio.CancelledError:
+                if not future.cancelled():
+                    raise
+        future = self._calls[key] = asyncio.get_running_loop().create_future()
+        self.executed += 1
+        try:
+            result = await fetch()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Mark it retrieved; with no waiters nobody else will
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            self.forget(key, future)
+
+    # Callers arriving after a write must not join a query that started before it
+    def forget(self, key, future=None):
+        if future is None or self._calls.get(key) is future:
+            self._calls.pop(key, None)
+
+    def forget_where(self, predicate):
+        for key in [key for key in self._calls if predicate(key)]:
+            del self._calls[key]
+
+    def stats(self):
+        requests = self.executed + self.coalesced
+        return {
+            "in_flight": len(self._calls),
+            "executed": self.executed,
+            "coalesced": self.coalesced,
+            "coalesced_ratio": self.coalesced / requests if requests else 0.0,
+        }
+
+_caches = []
+_flights = []
+
+def cache_stats():
+    return {cache.name: cache.stats() for cache in _caches}
+
+def single_flight_stats():
+    return {flight.name: flight.stats() for flight in _flights}
\ No newline at end of file
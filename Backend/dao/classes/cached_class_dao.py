@@ -0,0 +1,91 @@
+from dao.cache import SingleFlight, TTLCache
+from dao.classes.class_interface import ClassDAOInterface
+
+# Read-through cache in front of any ClassDAOInterface. Membership writes and deletes
+# invalidate the affected entries explicitly; everything else relies on the TTL.
+# Entries are keyed by (key, fields), so each projection is cached as loaded and a delete
+# drops every projection of the class. Concurrent misses for the same key share one query.
+class CachedClassDAO(ClassDAOInterface):
+    def __init__(self, inner: ClassDAOInterface):
+        self.inner = inner
+        self.classes = TTLCache("class")
+        self.class_codes = TTLCache("class_code")
+        self.members = TTLCache("class_members")
+        self.class_lookups = SingleFlight("class")
+        self.class_code_lookups = SingleFlight("class_code")
+        self.member_lookups = SingleFlight("class_members")
+
+    async def create_class(self, class_obj):
+        return await self.inner.create_class(class_obj)
+
+    async def find_by_id(self, class_id, fields=None):
+        key = (class_id, tuple(fields) if fields else None)
+        class_obj = self.classes.get(key)
+        if class_obj is None:
+            generation = self.classes.generation(key)
+            class_obj = await self.class_lookups.do(key, lambda: self.inner.find_by_id(class_id, fields))
+            if class_obj:
+                self.classes.set(key, class_obj, generation)
+        return class_obj
+
+    async def find_by_class_code(self, class_code, fields=None):
+        key = (class_code, tuple(fields) if fields else None)
+        class_obj = self.class_codes.get(key)
+        if class_obj is None:
+            generation = self.class_codes.generation(key)
+            class_obj = await self.class_code_lookups.do(key, lambda: self.inner.find_by_class_code(class_code, fields))
+            if class_obj:
+                self.class_codes.set(key, class_obj, generation)
+        return class_obj
+
+    async def add_user_to_class(self, class_id: str, user_id: str):
+        await self.inner.add_user_to_class(class_id, user_id)
+        self.members.invalidate(class_id)
+        self.member_lookups.forget(class_id)
+
+    async def add_users_to_class(self, class_id: str, user_ids):
+        try:
+            return await self.inner.add_users_to_class(class_id, user_ids)
+        finally:
+            self.members.invalidate(class_id)
+            self.member_lookups.forget(class_id)
+
+    async def get_class_members(self, class_id: str):
+        members = self.members.get(class_id)
+        if members is None:
+            generation = self.members.generation(class_id)
+            members = await self.member_lookups.do(class_id, lambda: self.inner.get_class_members(class_id))
+            self.members.set(class_id, members, generation)
+        return members
+
+    def iter_class_members(self, class_id: str, batch_size: int):
+        return self.inner.iter_class_members(class_id, batch_size)
+
+    async def get_user_memberships(self, user_id: str):
+        return await self.inner.get_user_memberships(user_id)
+
+    async def is_class_member(self, class_id: str, user_id: str) -> bool:
+        return await self.inner.is_class_member(class_id, user_id)
+
+    async def list_class_members(self, class_id: str, limit: int, after: str = None, include_profile: bool = False):
+        return await self.inner.list_class_members(class_id, limit, after, include_profile)
+
+    async def get_user_classes(self, user_id: str, limit: int, after: str = None):
+        return await self.inner.get_user_classes(user_id, limit, after)
+
+    async def remove_user_from_class(self, class_id: str, user_id: str):
+        try:
+            await self.inner.remove_user_from_class(class_id, user_id)
+        finally:
+            self.members.invalidate(class_id)
+            self.member_lookups.forget(class_id)
+
+    async def delete_class(self, class_id: str):
+        try:
+            await self.inner.delete_class(class_id)
+        finally:
+            self.classes.invalidate_where(lambda class_obj: class_obj.class_id == class_id)
+            self.class_lookups.forget_where(lambda key: key[0] == class_id)
+            self.class_codes.invalidate_where(lambda class_obj: class_obj.class_id == class_id)
+            self.members.invalidate(class_id)
+            self.member_lookups.forget(class_id)
\ No newline at end of file
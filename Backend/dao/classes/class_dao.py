@@ -1,8 +1,10 @@
 import logging
+from datetime import datetime
 from bson import ObjectId
 from fastapi import HTTPException
-from dao.db_config import Database
-from dao.classes.object import Class
+from pymongo.errors import BulkWriteError, DuplicateKeyError
+from dao.db_config import Database, duplicate_key_fields
+from dao.classes.object import CLASS_CODE_ATTEMPTS, Class, generate_class_code
 from dao.classes.class_interface import ClassDAOInterface
 
 logger = logging.getLogger(__name__)
@@ -13,20 +15,30 @@ class ClassDAO(ClassDAOInterface):
         self.collection = self.db.classes
         logger.info("ClassDAO initialized")
 
+    # The unique index on class_code is the collision check; a clash is retried with a new code,
+    # which is written back to class_obj so the caller can respond without re-reading
     async def create_class(self, class_obj):
-        class_dict = class_obj.to_dict()
-        result = await self.collection.insert_one(class_dict)
-        return str(result.inserted_id)
+        for _ in range(CLASS_CODE_ATTEMPTS):
+            try:
+                result = await self.collection.insert_one(class_obj.to_dict())
+                return str(result.inserted_id)
+            except DuplicateKeyError as e:
+                fields = duplicate_key_fields(e.details)
+                if fields and "class_code" not in fields:
+                    raise
+                class_obj.class_code = generate_class_code()
+        raise HTTPException(status_code=400, detail="Class code already exists")
 
-    async def find_by_id(self, class_id):
-        class_data = await self.collection.find_one({"_id": ObjectId(class_id)})
+    # fields limits the document to those fields (plus _id); None loads everything
+    async def find_by_id(self, class_id, fields=None):
+        class_data = await self.collection.find_one({"_id": ObjectId(class_id)}, fields)
         if class_data:
             class_data["class_id"] = str(class_data.pop("_id"))
             return Class.from_dict(class_data)
         return None
 
-    async def find_by_class_code(self, class_code):
-        class_data = await self.collection.find_one({"class_code": class_code})
+    async def find_by_class_code(self, class_code, fields=None):
+        class_data = await self.collection.find_one({"class_code": class_code}, fields)
         if class_data:
             class_data["class_id"] = str(class_data.pop("_id"))
             return Class.from_dict(class_data)
@@ -40,19 +52,87 @@ class ClassDAO(ClassDAOInterface):
         }
         try:
             await self.db.class_memberships.insert_one(membership)
-        except Exception as e:
-            if "duplicate key error" in str(e):
-                raise HTTPException(status_code=400, detail="User already in class")
-            raise e
+        except DuplicateKeyError:
+            raise HTTPException(status_code=400, detail="User already in class")
+
+    # One unordered insert for a whole roster; returns the user ids that were already members
+    async def add_users_to_class(self, class_id: str, user_ids):
+        joined_at = datetime.utcnow()
+        memberships = [{"class_id": class_id, "user_id": user_id, "joined_at": joined_at} for user_id in user_ids]
+        if not memberships:
+            return set()
+        try:
+            await self.db.class_memberships.insert_many(memberships, ordered=False)
+        except BulkWriteError as e:
+            errors = e.details.get("writeErrors", [])
+            if any(error.get("code") != 11000 for error in errors):
+                raise
+            return {memberships[error["index"]]["user_id"] for error in errors}
+        return set()
 
     async def get_class_members(self, class_id: str):
-        memberships = await self.db.class_memberships.find({"class_id": class_id}).to_list(None)
+        memberships = await self.db.class_memberships.find({"class_id": class_id}, {"_id": 0, "user_id": 1}).to_list(None)
         return [{"user_id": m["user_id"]} for m in memberships]
 
+    # Streams the roster in index order, batch_size memberships per round trip
+    async def iter_class_members(self, class_id: str, batch_size: int):
+        cursor = self.db.class_memberships.find({"class_id": class_id}, {"_id": 0, "user_id": 1, "joined_at": 1})
+        async for membership in cursor.batch_size(batch_size):
+            yield membership
+
     async def get_user_memberships(self, user_id: str):
         memberships = await self.db.class_memberships.find({"user_id": user_id}).to_list(None)
         return [{"class_id": m["class_id"]} for m in memberships]
 
+    async def is_class_member(self, class_id: str, user_id: str) -> bool:
+        return await self.db.class_memberships.find_one({"class_id": class_id, "user_id": user_id}, {"_id": 1}) is not None
+
+    # One page of the roster in user_id order off the (class_id, user_id) index. With
+    # include_profile each member's username is joined in the same aggregation.
+    async def list_class_members(self, class_id: str, limit: int, after: str = None, include_profile: bool = False):
+        match = {"class_id": class_id}
+        if after:
+            match["user_id"] = {"$gt": after}
+        pipeline = [
+            {"$match": match},
+            {"$sort": {"user_id": 1}},
+            {"$limit": limit + 1},
+        ]
+        if include_profile:
+            pipeline += [
+                {"$addFields": {"user_oid": {"$convert": {"input": "$user_id", "to": "objectId", "onError": None}}}},
+                {"$lookup": {"from": "users", "localField": "user_oid", "foreignField": "_id",
+                             "pipeline": [{"$project": {"_id": 0, "username": 1}}], "as": "user"}},
+                {"$project": {"_id": 0, "user_id": 1, "username": {"$first": "$user.username"}}},
+            ]
+        else:
+            pipeline.append({"$project": {"_id": 0, "user_id": 1}})
+        rows = await self.db.class_memberships.aggregate(pipeline).to_list(limit + 1)
+        next_cursor = rows[limit - 1]["user_id"] if len(rows) > limit else None
+        return rows[:limit], next_cursor
+
+    async def get_user_classes(self, user_id: str, limit: int, after: str = None):
+        match = {"user_id": user_id}
+        if after:
+            match["class_id"] = {"$gt": after}
+        pipeline = [
+            {"$match": match},
+            {"$sort": {"class_id": 1}},
+            {"$limit": limit + 1},
+            {"$addFields": {"class_oid": {"$convert": {"input": "$class_id", "to": "objectId", "onError": None}}}},
+            {"$lookup": {"from": "classes", "localField": "class_oid", "foreignField": "_id", "as": "class"}},
+            {"$unwind": {"path": "$class", "preserveNullAndEmptyArrays": True}},
+        ]
+        rows = await self.db.class_memberships.aggregate(pipeline).to_list(limit + 1)
+        next_cursor = rows[limit - 1]["class_id"] if len(rows) > limit else None
+        classes = []
+        for row in rows[:limit]:
+            class_data = row.get("class")
+            if class_data:
+                class_data["class_id"] = str(class_data.pop("_id"))
+                classes.append(Class.from_dict(class_data))
+        return classes, next_cursor
+
     async def remove_user_from_class(self, class_id: str, user_id: str):
         result = await self.db.class_memberships.delete_one({"class_id": class_id, "user_id": user_id})
         if result.deleted_count == 0:
@@ -61,5 +141,4 @@ class ClassDAO(ClassDAOInterface):
     async def delete_class(self, class_id: str):
         result = await self.collection.delete_one({"_id": ObjectId(class_id)})
         if result.deleted_count == 0:
-            raise HTTPException(status_code=404, detail="Class not found")
-        await self.db.class_memberships.delete_many({"class_id": class_id})
\ No newline at end of file
+            raise HTTPException(status_code=404, detail="Class not found")
\ No newline at end of file
@@ -6,25 +6,46 @@ class ClassDAOInterface(ABC):
         pass
 
     @abstractmethod
-    async def find_by_id(self, class_id: str):
+    async def find_by_id(self, class_id: str, fields=None):
         pass
 
     @abstractmethod
-    async def find_by_class_code(self, class_code: str):
+    async def find_by_class_code(self, class_code: str, fields=None):
         pass
 
     @abstractmethod
     async def add_user_to_class(self, class_id: str, user_id: str):
         pass
 
+    @abstractmethod
+    async def add_users_to_class(self, class_id: str, user_ids):
+        pass
+
     @abstractmethod
     async def get_class_members(self, class_id: str):
         pass
 
+    # Returns an async iterator over the class's memberships
+    @abstractmethod
+    def iter_class_members(self, class_id: str, batch_size: int):
+        pass
+
     @abstractmethod
     async def get_user_memberships(self, user_id: str):
         pass
 
+    @abstractmethod
+    async def is_class_member(self, class_id: str, user_id: str) -> bool:
+        pass
+
+    @abstractmethod
+    async def list_class_members(self, class_id: str, limit: int, after: str = None, include_profile: bool = False):
+        pass
+
+    @abstractmethod
+    async def get_user_classes(self, user_id: str, limit: int, after: str = None):
+        pass
+
     @abstractmethod
     async def remove_user_from_class(self, class_id: str, user_id: str):
         pass
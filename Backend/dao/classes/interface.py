@@ -1,4 +1,5 @@
 from pydantic import BaseModel, Field
+from typing import List, Optional
 
 class ClassCreateRequest(BaseModel):
     class_name: str = Field(..., min_length=1, max_length=100)
@@ -15,4 +16,22 @@ class ClassResponse(BaseModel):
     created_by: str
 
 class ClassMemberResponse(BaseModel):
-    user_id: str
\ No newline at end of file
+    user_id: str
+    # Only with include=profile
+    username: Optional[str] = None
+
+# Instructors import a roster by user id, by email, or both
+class ClassBulkEnrollRequest(BaseModel):
+    user_ids: List[str] = Field(default_factory=list, max_length=5000)
+    emails: List[str] = Field(default_factory=list, max_length=5000)
+
+class ClassBulkEnrollResult(BaseModel):
+    identifier: str
+    user_id: Optional[str]
+    status: str  # "added", "already_member" or "unknown_user"
+
+class ClassBulkEnrollResponse(BaseModel):
+    added: int
+    already_member: int
+    unknown_user: int
+    results: List[ClassBulkEnrollResult]
\ No newline at end of file
@@ -0,0 +1,110 @@
+from datetime import datetime
+from fastapi import HTTPException
+from dao.memory_store import memory_store, project
+from dao.classes.object import CLASS_CODE_ATTEMPTS, Class, generate_class_code
+from dao.classes.class_interface import ClassDAOInterface
+
+class InMemoryClassDAO(ClassDAOInterface):
+    def __init__(self, store=memory_store):
+        self.store = store
+        self.classes = store.collection("classes")
+        self.memberships = store.collection("class_memberships")
+
+    def _to_class(self, class_data):
+        class_data = dict(class_data)
+        class_data["class_id"] = str(class_data.pop("_id"))
+        return Class.from_dict(class_data)
+
+    async def create_class(self, class_obj):
+        for _ in range(CLASS_CODE_ATTEMPTS):
+            self.store.record("classes", "insert")
+            if all(c["class_code"] != class_obj.class_code for c in self.classes.values()):
+                class_dict = class_obj.to_dict()
+                self.classes[str(class_dict["_id"])] = class_dict
+                return str(class_dict["_id"])
+            class_obj.class_code = generate_class_code()
+        raise HTTPException(status_code=400, detail="Class code already exists")
+
+    async def find_by_id(self, class_id, fields=None):
+        self.store.record("classes", "find")
+        class_data = self.classes.get(class_id)
+        return self._to_class(project(class_data, fields)) if class_data else None
+
+    async def find_by_class_code(self, class_code, fields=None):
+        self.store.record("classes", "find")
+        for class_data in self.classes.values():
+            if class_data["class_code"] == class_code:
+                return self._to_class(project(class_data, fields))
+        return None
+
+    async def add_user_to_class(self, class_id: str, user_id: str):
+        self.store.record("class_memberships", "insert")
+        if (class_id, user_id) in self.memberships:
+            raise HTTPException(status_code=400, detail="User already in class")
+        self.memberships[(class_id, user_id)] = {"class_id": class_id, "user_id": user_id, "joined_at": datetime.utcnow()}
+
+    async def add_users_to_class(self, class_id: str, user_ids):
+        self.store.record("class_memberships", "insert")
+        existing = set()
+        joined_at = datetime.utcnow()
+        for user_id in user_ids:
+            if (class_id, user_id) in self.memberships:
+                existing.add(user_id)
+            else:
+                self.memberships[(class_id, user_id)] = {"class_id": class_id, "user_id": user_id, "joined_at": joined_at}
+        return existing
+
+    async def get_class_members(self, class_id: str):
+        self.store.record("class_memberships", "find")
+        return [{"user_id": m["user_id"]} for m in self.memberships.values() if m["class_id"] == class_id]
+
+    async def iter_class_members(self, class_id: str, batch_size: int):
+        rows = sorted((m for m in self.memberships.values() if m["class_id"] == class_id), key=lambda m: m["user_id"])
+        for index, membership in enumerate(rows):
+            if index % batch_size == 0:
+                self.store.record("class_memberships", "find")
+            yield {"user_id": membership["user_id"], "joined_at": membership["joined_at"]}
+
+    async def get_user_memberships(self, user_id: str):
+        self.store.record("class_memberships", "find")
+        return [{"class_id": m["class_id"]} for m in self.memberships.values() if m["user_id"] == user_id]
+
+    async def is_class_member(self, class_id: str, user_id: str) -> bool:
+        self.store.record("class_memberships", "find")
+        return (class_id, user_id) in self.memberships
+
+    async def list_class_members(self, class_id: str, limit: int, after: str = None, include_profile: bool = False):
+        self.store.record("class_memberships", "aggregate")
+        user_ids = sorted(
+            m["user_id"] for m in self.memberships.values()
+            if m["class_id"] == class_id and (after is None or m["user_id"] > after)
+        )
+        next_cursor = user_ids[limit - 1] if len(user_ids) > limit else None
+        users = self.store.collection("users")
+        rows = []
+        for user_id in user_ids[:limit]:
+            row = {"user_id": user_id}
+            if include_profile:
+                row["username"] = users.get(user_id, {}).get("username")
+            rows.append(row)
+        return rows, next_cursor
+
+    async def get_user_classes(self, user_id: str, limit: int, after: str = None):
+        self.store.record("class_memberships", "aggregate")
+        class_ids = sorted(
+            m["class_id"] for m in self.memberships.values()
+            if m["user_id"] == user_id and (after is None or m["class_id"] > after)
+        )
+        next_cursor = class_ids[limit - 1] if len(class_ids) > limit else None
+        classes = [self._to_class(self.classes[class_id]) for class_id in class_ids[:limit] if class_id in self.classes]
+        return classes, next_cursor
+
+    async def remove_user_from_class(self, class_id: str, user_id: str):
+        self.store.record("class_memberships", "delete")
+        if self.memberships.pop((class_id, user_id), None) is None:
+            raise HTTPException(status_code=404, detail="User not in class")
+
+    async def delete_class(self, class_id: str):
+        self.store.record("classes", "delete")
+        if self.classes.pop(class_id, None) is None:
+            raise HTTPException(status_code=404, detail="Class not found")
\ No newline at end of file
@@ -2,13 +2,21 @@ from datetime import datetime
 from bson import ObjectId
 import secrets
 
+# Codes are random, so a collision on the unique index is retried with a fresh one
+CLASS_CODE_ATTEMPTS = 3
+
+def generate_class_code() -> str:
+    return secrets.token_urlsafe(8)
+
 class Class:
+    __slots__ = ("class_id", "class_name", "description", "created_by", "class_code", "created_at", "updated_at")
+
     def __init__(self, class_name, created_by, description=None, class_id=None, class_code=None, created_at=None, updated_at=None):
         self.class_id = class_id if class_id else str(ObjectId())
         self.class_name = class_name
         self.description = description
         self.created_by = created_by
-        self.class_code = class_code if class_code else secrets.token_urlsafe(8)
+        self.class_code = class_code if class_code else generate_class_code()
         self.created_at = created_at if created_at else datetime.utcnow()
         self.updated_at = updated_at if updated_at else datetime.utcnow()
 
@@ -25,14 +33,25 @@ class Class:
             class_dict["_id"] = ObjectId(self.class_id)
         return class_dict
 
+    # Shape of ClassResponse, built without a pydantic round trip
+    def to_response(self):
+        return {
+            "class_id": self.class_id,
+            "class_name": self.class_name,
+            "description": self.description,
+            "class_code": self.class_code,
+            "created_by": self.created_by
+        }
+
+    # Loads a stored (possibly projected) document as is: no new ids, codes or timestamps are generated
     @classmethod
     def from_dict(cls, data):
-        return cls(
-            class_name=data.get("class_name"),
-            created_by=data.get("created_by"),
-            description=data.get("description"),
-            class_id=data.get("class_id"),
-            class_code=data.get("class_code"),
-            created_at=data.get("created_at"),
-            updated_at=data.get("updated_at")
-        )
\ No newline at end of file
+        class_obj = cls.__new__(cls)
+        class_obj.class_id = data.get("class_id")
+        class_obj.class_name = data.get("class_name")
+        class_obj.description = data.get("description")
+        class_obj.created_by = data.get("created_by")
+        class_obj.class_code = data.get("class_code")
+        class_obj.created_at = data.get("created_at")
+        class_obj.updated_at = data.get("updated_at")
+        return class_obj
\ No newline at end of file
@@ -1,5 +1,8 @@
 from motor.motor_asyncio import AsyncIOMotorClient
-from pymongo.errors import ConnectionFailure
+from pymongo import ASCENDING, IndexModel
+from pymongo.errors import CollectionInvalid, ConnectionFailure
+from dao.monitoring import pool_monitor, command_monitor
+import asyncio
 import logging
 import os
 
@@ -7,6 +10,18 @@ logger = logging.getLogger(__name__)
 
 MONGODB_URI = os.getenv("MONGODB_URI", "mongodb://localhost:27017/classmeet")
 
+def _optional_int(name):
+    value = os.getenv(name)
+    return int(value) if value else None
+
+# Connection pool settings; unset values keep the driver defaults
+MONGO_POOL_OPTIONS = {
+    "maxPoolSize": int(os.getenv("MONGO_MAX_POOL_SIZE", 100)),
+    "minPoolSize": int(os.getenv("MONGO_MIN_POOL_SIZE", 0)),
+    "maxIdleTimeMS": _optional_int("MONGO_MAX_IDLE_TIME_MS"),
+    "waitQueueTimeoutMS": _optional_int("MONGO_WAIT_QUEUE_TIMEOUT_MS"),
+}
+
 class Database:
     _instance = None
     _client = None
@@ -21,7 +36,11 @@ class Database:
     def __init__(self):
         if Database._client is None:
             try:
-                self._client = AsyncIOMotorClient(MONGODB_URI)
+                self._client = AsyncIOMotorClient(
+                    MONGODB_URI,
+                    event_listeners=[pool_monitor, command_monitor],
+                    **{key: value for key, value in MONGO_POOL_OPTIONS.items() if value is not None}
+                )
                 db_name = MONGODB_URI.split("/")[-1].split("?")[0] or "classmeet"
                 self._db = self._client[db_name]
                 logger.info(f"Connected to MongoDB database: {db_name}")
@@ -40,21 +59,73 @@ class Database:
             self._client = None
             self._db = None
 
-async def initialize_db():
-    db = Database.get_instance().db
-    collections = ["users", "classes", "class_memberships", "meetings", "meeting_participants", "chat_messages"]
-    for collection_name in collections:
-        collection_names = await db.list_collection_names()
-        if collection_name not in collection_names:
-            await db.create_collection(collection_name)
+# Every query the DAOs run is backed by one of these; keep dao/verify_indexes.py in sync
+INDEXES = {
+    "users": [
+        IndexModel([("email", ASCENDING)], unique=True),
+        IndexModel([("username", ASCENDING)], unique=True),
+    ],
+    "classes": [
+        IndexModel([("class_code", ASCENDING)], unique=True),
+        IndexModel([("created_by", ASCENDING)]),
+    ],
+    "class_memberships": [
+        IndexModel([("class_id", ASCENDING), ("user_id", ASCENDING)], unique=True),
+        IndexModel([("user_id", ASCENDING), ("class_id", ASCENDING)]),
+    ],
+    "meetings": [
+        # Also serves plain class_id lookups through its prefix
+        IndexModel([("class_id", ASCENDING), ("start_time", ASCENDING)]),
+    ],
+    "meeting_participants": [
+        IndexModel([("meeting_id", ASCENDING), ("user_id", ASCENDING)], unique=True),
+    ],
+    # Legacy per-message history, read only by the chat_archive migration
+    "chat_messages": [
+        IndexModel([("meeting_id", ASCENDING), ("_id", ASCENDING)]),
+    ],
+    "chat_buckets": [
+        IndexModel([("meeting_id", ASCENDING), ("window_start", ASCENDING)]),
+        IndexModel([("meeting_id", ASCENDING), ("last_id", ASCENDING)]),
+        IndexModel([("meeting_id", ASCENDING), ("first_id", ASCENDING)]),
+        IndexModel([("updated_at", ASCENDING)]),
+        # Only buckets written while CHAT_RETENTION_DAYS is set carry expire_at
+        IndexModel([("expire_at", ASCENDING)], expireAfterSeconds=0),
+    ],
+    "jobs": [
+        IndexModel([("status", ASCENDING), ("created_at", ASCENDING)]),
+        # Finished jobs stay around for a week so their progress can still be read
+        IndexModel([("finished_at", ASCENDING)], expireAfterSeconds=7 * 24 * 3600),
+    ],
+    "broadcast_events": [
+        IndexModel([("created_at", ASCENDING)], expireAfterSeconds=300),
+    ],
+}
 
+# Fields of the unique index a DuplicateKeyError or bulk write error collided on, read from the
+# keyPattern the server reports with the error. Empty if the server does not report one.
+def duplicate_key_fields(details) -> set:
+    details = details or {}
+    return set(details.get("keyPattern") or details.get("keyValue") or ())
+
+async def _create_collection(db, collection_name):
     try:
-        await db.users.create_index("email", unique=True)
-        await db.users.create_index("username", unique=True)
-        await db.classes.create_index("class_code", unique=True)
-        await db.class_memberships.create_index([("class_id", 1), ("user_id", 1)], unique=True)
-        await db.meeting_participants.create_index([("meeting_id", 1), ("user_id", 1)], unique=True)
-    except Exception as e:
-        logger.warning(f"Error creating indexes: {e}")
+        await db.create_collection(collection_name)
+    except CollectionInvalid:
+        # Another worker created it first
+        pass
+
+async def initialize_db():
+    db = Database.get_instance().db
+    existing = set(await db.list_collection_names())
+    await asyncio.gather(*(_create_collection(db, name) for name in INDEXES if name not in existing))
 
+    results = await asyncio.gather(
+        *(db[name].create_indexes(indexes) for name, indexes in INDEXES.items()),
+        return_exceptions=True
+    )
+    for name, result in zip(INDEXES, results):
+        if isinstance(result, Exception):
+            logger.warning(f"Error creating indexes on {name}: {result}")
+    logger.info("Database collections and indexes initialized")
     return db
\ No newline at end of file
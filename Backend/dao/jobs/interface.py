@@ -0,0 +1,13 @@
+from pydantic import BaseModel
+from typing import Dict, Optional
+
+class JobResponse(BaseModel):
+    job_id: str
+    type: str
+    status: str
+    progress: Dict[str, int]
+    attempts: int
+    error: Optional[str]
+    created_at: str
+    updated_at: str
+    finished_at: Optional[str]
\ No newline at end of file
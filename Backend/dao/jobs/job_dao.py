@@ -0,0 +1,80 @@
+import logging
+from datetime import datetime, timedelta
+from bson import ObjectId
+from pymongo import ReturnDocument
+from dao.db_config import Database
+from dao.jobs.object import Job
+from dao.jobs.job_interface import JobDAOInterface
+
+logger = logging.getLogger(__name__)
+
+class JobDAO(JobDAOInterface):
+    def __init__(self):
+        self.db = Database.get_instance().db
+        self.collection = self.db.jobs
+        logger.info("JobDAO initialized")
+
+    async def create_job(self, job):
+        result = await self.collection.insert_one(job.to_dict())
+        return str(result.inserted_id)
+
+    async def find_by_id(self, job_id):
+        if not ObjectId.is_valid(job_id):
+            return None
+        job_data = await self.collection.find_one({"_id": ObjectId(job_id)})
+        return Job.from_dict(job_data) if job_data else None
+
+    # Atomically takes the oldest pending job that is due, or a running one whose owner stopped
+    # renewing its lease, as long as it has attempts left
+    async def claim_job(self, owner: str, lease_seconds: float, max_attempts: int):
+        now = datetime.utcnow()
+        job_data = await self.collection.find_one_and_update(
+            {"$or": [{"status": "pending", "run_after": {"$lte": now}}, {"status": "running", "lease_until": {"$lt": now}}],
+             "attempts": {"$lt": max_attempts}},
+            {"$set": {"status": "running", "owner": owner, "lease_until": now + timedelta(seconds=lease_seconds), "updated_at": now},
+             "$inc": {"attempts": 1}},
+            sort=[("created_at", 1)],
+            return_document=ReturnDocument.AFTER
+        )
+        return Job.from_dict(job_data) if job_data else None
+
+    # A job whose lease ran out on its last attempt is never claimed again; mark it failed
+    async def fail_expired_jobs(self, max_attempts: int) -> int:
+        now = datetime.utcnow()
+        result = await self.collection.update_many(
+            {"status": "running", "lease_until": {"$lt": now}, "attempts": {"$gte": max_attempts}},
+            {"$set": {"status": "failed", "error": f"Lease expired on attempt {max_attempts}", "owner": None,
+                      "lease_until": None, "updated_at": now, "finished_at": now}}
+        )
+        return result.modified_count
+
+    async def renew_job(self, job_id: str, owner: str, progress: dict, lease_seconds: float) -> bool:
+        now = datetime.utcnow()
+        result = await self.collection.update_one(
+            {"_id": ObjectId(job_id), "owner": owner, "status": "running"},
+            {"$set": {"progress": progress, "lease_until": now + timedelta(seconds=lease_seconds), "updated_at": now}}
+        )
+        return result.matched_count == 1
+
+    async def release_job(self, job_id: str, owner: str, status: str, error: str = None, run_after=None):
+        now = datetime.utcnow()
+        update = {"status": status, "error": error, "owner": None, "lease_until": None, "updated_at": now}
+        if run_after is not None:
+            update["run_after"] = run_after
+        if status in ("done", "failed"):
+            update["finished_at"] = now
+        await self.collection.update_one({"_id": ObjectId(job_id), "owner": owner}, {"$set": update})
+
+    # Cascade primitives: a bounded page of matching ids, then a delete by _id, so no single
+    # delete ever runs over an unbounded range
+    async def find_ids(self, collection: str, query: dict, limit: int):
+        return [doc["_id"] async for doc in self.db[collection].find(query, {"_id": 1}).limit(limit)]
+
+    async def find_documents(self, collection: str, query: dict, fields, limit: int):
+        return await self.db[collection].find(query, {field: 1 for field in fields}).limit(limit).to_list(limit)
+
+    async def delete_ids(self, collection: str, ids) -> int:
+        if not ids:
+            return 0
+        result = await self.db[collection].delete_many({"_id": {"$in": list(ids)}})
+        return result.deleted_count
\ No newline at end of file
@@ -0,0 +1,38 @@
+from abc import ABC, abstractmethod
+
+class JobDAOInterface(ABC):
+    @abstractmethod
+    async def create_job(self, job):
+        pass
+
+    @abstractmethod
+    async def find_by_id(self, job_id: str):
+        pass
+
+    @abstractmethod
+    async def claim_job(self, owner: str, lease_seconds: float, max_attempts: int):
+        pass
+
+    @abstractmethod
+    async def fail_expired_jobs(self, max_attempts: int) -> int:
+        pass
+
+    @abstractmethod
+    async def renew_job(self, job_id: str, owner: str, progress: dict, lease_seconds: float) -> bool:
+        pass
+
+    @abstractmethod
+    async def release_job(self, job_id: str, owner: str, status: str, error: str = None, run_after=None):
+        pass
+
+    @abstractmethod
+    async def find_ids(self, collection: str, query: dict, limit: int):
+        pass
+
+    @abstractmethod
+    async def find_documents(self, collection: str, query: dict, fields, limit: int):
+        pass
+
+    @abstractmethod
+    async def delete_ids(self, collection: str, ids) -> int:
+        pass
\ No newline at end of file
@@ -0,0 +1,106 @@
+from datetime import datetime, timedelta
+from dao.memory_store import memory_store
+from dao.jobs.object import Job
+from dao.jobs.job_interface import JobDAOInterface
+
+def _matches(document, query):
+    for field, condition in query.items():
+        if isinstance(condition, dict) and "$in" in condition:
+            if document.get(field) not in condition["$in"]:
+                return False
+        elif document.get(field) != condition:
+            return False
+    return True
+
+class InMemoryJobDAO(JobDAOInterface):
+    def __init__(self, store=memory_store):
+        self.store = store
+        self.jobs = store.collection("jobs")
+
+    async def create_job(self, job):
+        self.store.record("jobs", "insert")
+        job_dict = job.to_dict()
+        self.jobs[job.job_id] = job_dict
+        return job.job_id
+
+    async def find_by_id(self, job_id):
+        self.store.record("jobs", "find")
+        job_data = self.jobs.get(job_id)
+        return Job.from_dict(job_data) if job_data else None
+
+    async def claim_job(self, owner: str, lease_seconds: float, max_attempts: int):
+        self.store.record("jobs", "find_and_modify")
+        now = datetime.utcnow()
+        claimable = [
+            job_data for job_data in self.jobs.values()
+            if job_data["attempts"] < max_attempts and (
+                (job_data["status"] == "pending" and job_data["run_after"] <= now)
+                or (job_data["status"] == "running" and job_data["lease_until"] < now))
+        ]
+        if not claimable:
+            return None
+        job_data = min(claimable, key=lambda job_data: job_data["created_at"])
+        job_data.update(status="running", owner=owner, lease_until=now + timedelta(seconds=lease_seconds), updated_at=now)
+        job_data["attempts"] += 1
+        return Job.from_dict(job_data)
+
+    async def fail_expired_jobs(self, max_attempts: int) -> int:
+        self.store.record("jobs", "update")
+        now = datetime.utcnow()
+        failed = 0
+        for job_data in self.jobs.values():
+            if job_data["status"] == "running" and job_data["lease_until"] < now and job_data["attempts"] >= max_attempts:
+                job_data.update(status="failed", error=f"Lease expired on attempt {max_attempts}", owner=None,
+                                lease_until=None, updated_at=now, finished_at=now)
+                failed += 1
+        return failed
+
+    async def renew_job(self, job_id: str, owner: str, progress: dict, lease_seconds: float) -> bool:
+        self.store.record("jobs", "update")
+        job_data = self.jobs.get(job_id)
+        if not job_data or job_data["owner"] != owner or job_data["status"] != "running":
+            return False
+        now = datetime.utcnow()
+        job_data.update(progress=dict(progress), lease_until=now + timedelta(seconds=lease_seconds), updated_at=now)
+        return True
+
+    async def release_job(self, job_id: str, owner: str, status: str, error: str = None, run_after=None):
+        self.store.record("jobs", "update")
+        job_data = self.jobs.get(job_id)
+        if not job_data or job_data["owner"] != owner:
+            return
+        now = datetime.utcnow()
+        job_data.update(status=status, error=error, owner=None, lease_until=None, updated_at=now)
+        if run_after is not None:
+            job_data["run_after"] = run_after
+        if status in ("done", "failed"):
+            job_data["finished_at"] = now
+
+    # Collections in the memory store are keyed by whatever the owning DAO uses, so the
+    # keys stand in for _id here
+    async def find_ids(self, collection: str, query: dict, limit: int):
+        self.store.record(collection, "find")
+        ids = []
+        for key, document in self.store.collection(collection).items():
+            if _matches(document, query):
+                ids.append(key)
+                if len(ids) == limit:
+                    break
+        return ids
+
+    async def find_documents(self, collection: str, query: dict, fields, limit: int):
+        self.store.record(collection, "find")
+        documents = []
+        for key, document in self.store.collection(collection).items():
+            if _matches(document, query):
+                documents.append(dict({field: document.get(field) for field in fields}, _id=key))
+                if len(documents) == limit:
+                    break
+        return documents
+
+    async def delete_ids(self, collection: str, ids) -> int:
+        if not ids:
+            return 0
+        self.store.record(collection, "delete")
+        documents = self.store.collection(collection)
+        return sum(1 for key in ids if documents.pop(key, None) is not None)
\ No newline at end of file
@@ -0,0 +1,61 @@
+from datetime import datetime
+from bson import ObjectId
+
+class Job:
+    __slots__ = ("job_id", "job_type", "params", "created_by", "status", "progress", "attempts", "error",
+                 "owner", "lease_until", "run_after", "created_at", "updated_at", "finished_at")
+
+    def __init__(self, job_type, params, created_by, status="pending", progress=None, attempts=0, error=None,
+                 owner=None, lease_until=None, run_after=None, job_id=None, created_at=None, updated_at=None, finished_at=None):
+        self.job_id = job_id if job_id else str(ObjectId())
+        self.job_type = job_type
+        self.params = params
+        self.created_by = created_by
+        self.status = status
+        self.progress = progress if progress else {}
+        self.attempts = attempts
+        self.error = error
+        self.owner = owner
+        self.lease_until = lease_until
+        self.created_at = created_at if created_at else datetime.utcnow()
+        # Not claimed before this; pushed back after every failed attempt
+        self.run_after = run_after if run_after else self.created_at
+        self.updated_at = updated_at if updated_at else self.created_at
+        self.finished_at = finished_at
+
+    def to_dict(self):
+        return {
+            "_id": ObjectId(self.job_id),
+            "type": self.job_type,
+            "params": self.params,
+            "created_by": self.created_by,
+            "status": self.status,
+            "progress": self.progress,
+            "attempts": self.attempts,
+            "error": self.error,
+            "owner": self.owner,
+            "lease_until": self.lease_until,
+            "run_after": self.run_after,
+            "created_at": self.created_at,
+            "updated_at": self.updated_at,
+            "finished_at": self.finished_at
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        job = cls.__new__(cls)
+        job.job_id = str(data.get("_id"))
+        job.job_type = data.get("type")
+        job.params = data.get("params")
+        job.created_by = data.get("created_by")
+        job.status = data.get("status")
+        job.progress = data.get("progress") or {}
+        job.attempts = data.get("attempts", 0)
+        job.error = data.get("error")
+        job.owner = data.get("owner")
+        job.lease_until = data.get("lease_until")
+        job.created_at = data.get("created_at")
+        job.run_after = data.get("run_after") or job.created_at
+        job.updated_at = data.get("updated_at")
+        job.finished_at = data.get("finished_at")
+        return job
\ No newline at end of file
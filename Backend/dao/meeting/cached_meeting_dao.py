@@ -0,0 +1,59 @@
+from dao.cache import SingleFlight, TTLCache
+from dao.meeting.meeting_interface import MeetingDAOInterface
+
+# Read-through cache for meeting lookups, which run on every join, leave and chat connect.
+# Entries are keyed by (meeting_id, fields), so each projection is cached as loaded and a delete
+# drops every projection of the meeting. Concurrent misses for the same meeting (everyone
+# joining as a lecture starts) share one query.
+class CachedMeetingDAO(MeetingDAOInterface):
+    def __init__(self, inner: MeetingDAOInterface):
+        self.inner = inner
+        self.meetings = TTLCache("meeting")
+        self.meeting_lookups = SingleFlight("meeting")
+
+    async def create_meeting(self, meeting):
+        return await self.inner.create_meeting(meeting)
+
+    async def find_by_id(self, meeting_id, fields=None):
+        key = (meeting_id, tuple(fields) if fields else None)
+        meeting = self.meetings.get(key)
+        if meeting is None:
+            generation = self.meetings.generation(key)
+            meeting = await self.meeting_lookups.do(key, lambda: self.inner.find_by_id(meeting_id, fields))
+            if meeting:
+                self.meetings.set(key, meeting, generation)
+        return meeting
+
+    async def delete_meeting(self, meeting_id: str):
+        try:
+            await self.inner.delete_meeting(meeting_id)
+        finally:
+            self.meetings.invalidate_where(lambda meeting: meeting.meeting_id == meeting_id)
+            self.meeting_lookups.forget_where(lambda key: key[0] == meeting_id)
+
+    async def get_agenda(self, user_id: str, start, end, limit: int, after=None):
+        return await self.inner.get_agenda(user_id, start, end, limit, after)
+
+    async def add_user_to_meeting(self, meeting_id: str, user_id: str):
+        await self.inner.add_user_to_meeting(meeting_id, user_id)
+
+    async def remove_user_from_meeting(self, meeting_id: str, user_id: str):
+        await self.inner.remove_user_from_meeting(meeting_id, user_id)
+
+    async def get_meeting_participants(self, meeting_id: str):
+        return await self.inner.get_meeting_participants(meeting_id)
+
+    async def apply_participant_changes(self, changes):
+        return await self.inner.apply_participant_changes(changes)
+
+    async def sync_participants(self, joined, left):
+        await self.inner.sync_participants(joined, left)
+
+    async def get_messages(self, meeting_id: str, limit: int, before: str = None, after: str = None):
+        return await self.inner.get_messages(meeting_id, limit, before, after)
+
+    def iter_messages(self, meeting_id: str, batch_size: int):
+        return self.inner.iter_messages(meeting_id, batch_size)
+
+    async def insert_messages(self, documents):
+        return await self.inner.insert_messages(documents)
\ No newline at end of file
@@ -0,0 +1,143 @@
+# Maintenance commands for bucketed chat history. Run from Backend/:
+#   python -m dao.meeting.chat_archive archive --out DIR --older-than-days N [--keep]
+#   python -m dao.meeting.chat_archive migrate [--batch-size N]
+#
+# archive writes the transcript of every meeting whose chat has been quiet for N days to
+# DIR/<meeting_id>.<last_message_id>.ndjson.gz (one message per line, oldest first) and then
+# removes its buckets unless --keep is given. migrate moves per-message chat_messages documents
+# from before bucketing into chat_buckets and deletes them once they are stored; it can be rerun
+# after a crash without storing anything twice.
+import argparse
+import asyncio
+import gzip
+import json
+import logging
+import os
+import sys
+from datetime import datetime, timedelta
+from dao.db_config import Database
+from dao.meeting.chat_buckets import merge_buckets
+from dao.meeting.meeting_dao import MeetingDAO
+
+logger = logging.getLogger(__name__)
+
+# Transcript lines handed to the writer thread at a time
+ARCHIVE_WRITE_BATCH = 1000
+
+def to_record(message: dict) -> dict:
+    return {
+        "_id": str(message["_id"]),
+        "meeting_id": message["meeting_id"],
+        "user_id": message["user_id"],
+        "message": message["message"],
+        "timestamp": message["timestamp"].isoformat(),
+    }
+
+# Streams the transcript oldest first (merge_buckets orders overlapping buckets) and writes it
+# in batches, so memory stays bounded however long the meeting's chat is
+async def archive_meeting(db, meeting_id: str, out_dir: str, keep: bool) -> int:
+    bucket_ids = []
+
+    async def buckets():
+        async for bucket in db.chat_buckets.find({"meeting_id": meeting_id}, {"messages": 1, "first_id": 1}).sort("first_id", 1):
+            bucket_ids.append(bucket["_id"])
+            yield bucket
+
+    # Write to a temporary name first so a crash never leaves a truncated archive behind
+    partial_path = os.path.join(out_dir, f"{meeting_id}.partial.ndjson.gz")
+    count = 0
+    last_id = None
+    f = await asyncio.to_thread(gzip.open, partial_path, "wt", encoding="utf-8")
+    try:
+        lines = []
+        async for message in merge_buckets(meeting_id, buckets()):
+            lines.append(json.dumps(to_record(message)) + "\n")
+            last_id = message["_id"]
+            count += 1
+            if len(lines) >= ARCHIVE_WRITE_BATCH:
+                await asyncio.to_thread(f.writelines, lines)
+                lines = []
+        await asyncio.to_thread(f.writelines, lines)
+    except BaseException:
+        await asyncio.to_thread(f.close)
+        os.remove(partial_path)
+        raise
+    await asyncio.to_thread(f.close)
+    if not count:
+        os.remove(partial_path)
+        return 0
+    path = os.path.join(out_dir, f"{meeting_id}.{last_id}.ndjson.gz")
+    os.replace(partial_path, path)
+    if not keep:
+        # Only the exported buckets; anything appended meanwhile stays for the next run
+        await db.chat_buckets.delete_many({"_id": {"$in": bucket_ids}})
+    logger.info(f"Archived {count} messages of meeting {meeting_id} to {path}")
+    return count
+
+async def archive(out_dir: str, older_than_days: float, keep: bool):
+    db = Database.get_instance().db
+    os.makedirs(out_dir, exist_ok=True)
+    cutoff = datetime.utcnow() - timedelta(days=older_than_days)
+    meeting_ids = await db.chat_buckets.distinct("meeting_id", {"updated_at": {"$lt": cutoff}})
+    archived = 0
+    for meeting_id in meeting_ids:
+        # A meeting with any recent bucket is still active
+        if await db.chat_buckets.find_one({"meeting_id": meeting_id, "updated_at": {"$gte": cutoff}}, {"_id": 1}):
+            continue
+        await archive_meeting(db, meeting_id, out_dir, keep)
+        archived += 1
+    print(f"Archived {archived} meetings to {out_dir}")
+
+# Ids of the batch's messages that are already in a bucket. A crash between bucketing a batch
+# and deleting it leaves them in both places; a rerun skips them instead of pushing them again.
+# Only buckets whose id range overlaps the batch can hold them.
+async def already_bucketed(db, batch):
+    ranges = {}
+    for document in batch:
+        low, high = ranges.get(document["meeting_id"], (document["_id"], document["_id"]))
+        ranges[document["meeting_id"]] = (min(low, document["_id"]), max(high, document["_id"]))
+    query = {"$or": [
+        {"meeting_id": meeting_id, "first_id": {"$lte": high}, "last_id": {"$gte": low}}
+        for meeting_id, (low, high) in ranges.items()
+    ]}
+    stored = set()
+    async for bucket in db.chat_buckets.find(query, {"messages._id": 1}):
+        stored.update(entry["_id"] for entry in bucket["messages"])
+    return stored
+
+async def migrate(batch_size: int):
+    db = Database.get_instance().db
+    meeting_dao = MeetingDAO()
+    moved = 0
+    while True:
+        cursor = db.chat_messages.find({}).sort([("meeting_id", 1), ("_id", 1)]).limit(batch_size)
+        batch = await cursor.to_list(length=batch_size)
+        if not batch:
+            break
+        stored = await already_bucketed(db, batch)
+        failed = await meeting_dao.insert_messages([document for document in batch if document["_id"] not in stored])
+        if failed:
+            print(f"{failed} messages could not be bucketed, stopping after {moved} migrated")
+            sys.exit(1)
+        await db.chat_messages.delete_many({"_id": {"$in": [document["_id"] for document in batch]}})
+        moved += len(batch)
+        logger.info(f"Migrated {moved} chat messages")
+    print(f"Migrated {moved} chat messages into buckets")
+
+def main():
+    parser = argparse.ArgumentParser()
+    commands = parser.add_subparsers(dest="command", required=True)
+    archive_parser = commands.add_parser("archive", help="export and remove the chat of meetings that ended")
+    archive_parser.add_argument("--out", required=True, help="directory for the .ndjson.gz transcripts")
+    archive_parser.add_argument("--older-than-days", type=float, required=True)
+    archive_parser.add_argument("--keep", action="store_true", help="export only, leave the buckets in place")
+    migrate_parser = commands.add_parser("migrate", help="move chat_messages documents into buckets")
+    migrate_parser.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args()
+    if args.command == "archive":
+        asyncio.run(archive(args.out, args.older_than_days, args.keep))
+    else:
+        asyncio.run(migrate(args.batch_size))
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,99 @@
+from datetime import datetime, timedelta
+import heapq
+import os
+import bson
+from dotenv import load_dotenv
+
+# Load environment variables from .env
+load_dotenv()
+
+# Chat history is stored as buckets: one document per meeting and time window holding up to
+# CHAT_BUCKET_SIZE messages or CHAT_BUCKET_MAX_BYTES of them (a flush may overshoot by its own
+# size, the caps are checked per write). With frames capped at CHAT_MAX_MESSAGE_BYTES, a bucket
+# stays far below the 16 MB document limit.
+CHAT_BUCKET_SIZE = int(os.getenv("CHAT_BUCKET_SIZE", 200))
+CHAT_BUCKET_MAX_BYTES = int(os.getenv("CHAT_BUCKET_MAX_BYTES", 1024 * 1024))
+CHAT_MAX_MESSAGE_BYTES = int(os.getenv("CHAT_MAX_MESSAGE_BYTES", 4096))
+CHAT_BUCKET_WINDOW_MINUTES = int(os.getenv("CHAT_BUCKET_WINDOW_MINUTES", 60))
+# Buckets expire this many days after their last message; 0 keeps history forever
+CHAT_RETENTION_DAYS = float(os.getenv("CHAT_RETENTION_DAYS", 0))
+
+def window_start(timestamp: datetime) -> datetime:
+    minutes = timestamp.hour * 60 + timestamp.minute
+    minutes -= minutes % CHAT_BUCKET_WINDOW_MINUTES
+    return timestamp.replace(hour=minutes // 60, minute=minutes % 60, second=0, microsecond=0)
+
+def expire_at(now: datetime):
+    return now + timedelta(days=CHAT_RETENTION_DAYS) if CHAT_RETENTION_DAYS else None
+
+# Encoded size of a bucket entry, summed into the bucket's bytes field
+def entry_size(entry: dict) -> int:
+    return len(bson.encode(entry))
+
+# Groups buffered chat documents into (meeting_id, window_start) -> bucket entries, in arrival order
+def group_messages(documents):
+    groups = {}
+    for document in documents:
+        key = (document["meeting_id"], window_start(document["timestamp"]))
+        groups.setdefault(key, []).append({
+            "_id": document["_id"],
+            "user_id": document["user_id"],
+            "message": document["message"],
+            "timestamp": document["timestamp"],
+        })
+    return groups
+
+def to_message(meeting_id: str, entry: dict) -> dict:
+    return dict(entry, meeting_id=meeting_id)
+
+# Streams every message of a meeting oldest first from buckets fed in first_id order. Buckets
+# written by different workers can overlap, so messages are held back only until a bucket
+# starting after them has been read; memory stays bounded by the overlap.
+async def merge_buckets(meeting_id: str, buckets):
+    pending = []
+    async for bucket in buckets:
+        while pending and pending[0][0] < bucket["first_id"]:
+            yield to_message(meeting_id, heapq.heappop(pending)[1])
+        for entry in bucket["messages"]:
+            heapq.heappush(pending, (entry["_id"], entry))
+    while pending:
+        yield to_message(meeting_id, heapq.heappop(pending)[1])
+
+# Assembles one keyset page of messages from buckets. Buckets must be fed in order of their
+# newest message (last_id descending) when paging backwards, or of their oldest (first_id
+# ascending) when paging forwards. Buckets written by different workers can overlap, so
+# reading stops only once the next bucket cannot contain anything that would make the page.
+class PageCollector:
+    def __init__(self, meeting_id: str, limit: int, before=None, after=None):
+        self.meeting_id = meeting_id
+        self.limit = limit
+        self.before = before
+        self.after = after
+        self.descending = after is None
+        self.messages = []
+        self.buckets_read = 0
+
+    def wants(self, bucket) -> bool:
+        if len(self.messages) <= self.limit:
+            return True
+        edge = self.messages[self.limit]["_id"]
+        return bucket["last_id"] > edge if self.descending else bucket["first_id"] < edge
+
+    def add(self, bucket):
+        self.buckets_read += 1
+        for entry in bucket["messages"]:
+            if self.before is not None and entry["_id"] >= self.before:
+                continue
+            if self.after is not None and entry["_id"] <= self.after:
+                continue
+            self.messages.append(entry)
+        self.messages.sort(key=lambda entry: entry["_id"], reverse=self.descending)
+        del self.messages[self.limit + 1:]
+
+    # Returns the page oldest first and the cursor that continues in the same direction
+    def result(self):
+        next_cursor = str(self.messages[self.limit - 1]["_id"]) if len(self.messages) > self.limit else None
+        page = [to_message(self.meeting_id, entry) for entry in self.messages[:self.limit]]
+        if self.descending:
+            page.reverse()
+        return page, next_cursor
\ No newline at end of file
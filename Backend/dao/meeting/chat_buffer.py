@@ -0,0 +1,118 @@
+import asyncio
+import logging
+import os
+import time
+from dotenv import load_dotenv
+
+# Load environment variables from .env
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+CHAT_FLUSH_SIZE = int(os.getenv("CHAT_FLUSH_SIZE", 200))
+CHAT_FLUSH_INTERVAL_MS = int(os.getenv("CHAT_FLUSH_INTERVAL_MS", 250))
+CHAT_BUFFER_MAX = int(os.getenv("CHAT_BUFFER_MAX", 20000))
+
+# Write-behind buffer for chat messages: frames from every meeting are collected here
+# and handed to write_many (MeetingDAO.insert_messages) once the batch is full or the interval elapses.
+class ChatWriteBuffer:
+    def __init__(self, write_many, flush_size=CHAT_FLUSH_SIZE, flush_interval_ms=CHAT_FLUSH_INTERVAL_MS, max_pending=CHAT_BUFFER_MAX):
+        self.write_many = write_many
+        self.flush_size = flush_size
+        self.flush_interval = flush_interval_ms / 1000
+        self.max_pending = max_pending
+        self._pending = []
+        self._wakeup = asyncio.Event()
+        self._flush_lock = asyncio.Lock()
+        self._task = None
+        self._closing = False
+        self.flushes = 0
+        self.messages_written = 0
+        self.messages_failed = 0
+        self.messages_dropped = 0
+        self.last_flush_size = 0
+        self.last_lag_ms = 0.0
+        self.max_lag_ms = 0.0
+
+    def start(self):
+        if self._task is None:
+            self._closing = False
+            self._task = asyncio.create_task(self._run())
+
+    def add(self, document) -> bool:
+        if len(self._pending) >= self.max_pending:
+            self.messages_dropped += 1
+            logger.warning("Chat write buffer full, dropping message")
+            return False
+        self._pending.append((time.monotonic(), document))
+        if len(self._pending) >= self.flush_size:
+            self._wakeup.set()
+        self.start()
+        return True
+
+    # Drops the messages of a deleted meeting that have not been written yet
+    def discard(self, meeting_id: str, payload=None) -> int:
+        kept = [(added, document) for added, document in self._pending if document["meeting_id"] != meeting_id]
+        discarded = len(self._pending) - len(kept)
+        self._pending[:] = kept
+        self.messages_dropped += discarded
+        return discarded
+
+    async def _run(self):
+        while not self._closing:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            try:
+                await self.flush()
+            except Exception as e:
+                logger.error(f"Chat write buffer flush failed: {e}")
+        await self.flush()
+
+    async def flush(self):
+        async with self._flush_lock:
+            while self._pending:
+                batch = self._pending[:self.flush_size]
+                del self._pending[:self.flush_size]
+                await self._write(batch)
+
+    async def _write(self, batch):
+        documents = [document for _, document in batch]
+        try:
+            failed = await self.write_many(documents) or 0
+            if failed:
+                logger.error(f"Failed to persist {failed} of {len(documents)} chat messages")
+        except Exception as e:
+            failed = len(documents)
+            logger.error(f"Failed to persist {failed} chat messages: {e}")
+        lag_ms = (time.monotonic() - batch[0][0]) * 1000
+        self.flushes += 1
+        self.last_flush_size = len(documents)
+        self.messages_written += len(documents) - failed
+        self.messages_failed += failed
+        self.last_lag_ms = lag_ms
+        self.max_lag_ms = max(self.max_lag_ms, lag_ms)
+
+    async def close(self):
+        if self._task is not None:
+            self._closing = True
+            self._wakeup.set()
+            await self._task
+            self._task = None
+        else:
+            await self.flush()
+
+    def stats(self):
+        return {
+            "pending": len(self._pending),
+            "flushes": self.flushes,
+            "messages_written": self.messages_written,
+            "messages_failed": self.messages_failed,
+            "messages_dropped": self.messages_dropped,
+            "last_flush_size": self.last_flush_size,
+            "avg_flush_size": (self.messages_written + self.messages_failed) / self.flushes if self.flushes else 0.0,
+            "last_lag_ms": self.last_lag_ms,
+            "max_lag_ms": self.max_lag_ms,
+        }
\ No newline at end of file
@@ -12,4 +12,20 @@ class MeetingResponse(BaseModel):
     class_id: str
     created_by: str
     start_time: str
-    end_time: str | None
\ No newline at end of file
+    end_time: str | None
+
+class ChatMessageResponse(BaseModel):
+    message_id: str
+    meeting_id: str
+    user_id: str
+    message: str
+    timestamp: str
+
+class OnlineParticipant(BaseModel):
+    user_id: str
+    online_since: str
+
+class OnlineParticipantsResponse(BaseModel):
+    meeting_id: str
+    count: int
+    participants: list[OnlineParticipant]
\ No newline at end of file
@@ -1,8 +1,12 @@
 import logging
+from datetime import datetime, timedelta
 from bson import ObjectId
 from fastapi import HTTPException
+from pymongo import DeleteOne, UpdateOne
+from pymongo.errors import BulkWriteError, DuplicateKeyError
 from dao.db_config import Database
 from dao.meeting.object import Meeting
+from dao.meeting.chat_buckets import CHAT_BUCKET_MAX_BYTES, CHAT_BUCKET_SIZE, CHAT_BUCKET_WINDOW_MINUTES, PageCollector, entry_size, expire_at, group_messages, merge_buckets
 from dao.meeting.meeting_interface import MeetingDAOInterface
 
 logger = logging.getLogger(__name__)
@@ -18,12 +22,53 @@ class MeetingDAO(MeetingDAOInterface):
         result = await self.collection.insert_one(meeting_dict)
         return str(result.inserted_id)
 
-    async def find_by_id(self, meeting_id):
-        meeting_data = await self.collection.find_one({"_id": ObjectId(meeting_id)})
+    # fields limits the document to those fields (plus _id); None loads everything
+    async def find_by_id(self, meeting_id, fields=None):
+        meeting_data = await self.collection.find_one({"_id": ObjectId(meeting_id)}, fields)
         if meeting_data:
             return Meeting.from_dict(meeting_data)
         return None
 
+    async def delete_meeting(self, meeting_id: str):
+        result = await self.collection.delete_one({"_id": ObjectId(meeting_id)})
+        if result.deleted_count == 0:
+            raise HTTPException(status_code=404, detail="Meeting not found")
+
+    # Meetings in [start, end) across every class the user belongs to or created, ordered by
+    # (start_time, _id). after is the (start_time, meeting_id) of the last row of the previous page.
+    # Each class contributes at most limit + 1 rows through the (class_id, start_time) index, so
+    # the final sort stays small however many classes the user is in. Needs MongoDB 5.0+.
+    async def get_agenda(self, user_id: str, start, end, limit: int, after=None):
+        meeting_match = {"start_time": {"$gte": start, "$lt": end}}
+        if after:
+            after_time, after_id = after
+            meeting_match = {"$and": [meeting_match, {"$or": [
+                {"start_time": {"$gt": after_time}},
+                {"start_time": after_time, "_id": {"$gt": ObjectId(after_id)}},
+            ]}]}
+        pipeline = [
+            {"$match": {"user_id": user_id}},
+            {"$project": {"_id": 0, "class_id": 1}},
+            {"$unionWith": {"coll": "classes", "pipeline": [
+                {"$match": {"created_by": user_id}},
+                {"$project": {"_id": 0, "class_id": {"$toString": "$_id"}}},
+            ]}},
+            {"$group": {"_id": "$class_id"}},
+            {"$lookup": {"from": "meetings", "localField": "_id", "foreignField": "class_id", "pipeline": [
+                {"$match": meeting_match},
+                {"$sort": {"start_time": 1, "_id": 1}},
+                {"$limit": limit + 1},
+            ], "as": "meetings"}},
+            {"$unwind": "$meetings"},
+            {"$replaceRoot": {"newRoot": "$meetings"}},
+            {"$sort": {"start_time": 1, "_id": 1}},
+            {"$limit": limit + 1},
+        ]
+        rows = await self.db.class_memberships.aggregate(pipeline).to_list(limit + 1)
+        meetings = [Meeting.from_dict(row) for row in rows[:limit]]
+        next_cursor = (meetings[-1].start_time, meetings[-1].meeting_id) if len(rows) > limit else None
+        return meetings, next_cursor
+
     async def add_user_to_meeting(self, meeting_id: str, user_id: str):
         participant = {
             "meeting_id": meeting_id,
@@ -32,10 +77,8 @@ class MeetingDAO(MeetingDAOInterface):
         }
         try:
             await self.db.meeting_participants.insert_one(participant)
-        except Exception as e:
-            if "duplicate key error" in str(e):
-                raise HTTPException(status_code=400, detail="User already in meeting")
-            raise e
+        except DuplicateKeyError:
+            raise HTTPException(status_code=400, detail="User already in meeting")
 
     async def remove_user_from_meeting(self, meeting_id: str, user_id: str):
         result = await self.db.meeting_participants.delete_one({"meeting_id": meeting_id, "user_id": user_id})
@@ -43,5 +86,122 @@ class MeetingDAO(MeetingDAOInterface):
             raise HTTPException(status_code=404, detail="User not in meeting")
 
     async def get_meeting_participants(self, meeting_id: str):
-        participants = await self.db.meeting_participants.find({"meeting_id": meeting_id}).to_list(None)
-        return [{"user_id": p["user_id"]} for p in participants]
\ No newline at end of file
+        participants = await self.db.meeting_participants.find({"meeting_id": meeting_id}, {"_id": 0, "user_id": 1}).to_list(None)
+        return [{"user_id": p["user_id"]} for p in participants]
+
+    # Applies a batch of ("join" | "leave", meeting_id, user_id) changes, each participant at most
+    # once, and returns per change whether it took effect. A join takes over a row presence wrote
+    # for the user's chat socket, or inserts one; a row the API already owns reports a duplicate
+    # through the unique index. Deletes are not reported per operation, so leaves first
+    # look up which of the participants exist: one find plus one unordered bulk write per batch.
+    async def apply_participant_changes(self, changes):
+        results = [True] * len(changes)
+        leaving = [{"meeting_id": meeting_id, "user_id": user_id} for operation, meeting_id, user_id in changes if operation == "leave"]
+        present = set()
+        if leaving:
+            async for participant in self.db.meeting_participants.find({"$or": leaving}, {"_id": 0, "meeting_id": 1, "user_id": 1}):
+                present.add((participant["meeting_id"], participant["user_id"]))
+        joined_at = datetime.utcnow()
+        operations = []
+        positions = []
+        for index, (operation, meeting_id, user_id) in enumerate(changes):
+            if operation == "join":
+                operations.append(UpdateOne(
+                    {"meeting_id": meeting_id, "user_id": user_id, "presence": True},
+                    {"$unset": {"presence": ""}, "$setOnInsert": {"joined_at": joined_at}}, upsert=True
+                ))
+            elif (meeting_id, user_id) in present:
+                operations.append(DeleteOne({"meeting_id": meeting_id, "user_id": user_id}))
+            else:
+                results[index] = False
+                continue
+            positions.append(index)
+        if not operations:
+            return results
+        try:
+            await self.db.meeting_participants.bulk_write(operations, ordered=False)
+        except BulkWriteError as e:
+            errors = e.details.get("writeErrors", [])
+            if any(error.get("code") != 11000 for error in errors):
+                raise
+            for error in errors:
+                results[positions[error["index"]]] = False
+        return results
+
+    # Persists a presence snapshot in one round trip: upserts who came online, deletes who left
+    async def sync_participants(self, joined, left):
+        operations = [
+            UpdateOne({"meeting_id": meeting_id, "user_id": user_id},
+                      {"$setOnInsert": {"joined_at": at, "presence": True}, "$set": {"last_seen": at}}, upsert=True)
+            for meeting_id, user_id, at in joined
+        ]
+        # Rows the join/leave API inserted carry no presence flag and are left alone
+        operations += [DeleteOne({"meeting_id": meeting_id, "user_id": user_id, "presence": True}) for meeting_id, user_id in left]
+        if not operations:
+            return
+        try:
+            await self.db.meeting_participants.bulk_write(operations, ordered=False)
+        except BulkWriteError as e:
+            # Concurrent upserts of the same participant race on the unique index; the row exists either way
+            errors = [error for error in e.details.get("writeErrors", []) if error.get("code") != 11000]
+            if errors:
+                raise
+
+    # Reads buckets newest first (or oldest first for after) until no further bucket can change the page.
+    # All messages of a bucket fall in one window, so a bucket that can hold ids on the wrong side of
+    # the cursor lies within a window of it; that bound lets the index scan start at the cursor.
+    async def get_messages(self, meeting_id: str, limit: int, before: str = None, after: str = None):
+        span = timedelta(minutes=CHAT_BUCKET_WINDOW_MINUTES + 1)
+        query = {"meeting_id": meeting_id}
+        before_id = ObjectId(before) if before else None
+        after_id = ObjectId(after) if after else None
+        if after_id:
+            query["last_id"] = {"$gt": after_id}
+            query["first_id"] = {"$gt": ObjectId.from_datetime(after_id.generation_time - span)}
+            sort = [("first_id", 1)]
+        else:
+            if before_id:
+                query["first_id"] = {"$lt": before_id}
+                query["last_id"] = {"$lt": ObjectId.from_datetime(before_id.generation_time + span)}
+            sort = [("last_id", -1)]
+        collector = PageCollector(meeting_id, limit, before_id, after_id)
+        async for bucket in self.db.chat_buckets.find(query, {"first_id": 1, "last_id": 1, "messages": 1}).sort(sort):
+            if not collector.wants(bucket):
+                break
+            collector.add(bucket)
+        return collector.result()
+
+    # The whole transcript, oldest first, fetched batch_size messages' worth of buckets at a time
+    def iter_messages(self, meeting_id: str, batch_size: int):
+        cursor = self.db.chat_buckets.find({"meeting_id": meeting_id}, {"first_id": 1, "messages": 1}).sort("first_id", 1)
+        return merge_buckets(meeting_id, cursor.batch_size(max(1, batch_size // CHAT_BUCKET_SIZE)))
+
+    # Appends each meeting's buffered messages to its open bucket for the window, one upsert per
+    # bucket in a single unordered bulk write. Returns how many messages could not be stored.
+    async def insert_messages(self, documents):
+        now = datetime.utcnow()
+        groups = list(group_messages(documents).items())
+        operations = []
+        for (meeting_id, window), entries in groups:
+            update = {
+                "$push": {"messages": {"$each": entries}},
+                "$inc": {"count": len(entries), "bytes": sum(entry_size(entry) for entry in entries)},
+                "$min": {"first_id": min(entry["_id"] for entry in entries)},
+                "$max": {"last_id": max(entry["_id"] for entry in entries)},
+                "$set": {"updated_at": now},
+                "$setOnInsert": {"created_at": now},
+            }
+            expires = expire_at(now)
+            if expires:
+                update["$set"]["expire_at"] = expires
+            operations.append(UpdateOne(
+                {"meeting_id": meeting_id, "window_start": window, "count": {"$lt": CHAT_BUCKET_SIZE},
+                 "bytes": {"$lt": CHAT_BUCKET_MAX_BYTES}}, update, upsert=True
+            ))
+        if not operations:
+            return 0
+        try:
+            await self.db.chat_buckets.bulk_write(operations, ordered=False)
+        except BulkWriteError as e:
+            return sum(len(groups[error["index"]][1]) for error in e.details.get("writeErrors", []))
+        return 0
\ No newline at end of file
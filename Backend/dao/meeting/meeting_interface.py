@@ -6,7 +6,15 @@ class MeetingDAOInterface(ABC):
         pass
 
     @abstractmethod
-    async def find_by_id(self, meeting_id: str):
+    async def find_by_id(self, meeting_id: str, fields=None):
+        pass
+
+    @abstractmethod
+    async def delete_meeting(self, meeting_id: str):
+        pass
+
+    @abstractmethod
+    async def get_agenda(self, user_id: str, start, end, limit: int, after=None):
         pass
 
     @abstractmethod
@@ -19,4 +27,25 @@ class MeetingDAOInterface(ABC):
 
     @abstractmethod
     async def get_meeting_participants(self, meeting_id: str):
+        pass
+
+    @abstractmethod
+    async def apply_participant_changes(self, changes):
+        pass
+
+    @abstractmethod
+    async def sync_participants(self, joined, left):
+        pass
+
+    @abstractmethod
+    async def get_messages(self, meeting_id: str, limit: int, before: str = None, after: str = None):
+        pass
+
+    # Returns an async iterator over the meeting's messages, oldest first
+    @abstractmethod
+    def iter_messages(self, meeting_id: str, batch_size: int):
+        pass
+
+    @abstractmethod
+    async def insert_messages(self, documents):
         pass
\ No newline at end of file
@@ -0,0 +1,142 @@
+from datetime import datetime
+from bson import ObjectId
+from fastapi import HTTPException
+from dao.memory_store import memory_store, project
+from dao.meeting.object import Meeting
+from dao.meeting.chat_buckets import CHAT_BUCKET_MAX_BYTES, CHAT_BUCKET_SIZE, PageCollector, entry_size, expire_at, group_messages, merge_buckets
+from dao.meeting.meeting_interface import MeetingDAOInterface
+
+class InMemoryMeetingDAO(MeetingDAOInterface):
+    def __init__(self, store=memory_store):
+        self.store = store
+        self.meetings = store.collection("meetings")
+        self.classes = store.collection("classes")
+        self.memberships = store.collection("class_memberships")
+        self.participants = store.collection("meeting_participants")
+        self.buckets = store.collection("chat_buckets")
+
+    async def create_meeting(self, meeting):
+        self.store.record("meetings", "insert")
+        meeting_dict = meeting.to_dict()
+        self.meetings[str(meeting_dict["_id"])] = meeting_dict
+        return str(meeting_dict["_id"])
+
+    async def find_by_id(self, meeting_id, fields=None):
+        self.store.record("meetings", "find")
+        meeting_data = self.meetings.get(meeting_id)
+        return Meeting.from_dict(project(meeting_data, fields)) if meeting_data else None
+
+    async def delete_meeting(self, meeting_id: str):
+        self.store.record("meetings", "delete")
+        if self.meetings.pop(meeting_id, None) is None:
+            raise HTTPException(status_code=404, detail="Meeting not found")
+
+    async def get_agenda(self, user_id: str, start, end, limit: int, after=None):
+        self.store.record("class_memberships", "aggregate")
+        class_ids = {m["class_id"] for m in self.memberships.values() if m["user_id"] == user_id}
+        class_ids |= {class_id for class_id, c in self.classes.items() if c["created_by"] == user_id}
+        rows = sorted(
+            (m for m in self.meetings.values() if m["class_id"] in class_ids and start <= m["start_time"] < end),
+            key=lambda m: (m["start_time"], m["_id"])
+        )
+        if after:
+            after_key = (after[0], ObjectId(after[1]))
+            rows = [m for m in rows if (m["start_time"], m["_id"]) > after_key]
+        meetings = [Meeting.from_dict(row) for row in rows[:limit]]
+        next_cursor = (meetings[-1].start_time, meetings[-1].meeting_id) if len(rows) > limit else None
+        return meetings, next_cursor
+
+    async def add_user_to_meeting(self, meeting_id: str, user_id: str):
+        self.store.record("meeting_participants", "insert")
+        if (meeting_id, user_id) in self.participants:
+            raise HTTPException(status_code=400, detail="User already in meeting")
+        self.participants[(meeting_id, user_id)] = {"meeting_id": meeting_id, "user_id": user_id, "joined_at": datetime.utcnow()}
+
+    async def remove_user_from_meeting(self, meeting_id: str, user_id: str):
+        self.store.record("meeting_participants", "delete")
+        if self.participants.pop((meeting_id, user_id), None) is None:
+            raise HTTPException(status_code=404, detail="User not in meeting")
+
+    async def get_meeting_participants(self, meeting_id: str):
+        self.store.record("meeting_participants", "find")
+        return [{"user_id": p["user_id"]} for p in self.participants.values() if p["meeting_id"] == meeting_id]
+
+    async def apply_participant_changes(self, changes):
+        results = []
+        if any(operation == "leave" for operation, _, _ in changes):
+            self.store.record("meeting_participants", "find")
+        self.store.record("meeting_participants", "bulk_write")
+        joined_at = datetime.utcnow()
+        for operation, meeting_id, user_id in changes:
+            key = (meeting_id, user_id)
+            if operation == "join":
+                participant = self.participants.get(key)
+                results.append(participant is None or participant.pop("presence", False))
+                self.participants.setdefault(key, {"meeting_id": meeting_id, "user_id": user_id, "joined_at": joined_at})
+            else:
+                results.append(self.participants.pop(key, None) is not None)
+        return results
+
+    async def sync_participants(self, joined, left):
+        if not joined and not left:
+            return
+        self.store.record("meeting_participants", "bulk_write")
+        for meeting_id, user_id, at in joined:
+            participant = self.participants.setdefault((meeting_id, user_id), {"meeting_id": meeting_id, "user_id": user_id, "joined_at": at, "presence": True})
+            participant["last_seen"] = at
+        for meeting_id, user_id in left:
+            if self.participants.get((meeting_id, user_id), {}).get("presence"):
+                del self.participants[(meeting_id, user_id)]
+
+    async def get_messages(self, meeting_id: str, limit: int, before: str = None, after: str = None):
+        self.store.record("chat_buckets", "find")
+        before_id = ObjectId(before) if before else None
+        after_id = ObjectId(after) if after else None
+        buckets = [b for b in self.buckets.values() if b["meeting_id"] == meeting_id]
+        if after_id:
+            buckets = sorted((b for b in buckets if b["last_id"] > after_id), key=lambda b: b["first_id"])
+        else:
+            buckets = sorted((b for b in buckets if not before_id or b["first_id"] < before_id), key=lambda b: b["last_id"], reverse=True)
+        collector = PageCollector(meeting_id, limit, before_id, after_id)
+        for bucket in buckets:
+            if not collector.wants(bucket):
+                break
+            collector.add(bucket)
+        return collector.result()
+
+    def iter_messages(self, meeting_id: str, batch_size: int):
+        async def buckets():
+            rows = sorted((b for b in self.buckets.values() if b["meeting_id"] == meeting_id), key=lambda b: b["first_id"])
+            per_batch = max(1, batch_size // CHAT_BUCKET_SIZE)
+            for index, bucket in enumerate(rows):
+                if index % per_batch == 0:
+                    self.store.record("chat_buckets", "find")
+                yield bucket
+        return merge_buckets(meeting_id, buckets())
+
+    async def insert_messages(self, documents):
+        groups = group_messages(documents)
+        if not groups:
+            return 0
+        self.store.record("chat_buckets", "bulk_write")
+        now = datetime.utcnow()
+        for (meeting_id, window), entries in groups.items():
+            bucket = next((
+                b for b in self.buckets.values()
+                if b["meeting_id"] == meeting_id and b["window_start"] == window and b["count"] < CHAT_BUCKET_SIZE
+                and b.get("bytes", CHAT_BUCKET_MAX_BYTES) < CHAT_BUCKET_MAX_BYTES
+            ), None)
+            if bucket is None:
+                bucket = {"_id": ObjectId(), "meeting_id": meeting_id, "window_start": window, "messages": [], "count": 0, "bytes": 0,
+                          "first_id": entries[0]["_id"], "last_id": entries[0]["_id"], "created_at": now}
+                self.buckets[bucket["_id"]] = bucket
+            bucket["messages"].extend(entries)
+            bucket["count"] += len(entries)
+            bucket["bytes"] += sum(entry_size(entry) for entry in entries)
+            bucket["first_id"] = min(bucket["first_id"], *(entry["_id"] for entry in entries))
+            bucket["last_id"] = max(bucket["last_id"], *(entry["_id"] for entry in entries))
+            bucket["updated_at"] = now
+            expires = expire_at(now)
+            if expires:
+                bucket["expire_at"] = expires
+        return 0
\ No newline at end of file
@@ -2,6 +2,8 @@ from datetime import datetime
 from bson import ObjectId
 
 class Meeting:
+    __slots__ = ("meeting_id", "title", "class_id", "created_by", "start_time", "end_time", "created_at")
+
     def __init__(self, title, class_id, created_by, start_time=None, end_time=None, meeting_id=None):
         self.meeting_id = meeting_id if meeting_id else str(ObjectId())
         self.title = title
@@ -22,13 +24,26 @@ class Meeting:
             "created_at": self.created_at
         }
 
+    # Shape of MeetingResponse, built without a pydantic round trip
+    def to_response(self):
+        return {
+            "meeting_id": self.meeting_id,
+            "title": self.title,
+            "class_id": self.class_id,
+            "created_by": self.created_by,
+            "start_time": self.start_time.isoformat(),
+            "end_time": self.end_time.isoformat() if self.end_time else None
+        }
+
+    # Loads a stored (possibly projected) document as is: no new ids or timestamps are generated
     @classmethod
     def from_dict(cls, data):
-        return cls(
-            title=data.get("title"),
-            class_id=data.get("class_id"),
-            created_by=data.get("created_by"),
-            start_time=data.get("start_time"),
-            end_time=data.get("end_time"),
-            meeting_id=str(data.get("_id"))
-        )
\ No newline at end of file
+        meeting = cls.__new__(cls)
+        meeting.meeting_id = str(data.get("_id"))
+        meeting.title = data.get("title")
+        meeting.class_id = data.get("class_id")
+        meeting.created_by = data.get("created_by")
+        meeting.start_time = data.get("start_time")
+        meeting.end_time = data.get("end_time")
+        meeting.created_at = data.get("created_at")
+        return meeting
\ No newline at end of file
@@ -0,0 +1,113 @@
+import asyncio
+import logging
+import os
+from dotenv import load_dotenv
+
+# Load environment variables from .env
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+PARTICIPANT_BATCH_WINDOW_MS = float(os.getenv("PARTICIPANT_BATCH_WINDOW_MS", 5))
+PARTICIPANT_BATCH_SIZE = int(os.getenv("PARTICIPANT_BATCH_SIZE", 500))
+
+# Splits a batch so that each (meeting, user) appears at most once per round. An unordered
+# bulk write may apply its operations in any order, so a join and a leave of the same
+# participant have to go in separate writes, in the order they were requested.
+def _rounds(batch):
+    rounds = []
+    seen = {}
+    for item in batch:
+        key = (item[1], item[2])
+        index = seen.get(key, 0)
+        seen[key] = index + 1
+        if index == len(rounds):
+            rounds.append([])
+        rounds[index].append(item)
+    return rounds
+
+# Collects participant joins and leaves for a few milliseconds and writes them with one
+# apply_changes call (MeetingDAO.apply_participant_changes). Each caller awaits the result of
+# its own operation: True if it took effect, False if the user was already in (join) or not
+# in (leave) the meeting.
+class ParticipantWriteBatcher:
+    def __init__(self, apply_changes, window_ms=PARTICIPANT_BATCH_WINDOW_MS, max_batch=PARTICIPANT_BATCH_SIZE):
+        self.apply_changes = apply_changes
+        self.window = window_ms / 1000
+        self.max_batch = max_batch
+        self._pending = []
+        self._timer = None
+        self._tasks = set()
+        self._write_lock = asyncio.Lock()
+        self.batches = 0
+        self.operations = 0
+        self.operations_failed = 0
+        self.last_batch_size = 0
+        self.max_batch_size = 0
+
+    async def join(self, meeting_id: str, user_id: str) -> bool:
+        return await self._submit("join", meeting_id, user_id)
+
+    async def leave(self, meeting_id: str, user_id: str) -> bool:
+        return await self._submit("leave", meeting_id, user_id)
+
+    async def _submit(self, operation: str, meeting_id: str, user_id: str) -> bool:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((operation, meeting_id, user_id, future))
+        if len(self._pending) >= self.max_batch:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.window, self._flush)
+        # A caller that goes away must not cancel the result the writer will set
+        return await asyncio.shield(future)
+
+    def _flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        if batch:
+            task = asyncio.create_task(self._write(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _write(self, batch):
+        # One batch at a time, so a later batch never overtakes an earlier one
+        async with self._write_lock:
+            for round_items in _rounds(batch):
+                changes = [(operation, meeting_id, user_id) for operation, meeting_id, user_id, _ in round_items]
+                try:
+                    results = await self.apply_changes(changes)
+                except Exception as e:
+                    logger.error(f"Failed to write {len(changes)} participant changes: {e}")
+                    self.operations_failed += len(changes)
+                    for *_, future in round_items:
+                        if not future.done():
+                            future.set_exception(e)
+                            # Mark it retrieved in case its caller is gone
+                            future.exception()
+                    continue
+                for (*_, future), result in zip(round_items, results):
+                    if not future.done():
+                        future.set_result(result)
+                self.batches += 1
+                self.operations += len(changes)
+                self.last_batch_size = len(changes)
+                self.max_batch_size = max(self.max_batch_size, len(changes))
+
+    async def close(self):
+        self._flush()
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    def stats(self):
+        return {
+            "pending": len(self._pending),
+            "batches": self.batches,
+            "operations": self.operations,
+            "operations_failed": self.operations_failed,
+            "last_batch_size": self.last_batch_size,
+            "max_batch_size": self.max_batch_size,
+            "avg_batch_size": self.operations / self.batches if self.batches else 0.0,
+        }
\ No newline at end of file
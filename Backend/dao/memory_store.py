@@ -0,0 +1,32 @@
+from collections import Counter
+
+# Backing store for the in-memory DAOs (DAO_BACKEND=memory). Each DAO method records
+# the Mongo operations its real counterpart issues, so benchmarks can report round trips.
+class MemoryStore:
+    def __init__(self):
+        self.collections = {}
+        self.operations = Counter()
+
+    def collection(self, name):
+        return self.collections.setdefault(name, {})
+
+    def record(self, collection, operation, count=1):
+        self.operations[f"{collection}.{operation}"] += count
+
+    def round_trips(self):
+        return sum(self.operations.values())
+
+    def reset_counters(self):
+        self.operations.clear()
+
+    def clear(self):
+        self.collections.clear()
+        self.operations.clear()
+
+# Applies a find projection given as a list of field names, like the DAOs pass to Mongo
+def project(document, fields=None):
+    if fields is None:
+        return document
+    return {key: value for key, value in document.items() if key == "_id" or key in fields}
+
+memory_store = MemoryStore()
\ No newline at end of file
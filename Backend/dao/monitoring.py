@@ -0,0 +1,117 @@
+import threading
+import time
+from pymongo import monitoring
+
+# pymongo emits these events from Motor's worker threads, so every update takes a lock.
+# Check-out start and finish happen on the same thread, which is how the wait is measured.
+class PoolMonitor(monitoring.ConnectionPoolListener):
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.connections_created = 0
+        self.connections_closed = 0
+        self.checked_out = 0
+        self.checkouts = 0
+        self.checkout_failures = 0
+        self.wait_total_ms = 0.0
+        self.wait_max_ms = 0.0
+        self.pool_clears = 0
+
+    def _finish_wait(self):
+        started = getattr(self._local, "started", None)
+        self._local.started = None
+        return (time.perf_counter() - started) * 1000 if started is not None else 0.0
+
+    def connection_check_out_started(self, event):
+        self._local.started = time.perf_counter()
+
+    def connection_checked_out(self, event):
+        wait_ms = self._finish_wait()
+        with self._lock:
+            self.checked_out += 1
+            self.checkouts += 1
+            self.wait_total_ms += wait_ms
+            self.wait_max_ms = max(self.wait_max_ms, wait_ms)
+
+    def connection_check_out_failed(self, event):
+        wait_ms = self._finish_wait()
+        with self._lock:
+            self.checkout_failures += 1
+            self.wait_total_ms += wait_ms
+            self.wait_max_ms = max(self.wait_max_ms, wait_ms)
+
+    def connection_checked_in(self, event):
+        with self._lock:
+            self.checked_out -= 1
+
+    def connection_created(self, event):
+        with self._lock:
+            self.connections_created += 1
+
+    def connection_closed(self, event):
+        with self._lock:
+            self.connections_closed += 1
+
+    def connection_ready(self, event):
+        pass
+
+    def pool_created(self, event):
+        pass
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_cleared(self, event):
+        with self._lock:
+            self.pool_clears += 1
+
+    def pool_closed(self, event):
+        pass
+
+    def stats(self):
+        with self._lock:
+            waits = self.checkouts + self.checkout_failures
+            return {
+                "open_connections": self.connections_created - self.connections_closed,
+                "in_use": self.checked_out,
+                "checkouts": self.checkouts,
+                "checkout_failures": self.checkout_failures,
+                "wait_avg_ms": self.wait_total_ms / waits if waits else 0.0,
+                "wait_max_ms": self.wait_max_ms,
+                "pool_clears": self.pool_clears,
+            }
+
+class CommandMonitor(monitoring.CommandListener):
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.commands = {}
+
+    def _record(self, command_name, duration_micros, failed):
+        with self._lock:
+            entry = self.commands.get(command_name)
+            if entry is None:
+                entry = self.commands[command_name] = {"count": 0, "failures": 0, "total_ms": 0.0, "max_ms": 0.0}
+            duration_ms = duration_micros / 1000
+            entry["count"] += 1
+            entry["failures"] += 1 if failed else 0
+            entry["total_ms"] += duration_ms
+            entry["max_ms"] = max(entry["max_ms"], duration_ms)
+
+    def started(self, event):
+        pass
+
+    def succeeded(self, event):
+        self._record(event.command_name, event.duration_micros, False)
+
+    def failed(self, event):
+        self._record(event.command_name, event.duration_micros, True)
+
+    def stats(self):
+        with self._lock:
+            return {
+                name: dict(entry, avg_ms=entry["total_ms"] / entry["count"])
+                for name, entry in self.commands.items()
+            }
+
+pool_monitor = PoolMonitor()
+command_monitor = CommandMonitor()
\ No newline at end of file
@@ -0,0 +1,36 @@
+from dao.cache import SingleFlight, TTLCache
+from dao.user.object import User
+from dao.user.user_interface import UserDAOInterface
+
+# Read-through cache for user profiles by id. Only the User.PROFILE_FIELDS projection is
+# cached, so password hashes never sit in memory; any other lookup, including email and
+# username lookups behind registration and login, goes to the inner DAO.
+# Concurrent misses for the same user share one query.
+class CachedUserDAO(UserDAOInterface):
+    def __init__(self, inner: UserDAOInterface):
+        self.inner = inner
+        self.users = TTLCache("user")
+        self.user_lookups = SingleFlight("user")
+
+    async def create_user(self, user):
+        return await self.inner.create_user(user)
+
+    async def find_by_id(self, user_id, fields=None):
+        if fields is None or tuple(fields) != User.PROFILE_FIELDS:
+            return await self.inner.find_by_id(user_id, fields)
+        user = self.users.get(user_id)
+        if user is None:
+            generation = self.users.generation(user_id)
+            user = await self.user_lookups.do(user_id, lambda: self.inner.find_by_id(user_id, User.PROFILE_FIELDS))
+            if user:
+                self.users.set(user_id, user, generation)
+        return user
+
+    async def find_by_email(self, email, fields=None):
+        return await self.inner.find_by_email(email, fields)
+
+    async def find_by_username(self, username, fields=None):
+        return await self.inner.find_by_username(username, fields)
+
+    async def find_many(self, user_ids, emails):
+        return await self.inner.find_many(user_ids, emails)
\ No newline at end of file
@@ -0,0 +1,49 @@
+from fastapi import HTTPException
+from dao.memory_store import memory_store, project
+from dao.user.object import User
+from dao.user.user_interface import UserDAOInterface
+
+class InMemoryUserDAO(UserDAOInterface):
+    def __init__(self, store=memory_store):
+        self.store = store
+        self.users = store.collection("users")
+
+    def _to_user(self, user_data):
+        user_data = dict(user_data)
+        user_data["user_id"] = str(user_data.pop("_id"))
+        return User.from_dict(user_data)
+
+    def _find_one(self, field, value, fields=None):
+        self.store.record("users", "find")
+        for user_data in self.users.values():
+            if user_data.get(field) == value:
+                return self._to_user(project(user_data, fields))
+        return None
+
+    async def create_user(self, user):
+        self.store.record("users", "insert")
+        user_dict = user.to_db_dict()
+        for existing in self.users.values():
+            if existing["email"] == user_dict["email"]:
+                raise HTTPException(status_code=400, detail="Email already registered")
+            if existing["username"] == user_dict["username"]:
+                raise HTTPException(status_code=400, detail="Username already exists")
+        self.users[str(user_dict["_id"])] = user_dict
+        return str(user_dict["_id"])
+
+    async def find_by_id(self, user_id, fields=None):
+        self.store.record("users", "find")
+        user_data = self.users.get(user_id)
+        return self._to_user(project(user_data, fields)) if user_data else None
+
+    async def find_by_email(self, email, fields=None):
+        return self._find_one("email", email, fields)
+
+    async def find_by_username(self, username, fields=None):
+        return self._find_one("username", username, fields)
+
+    async def find_many(self, user_ids, emails):
+        self.store.record("users", "find")
+        user_ids, emails = set(user_ids), set(emails)
+        return [self._to_user(user_data) for user_id, user_data in self.users.items()
+                if user_id in user_ids or user_data["email"] in emails]
\ No newline at end of file
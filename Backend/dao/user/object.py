@@ -1,25 +1,21 @@
 from datetime import datetime
 from bson import ObjectId
-import bcrypt
 
 class User:
-    def __init__(self, username, email, password=None, user_id=None, created_at=None, updated_at=None):
+    __slots__ = ("user_id", "username", "email", "password_hash", "created_at", "updated_at")
+
+    # Everything a profile needs; never includes password_hash
+    PROFILE_FIELDS = ("username", "email", "created_at", "updated_at")
+
+    # Hashing lives in management.passwords so it can run off the event loop
+    def __init__(self, username, email, password_hash=None, user_id=None, created_at=None, updated_at=None):
         self.user_id = user_id if user_id else str(ObjectId())
         self.username = username
         self.email = email
-        self.password_hash = self._hash_password(password) if password else None
+        self.password_hash = password_hash
         self.created_at = created_at if created_at else datetime.utcnow()
         self.updated_at = updated_at if updated_at else datetime.utcnow()
 
-    def _hash_password(self, password):
-        salt = bcrypt.gensalt()
-        return bcrypt.hashpw(password.encode("utf-8"), salt)
-
-    def verify_password(self, password):
-        if not password or not self.password_hash:
-            return False
-        return bcrypt.checkpw(password.encode("utf-8"), self.password_hash)
-
     def to_dict(self):
         return {
             "user_id": self.user_id,
@@ -41,14 +37,14 @@ class User:
             user_dict["_id"] = ObjectId(self.user_id)
         return user_dict
 
+    # Loads a stored (possibly projected) document as is: no new ids or timestamps are generated
     @classmethod
     def from_dict(cls, data):
-        user = cls(
-            username=data.get("username"),
-            email=data.get("email"),
-            user_id=data.get("user_id"),
-            created_at=data.get("created_at"),
-            updated_at=data.get("updated_at")
-        )
+        user = cls.__new__(cls)
+        user.user_id = data.get("user_id")
+        user.username = data.get("username")
+        user.email = data.get("email")
         user.password_hash = data.get("password_hash")
+        user.created_at = data.get("created_at")
+        user.updated_at = data.get("updated_at")
         return user
\ No newline at end of file
@@ -1,4 +1,5 @@
-from dao.db_config import Database
+from pymongo.errors import DuplicateKeyError
+from dao.db_config import Database, duplicate_key_fields
 from bson import ObjectId
 from dao.user.user_interface import UserDAOInterface
 from dao.user.object import User
@@ -13,35 +14,48 @@ class UserDAO(UserDAOInterface):
         self.collection = self.db.users
         logger.info("UserDAO initialized")
 
+    # The unique indexes on email and username are the uniqueness check: one insert, no lookups
     async def create_user(self, user):
         user_dict = user.to_db_dict()
         try:
             result = await self.collection.insert_one(user_dict)
             return str(result.inserted_id)
-        except Exception as e:
-            if "duplicate key error" in str(e) and "email" in str(e):
-                raise HTTPException(status_code=400, detail="Email already exists")
-            elif "duplicate key error" in str(e) and "username" in str(e):
+        except DuplicateKeyError as e:
+            fields = duplicate_key_fields(e.details)
+            if "email" in fields:
+                raise HTTPException(status_code=400, detail="Email already registered")
+            if "username" in fields:
                 raise HTTPException(status_code=400, detail="Username already exists")
-            raise e
+            raise HTTPException(status_code=400, detail="Email or username already exists")
 
-    async def find_by_id(self, user_id):
-        user_data = await self.collection.find_one({"_id": ObjectId(user_id)})
+    # fields limits the document to those fields (plus _id); None loads everything
+    async def find_by_id(self, user_id, fields=None):
+        user_data = await self.collection.find_one({"_id": ObjectId(user_id)}, fields)
         if user_data:
             user_data["user_id"] = str(user_data.pop("_id"))
             return User.from_dict(user_data)
         return None
 
-    async def find_by_email(self, email):
-        user_data = await self.collection.find_one({"email": email})
+    async def find_by_email(self, email, fields=None):
+        user_data = await self.collection.find_one({"email": email}, fields)
         if user_data:
             user_data["user_id"] = str(user_data.pop("_id"))
             return User.from_dict(user_data)
         return None
 
-    async def find_by_username(self, username):
-        user_data = await self.collection.find_one({"username": username})
+    async def find_by_username(self, username, fields=None):
+        user_data = await self.collection.find_one({"username": username}, fields)
         if user_data:
             user_data["user_id"] = str(user_data.pop("_id"))
             return User.from_dict(user_data)
-        return None
\ No newline at end of file
+        return None
+
+    # Resolves any mix of ids and emails in one query; password hashes are not loaded
+    async def find_many(self, user_ids, emails):
+        user_oids = [ObjectId(user_id) for user_id in user_ids if ObjectId.is_valid(user_id)]
+        query = {"$or": [{"_id": {"$in": user_oids}}, {"email": {"$in": list(emails)}}]}
+        users = []
+        async for user_data in self.collection.find(query, {"password_hash": 0}):
+            user_data["user_id"] = str(user_data.pop("_id"))
+            users.append(User.from_dict(user_data))
+        return users
\ No newline at end of file
@@ -6,13 +6,17 @@ class UserDAOInterface(ABC):
         pass
 
     @abstractmethod
-    async def find_by_id(self, user_id: str):
+    async def find_by_id(self, user_id: str, fields=None):
         pass
 
     @abstractmethod
-    async def find_by_email(self, email: str):
+    async def find_by_email(self, email: str, fields=None):
         pass
 
     @abstractmethod
-    async def find_by_username(self, username: str):
+    async def find_by_username(self, username: str, fields=None):
+        pass
+
+    @abstractmethod
+    async def find_many(self, user_ids, emails):
         pass
\ No newline at end of file
@@ -0,0 +1,128 @@
+# Runs explain() on every query the DAOs issue and fails if any of them scans a whole collection.
+# Run from Backend/: python -m dao.verify_indexes [--bootstrap]
+import argparse
+import asyncio
+import logging
+import sys
+from bson import ObjectId
+from dao.db_config import Database, initialize_db
+
+logger = logging.getLogger(__name__)
+
+SAMPLE_ID = ObjectId()
+SAMPLE = str(SAMPLE_ID)
+
+# (description, collection, filter, sort) for find queries
+FIND_QUERIES = [
+    ("UserDAO.find_by_id", "users", {"_id": SAMPLE_ID}, None),
+    ("UserDAO.find_by_email", "users", {"email": "user@example.com"}, None),
+    ("UserDAO.find_by_username", "users", {"username": "user"}, None),
+    ("UserDAO.find_many", "users", {"$or": [{"_id": {"$in": [SAMPLE_ID]}}, {"email": {"$in": ["user@example.com"]}}]}, None),
+    ("ClassDAO.find_by_id", "classes", {"_id": SAMPLE_ID}, None),
+    ("ClassDAO.find_by_class_code", "classes", {"class_code": "code"}, None),
+    ("ClassDAO.get_class_members", "class_memberships", {"class_id": SAMPLE}, None),
+    ("ClassDAO.iter_class_members", "class_memberships", {"class_id": SAMPLE}, None),
+    ("ClassDAO.get_user_memberships", "class_memberships", {"user_id": SAMPLE}, None),
+    ("ClassDAO.is_class_member", "class_memberships", {"class_id": SAMPLE, "user_id": SAMPLE}, None),
+    ("ClassDAO.remove_user_from_class", "class_memberships", {"class_id": SAMPLE, "user_id": SAMPLE}, None),
+    ("MeetingDAO.find_by_id", "meetings", {"_id": SAMPLE_ID}, None),
+    ("MeetingDAO.get_meeting_participants", "meeting_participants", {"meeting_id": SAMPLE}, None),
+    ("MeetingDAO.remove_user_from_meeting", "meeting_participants", {"meeting_id": SAMPLE, "user_id": SAMPLE}, None),
+    ("MeetingDAO.apply_participant_changes", "meeting_participants", {"$or": [{"meeting_id": SAMPLE, "user_id": SAMPLE}]}, None),
+    ("MeetingDAO.sync_participants", "meeting_participants", {"meeting_id": SAMPLE, "user_id": SAMPLE, "presence": True}, None),
+    ("JobDAO.claim_job", "jobs", {"$or": [{"status": "pending", "run_after": {"$lte": SAMPLE_ID.generation_time}}, {"status": "running", "lease_until": {"$lt": SAMPLE_ID.generation_time}}], "attempts": {"$lt": 5}}, [("created_at", 1)]),
+    ("JobDAO.fail_expired_jobs", "jobs", {"status": "running", "lease_until": {"$lt": SAMPLE_ID.generation_time}, "attempts": {"$gte": 5}}, None),
+    ("JobRun.find_ids meetings", "meetings", {"class_id": SAMPLE}, None),
+    ("JobRun.find_ids meeting_participants", "meeting_participants", {"meeting_id": {"$in": [SAMPLE]}}, None),
+    ("JobRun.find_ids chat_buckets", "chat_buckets", {"meeting_id": {"$in": [SAMPLE]}}, None),
+    ("JobRun.purge class_memberships", "class_memberships", {"class_id": SAMPLE}, None),
+    ("JobRun.find_ids chat_messages", "chat_messages", {"meeting_id": {"$in": [SAMPLE]}}, None),
+    ("MeetingDAO.get_agenda meetings lookup", "meetings", {"class_id": SAMPLE, "start_time": {"$gte": SAMPLE_ID.generation_time, "$lt": SAMPLE_ID.generation_time}}, [("start_time", 1), ("_id", 1)]),
+    ("MeetingDAO.get_agenda created classes", "classes", {"created_by": SAMPLE}, None),
+    ("MeetingDAO.get_messages", "chat_buckets", {"meeting_id": SAMPLE, "first_id": {"$lt": SAMPLE_ID}, "last_id": {"$lt": SAMPLE_ID}}, [("last_id", -1)]),
+    ("MeetingDAO.get_messages after", "chat_buckets", {"meeting_id": SAMPLE, "last_id": {"$gt": SAMPLE_ID}, "first_id": {"$gt": SAMPLE_ID}}, [("first_id", 1)]),
+    ("MeetingDAO.iter_messages", "chat_buckets", {"meeting_id": SAMPLE}, [("first_id", 1)]),
+    ("MeetingDAO.insert_messages", "chat_buckets", {"meeting_id": SAMPLE, "window_start": SAMPLE_ID.generation_time, "count": {"$lt": 200}, "bytes": {"$lt": 1048576}}, None),
+    ("chat_archive stale buckets", "chat_buckets", {"updated_at": {"$lt": SAMPLE_ID.generation_time}}, None),
+    ("chat_archive meeting buckets", "chat_buckets", {"meeting_id": SAMPLE}, [("first_id", 1)]),
+    ("chat_archive migrate already bucketed", "chat_buckets", {"$or": [{"meeting_id": SAMPLE, "first_id": {"$lte": SAMPLE_ID}, "last_id": {"$gte": SAMPLE_ID}}]}, None),
+    ("chat_archive migrate", "chat_messages", {}, [("meeting_id", 1), ("_id", 1)]),
+]
+
+# (description, collection, pipeline) for aggregations; only the initial $match/$sort is checked
+AGGREGATE_QUERIES = [
+    ("ClassDAO.get_user_classes", "class_memberships", [
+        {"$match": {"user_id": SAMPLE, "class_id": {"$gt": SAMPLE}}},
+        {"$sort": {"class_id": 1}},
+        {"$limit": 51},
+    ]),
+    ("ClassDAO.list_class_members", "class_memberships", [
+        {"$match": {"class_id": SAMPLE, "user_id": {"$gt": SAMPLE}}},
+        {"$sort": {"user_id": 1}},
+        {"$limit": 101},
+    ]),
+    ("MeetingDAO.get_agenda", "class_memberships", [
+        {"$match": {"user_id": SAMPLE}},
+        {"$project": {"_id": 0, "class_id": 1}},
+    ]),
+]
+
+def winning_plans(explain):
+    if isinstance(explain, dict):
+        if "winningPlan" in explain:
+            yield explain["winningPlan"]
+        for key, value in explain.items():
+            if key != "winningPlan":
+                yield from winning_plans(value)
+    elif isinstance(explain, list):
+        for item in explain:
+            yield from winning_plans(item)
+
+def find_stages(plan, stages=None):
+    stages = stages if stages is not None else []
+    if isinstance(plan, dict):
+        if "stage" in plan:
+            stages.append(plan["stage"])
+        for value in plan.values():
+            find_stages(value, stages)
+    elif isinstance(plan, list):
+        for item in plan:
+            find_stages(item, stages)
+    return stages
+
+async def explain_find(db, collection, query, sort):
+    cursor = db[collection].find(query)
+    if sort:
+        cursor = cursor.sort(sort)
+    return await cursor.explain()
+
+async def explain_aggregate(db, collection, pipeline):
+    return await db.command("aggregate", collection, pipeline=pipeline, explain=True)
+
+async def verify(bootstrap: bool = False):
+    db = Database.get_instance().db
+    if bootstrap:
+        await initialize_db()
+    checks = [(name, explain_find(db, collection, query, sort)) for name, collection, query, sort in FIND_QUERIES]
+    checks += [(name, explain_aggregate(db, collection, pipeline)) for name, collection, pipeline in AGGREGATE_QUERIES]
+    failures = 0
+    for name, check in checks:
+        stages = find_stages(list(winning_plans(await check)))
+        status = "COLLSCAN" if "COLLSCAN" in stages else "ok"
+        if status != "ok":
+            failures += 1
+        print(f"{status:>8}  {name}  {' > '.join(dict.fromkeys(stages))}")
+    return failures
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--bootstrap", action="store_true", help="create collections and indexes before checking")
+    args = parser.parse_args()
+    failures = asyncio.run(verify(args.bootstrap))
+    if failures:
+        print(f"{failures} queries are not backed by an index")
+        sys.exit(1)
+    print("All DAO queries use an index")
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
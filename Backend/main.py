@@ -1,11 +1,25 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, Depends
+from fastapi.responses import ORJSONResponse, PlainTextResponse
 from api.user.auth_api import router as auth_router
 from api.user.user_api import router as user_router
 from api.classes.class_api import router as class_router
 from api.meeting.meeting_api import router as meeting_router
+from api.meeting.meeting_ws import router as meeting_ws_router
+from api.user.websockets import router as user_ws_router
+from api.jobs.job_api import router as job_router
 from dao.user.interface import UserRegistrationRequest, UserLoginRequest
-from management.management import register_user, login_user
-from management.auth import get_current_user
+from management.management import register_user, login_user, chat_buffer, participant_writes, presence, job_runner, DAO_BACKEND
+from management.auth import get_current_user, token_cache
+from management.metrics import MetricsMiddleware, registry
+from management.room_hub import room_hub
+from management.notifications import notification_bus
+from management.backplane import backplane
+from management.rate_limit import rate_limiter
+from dao.cache import cache_stats, single_flight_stats
+from dao.db_config import initialize_db
+from dao.monitoring import pool_monitor, command_monitor
+from management.passwords import password_hasher
 from dotenv import load_dotenv
 import os
 import uvicorn
@@ -13,20 +27,69 @@ import uvicorn
 # Load environment variables
 load_dotenv()
 
+SCHEMA_BOOTSTRAP = os.getenv("SCHEMA_BOOTSTRAP", "True").lower() in ("1", "true", "yes")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if SCHEMA_BOOTSTRAP and DAO_BACKEND == "mongo":
+        await initialize_db()
+    await backplane.start()
+    chat_buffer.start()
+    presence.start()
+    job_runner.start()
+    yield
+    await job_runner.close()
+    await participant_writes.close()
+    await presence.close()
+    await backplane.close()
+    # Persist buffered chat messages before the process exits
+    await chat_buffer.close()
+    password_hasher.close()
+
 # Initialize FastAPI app
-app = FastAPI()
+app = FastAPI(lifespan=lifespan, default_response_class=ORJSONResponse)
+app.add_middleware(MetricsMiddleware)
+
+# Component stats exported as gauges on every scrape
+registry.register_stats("mongo_pool", pool_monitor.stats)
+registry.register_stats("mongo_command", command_monitor.stats, label="command")
+registry.register_stats("dao_cache", cache_stats, label="entity")
+registry.register_stats("dao_single_flight", single_flight_stats, label="lookup")
+registry.register_stats("token_cache", token_cache.stats)
+registry.register_stats("password_hasher", password_hasher.stats)
+registry.register_stats("chat_hub", room_hub.stats)
+registry.register_stats("chat_buffer", chat_buffer.stats)
+registry.register_stats("participant_writes", participant_writes.stats)
+registry.register_stats("notifications", notification_bus.stats)
+registry.register_stats("backplane", backplane.stats)
+registry.register_stats("presence", presence.stats)
+registry.register_stats("jobs", job_runner.stats)
+registry.register_stats("rate_limit", rate_limiter.stats, label="policy")
 
 # Register routers
 app.include_router(auth_router, prefix="/api/auth", tags=["Auth"])
 app.include_router(user_router, prefix="/api/user", tags=["User"])
+app.include_router(user_ws_router, prefix="/api/user", tags=["User"])
 app.include_router(class_router, prefix="/api/class", tags=["Class"])
 app.include_router(meeting_router, prefix="/api/meeting", tags=["Meeting"])
+app.include_router(meeting_ws_router, prefix="/api/meeting", tags=["Meeting"])
+app.include_router(job_router, prefix="/api/jobs", tags=["Jobs"])
 
 # Root endpoint
 @app.get("/")
 def read_root():
     return {"message": "Welcome to ClassMeet API!"}
 
+# Connection pool and per-command timings from the Mongo driver
+@app.get("/stats/db")
+def db_stats():
+    return {"pool": pool_monitor.stats(), "commands": command_monitor.stats()}
+
+# Prometheus scrape endpoint
+@app.get("/metrics", response_class=PlainTextResponse)
+def metrics():
+    return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4")
+
 # Current user info
 @app.get("/me")
 async def get_me(user_id: str = Depends(get_current_user)):
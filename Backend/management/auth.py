@@ -1,6 +1,9 @@
-from fastapi import Depends, HTTPException
+from fastapi import Depends, HTTPException, WebSocket, WebSocketException, status
 from fastapi.security import OAuth2PasswordBearer
+from collections import OrderedDict
+import hashlib
 import jwt
+import time
 from dotenv import load_dotenv
 import os
 
@@ -9,16 +12,119 @@ load_dotenv()
 
 SECRET_KEY = os.getenv("SECRET_KEY")
 ALGORITHM = "HS256"
+TOKEN_CACHE_SIZE = int(os.getenv("TOKEN_CACHE_SIZE", 10000))
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
 
-async def get_current_user(token: str = Depends(oauth2_scheme)):
+# Revoked token digests, kept only until the token would have expired anyway.
+# Any object with revoke/is_revoked can be swapped in for a shared store.
+class RevocationList:
+    def __init__(self):
+        self._revoked = {}
+
+    def revoke(self, digest: bytes, exp: float):
+        now = time.time()
+        self._revoked = {d: e for d, e in self._revoked.items() if e > now}
+        self._revoked[digest] = exp
+
+    def is_revoked(self, digest: bytes) -> bool:
+        exp = self._revoked.get(digest)
+        if exp is None:
+            return False
+        if exp <= time.time():
+            del self._revoked[digest]
+            return False
+        return True
+
+# LRU of already verified tokens: sha256(token) -> (user_id, exp).
+# An entry is never served at or after its exp, so expiry behaves exactly as jwt.decode.
+class TokenCache:
+    def __init__(self, max_size: int = TOKEN_CACHE_SIZE):
+        self.max_size = max_size
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, digest: bytes):
+        entry = self._entries.get(digest)
+        if entry is None:
+            self.misses += 1
+            return None
+        if entry[1] <= time.time():
+            del self._entries[digest]
+            self.misses += 1
+            return None
+        self._entries.move_to_end(digest)
+        self.hits += 1
+        return entry[0]
+
+    def put(self, digest: bytes, user_id: str, exp: float):
+        self._entries[digest] = (user_id, exp)
+        self._entries.move_to_end(digest)
+        if len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def discard(self, digest: bytes):
+        self._entries.pop(digest, None)
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+        }
+
+token_cache = TokenCache()
+revocation_list = RevocationList()
+
+def _digest(token: str) -> bytes:
+    return hashlib.sha256(token.encode("utf-8")).digest()
+
+def decode_token(token: str):
+    digest = _digest(token)
+    if revocation_list.is_revoked(digest):
+        raise HTTPException(status_code=401, detail="Token revoked")
+    user_id = token_cache.get(digest)
+    if user_id:
+        return user_id
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
         user_id = payload.get("sub")
         if not user_id:
             raise HTTPException(status_code=401, detail="Invalid token")
+        if payload.get("exp"):
+            token_cache.put(digest, user_id, payload["exp"])
         return user_id
     except jwt.ExpiredSignatureError:
         raise HTTPException(status_code=401, detail="Token expired")
     except jwt.InvalidTokenError:
-        raise HTTPException(status_code=401, detail="Invalid token")
\ No newline at end of file
+        raise HTTPException(status_code=401, detail="Invalid token")
+
+def revoke_token(token: str):
+    decode_token(token)
+    payload = jwt.decode(token, options={"verify_signature": False})
+    digest = _digest(token)
+    revocation_list.revoke(digest, payload.get("exp", time.time()))
+    token_cache.discard(digest)
+
+async def get_current_user(token: str = Depends(oauth2_scheme)):
+    return decode_token(token)
+
+# Browsers cannot set headers on a WebSocket handshake, so the token may also come as ?token=
+async def get_current_user_ws(websocket: WebSocket):
+    token = websocket.query_params.get("token")
+    if not token:
+        scheme, _, param = websocket.headers.get("authorization", "").partition(" ")
+        if scheme.lower() == "bearer":
+            token = param
+    if not token:
+        raise WebSocketException(code=status.WS_1008_POLICY_VIOLATION, reason="Not authenticated")
+    try:
+        return decode_token(token)
+    except HTTPException as e:
+        raise WebSocketException(code=status.WS_1008_POLICY_VIOLATION, reason=e.detail)
\ No newline at end of file
@@ -0,0 +1,156 @@
+from abc import ABC, abstractmethod
+from datetime import datetime
+import asyncio
+import logging
+import os
+from dotenv import load_dotenv
+from pymongo.errors import OperationFailure
+
+# Load environment variables from .env
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+# "inprocess" for a single worker; "mongo" fans out across workers and hosts through a change stream
+BACKPLANE = os.getenv("BACKPLANE", "inprocess")
+BACKPLANE_BATCH_SIZE = int(os.getenv("BACKPLANE_BATCH_SIZE", 100))
+# Events waiting to be inserted; past this a slow database drops new events instead of growing memory
+BACKPLANE_OUTBOX_SIZE = int(os.getenv("BACKPLANE_OUTBOX_SIZE", 10000))
+# Change stream reconnects back off from one second up to this
+BACKPLANE_RETRY_MAX_SECONDS = float(os.getenv("BACKPLANE_RETRY_MAX_SECONDS", 30))
+
+# Broadcast backplane shared by chat rooms and notifications. Handlers subscribe to a
+# topic ("chat", "notify") and are called with (key, payload) for every message published
+# on it by any worker, including this one.
+#
+# Ordering: every worker delivers the messages of a topic in one agreed order. For the
+# in-process backplane that is publish order. For the Mongo backplane it is the oplog
+# order of the event inserts, which is the same for all watchers; a worker inserts its
+# own messages in FIFO order, so messages from one connection are never reordered.
+# benchmarks/backplane_order.py checks this with two workers (also run by the harness).
+class Backplane(ABC):
+    def __init__(self):
+        self._handlers = {}
+        self.published = 0
+        self.delivered = 0
+
+    def subscribe(self, topic: str, handler):
+        self._handlers.setdefault(topic, []).append(handler)
+
+    def _deliver(self, topic: str, key: str, payload):
+        for handler in self._handlers.get(topic, ()):
+            try:
+                handler(key, payload)
+            except Exception as e:
+                logger.error(f"Backplane handler for {topic} failed: {e}")
+        self.delivered += 1
+
+    @abstractmethod
+    def publish(self, topic: str, key: str, payload):
+        pass
+
+    async def start(self):
+        pass
+
+    async def close(self):
+        pass
+
+    def stats(self):
+        return {"published": self.published, "delivered": self.delivered}
+
+class InProcessBackplane(Backplane):
+    def publish(self, topic: str, key: str, payload):
+        self.published += 1
+        self._deliver(topic, key, payload)
+
+# Publishes into the broadcast_events collection and delivers whatever a change stream on it
+# returns. Needs a replica set (or Atlas); events expire through a TTL index on created_at.
+class MongoChangeStreamBackplane(Backplane):
+    def __init__(self, collection, batch_size: int = BACKPLANE_BATCH_SIZE, max_outbox: int = BACKPLANE_OUTBOX_SIZE):
+        super().__init__()
+        self.collection = collection
+        self.batch_size = batch_size
+        self._outbox = asyncio.Queue(maxsize=max_outbox)
+        self._tasks = []
+        self._resume_token = None
+        self.publish_failures = 0
+        self.dropped = 0
+        self.stream_errors = 0
+        self.history_lost = 0
+
+    def publish(self, topic: str, key: str, payload):
+        try:
+            self._outbox.put_nowait({"topic": topic, "key": key, "payload": payload, "created_at": datetime.utcnow()})
+        except asyncio.QueueFull:
+            self.dropped += 1
+            if self.dropped % 1000 == 1:
+                logger.warning(f"Backplane outbox full, {self.dropped} events dropped so far")
+            return
+        self.published += 1
+
+    async def start(self):
+        if not self._tasks:
+            self._tasks = [asyncio.create_task(self._publish_loop()), asyncio.create_task(self._watch_loop())]
+
+    async def close(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def _publish_loop(self):
+        while True:
+            batch = [await self._outbox.get()]
+            while len(batch) < self.batch_size and not self._outbox.empty():
+                batch.append(self._outbox.get_nowait())
+            try:
+                # ordered=True keeps this worker's messages in publish order
+                await self.collection.insert_many(batch, ordered=True)
+            except Exception as e:
+                self.publish_failures += len(batch)
+                logger.error(f"Backplane failed to publish {len(batch)} events: {e}")
+
+    async def _watch_loop(self):
+        pipeline = [{"$match": {"operationType": "insert"}}]
+        delay = 1
+        while True:
+            try:
+                async with self.collection.watch(pipeline, resume_after=self._resume_token) as stream:
+                    delay = 1
+                    async for change in stream:
+                        event = change["fullDocument"]
+                        self._deliver(event["topic"], event["key"], event["payload"])
+                        self._resume_token = stream.resume_token
+            except asyncio.CancelledError:
+                raise
+            except OperationFailure as e:
+                self.stream_errors += 1
+                if self._resume_token is None:
+                    logger.error(f"Backplane change stream failed, retrying in {delay}s: {e}")
+                else:
+                    # The driver resumes transient errors itself, so a failure that reaches here
+                    # with a token means it cannot resume (e.g. the token fell off the oplog).
+                    # Events since then are lost; start again from now, without waiting.
+                    self.history_lost += 1
+                    self._resume_token = None
+                    logger.error(f"Backplane change stream cannot resume, events from other workers were missed: {e}")
+                    continue
+            except Exception as e:
+                self.stream_errors += 1
+                logger.error(f"Backplane change stream interrupted, resuming in {delay}s: {e}")
+            else:
+                continue
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, BACKPLANE_RETRY_MAX_SECONDS)
+
+    def stats(self):
+        return dict(super().stats(), pending=self._outbox.qsize(), publish_failures=self.publish_failures, dropped=self.dropped,
+                    stream_errors=self.stream_errors, history_lost=self.history_lost)
+
+def create_backplane():
+    if BACKPLANE == "mongo":
+        from dao.db_config import Database
+        return MongoChangeStreamBackplane(Database.get_instance().db.broadcast_events)
+    return InProcessBackplane()
+
+backplane = create_backplane()
\ No newline at end of file
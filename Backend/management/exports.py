@@ -0,0 +1,59 @@
+from datetime import datetime
+from fastapi.responses import StreamingResponse
+import csv
+import io
+import orjson
+import os
+from dotenv import load_dotenv
+
+# Load environment variables from .env
+load_dotenv()
+
+# Rows fetched per database round trip and written per response chunk
+EXPORT_BATCH_SIZE = int(os.getenv("EXPORT_BATCH_SIZE", 1000))
+
+EXPORT_MEDIA_TYPES = {"csv": "text/csv", "ndjson": "application/x-ndjson"}
+
+async def batched(items, size: int = EXPORT_BATCH_SIZE):
+    batch = []
+    async for item in items:
+        batch.append(item)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+def _csv_cell(value):
+    if value is None:
+        return ""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    value = str(value)
+    # Keep spreadsheets from evaluating user text (chat messages, usernames) as formulas;
+    # a leading tab or carriage return can hide a formula character behind it
+    return "'" + value if value[:1] in ("=", "+", "-", "@", "\t", "\r") else value
+
+def _encode_csv(columns, rows) -> bytes:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerows([_csv_cell(row.get(column)) for column in columns] for row in rows)
+    return buffer.getvalue().encode()
+
+def _encode_ndjson(columns, rows) -> bytes:
+    return b"".join(orjson.dumps({column: row.get(column) for column in columns}) + b"\n" for row in rows)
+
+async def _encode(row_batches, columns, export_format: str):
+    if export_format == "csv":
+        yield _encode_csv(columns, [dict(zip(columns, columns))])
+    encode = _encode_csv if export_format == "csv" else _encode_ndjson
+    async for rows in row_batches:
+        yield encode(columns, rows)
+
+# Streams row batches as a CSV or NDJSON download; one chunk per batch keeps memory flat
+def export_response(row_batches, columns, export_format: str, filename: str) -> StreamingResponse:
+    return StreamingResponse(
+        _encode(row_batches, columns, export_format),
+        media_type=EXPORT_MEDIA_TYPES[export_format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}.{export_format}"'}
+    )
\ No newline at end of file
@@ -0,0 +1,191 @@
+import asyncio
+import logging
+import os
+import socket
+from datetime import datetime, timedelta
+from dotenv import load_dotenv
+from dao.jobs.object import Job
+from management.backplane import backplane
+from management.notifications import notification_bus
+
+# Load environment variables from .env
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+JOB_BATCH_SIZE = int(os.getenv("JOB_BATCH_SIZE", 500))
+JOB_BATCH_PAUSE_MS = int(os.getenv("JOB_BATCH_PAUSE_MS", 50))
+JOB_POLL_SECONDS = float(os.getenv("JOB_POLL_SECONDS", 5))
+JOB_LEASE_SECONDS = float(os.getenv("JOB_LEASE_SECONDS", 60))
+JOB_MAX_ATTEMPTS = int(os.getenv("JOB_MAX_ATTEMPTS", 5))
+# Delay before a failed job is retried, doubled on every further attempt
+JOB_RETRY_DELAY_SECONDS = float(os.getenv("JOB_RETRY_DELAY_SECONDS", 30))
+
+class LeaseLost(Exception):
+    pass
+
+# Handle a job handler works through. Every delete goes in pages of batch_size with a pause
+# in between, and each page renews the lease and saves the progress counters, so a job picked
+# up again after a crash carries on from where the data is, not from the start.
+class JobRun:
+    def __init__(self, runner, job: Job):
+        self.runner = runner
+        self.job = job
+        self.progress = dict(job.progress)
+
+    async def find_ids(self, collection: str, query: dict):
+        return await self.runner.job_dao.find_ids(collection, query, self.runner.batch_size)
+
+    async def delete_ids(self, collection: str, ids) -> int:
+        deleted = await self.runner.job_dao.delete_ids(collection, ids)
+        self.progress[collection] = self.progress.get(collection, 0) + deleted
+        if not await self.runner.job_dao.renew_job(self.job.job_id, self.runner.owner, self.progress, self.runner.lease_seconds):
+            raise LeaseLost(self.job.job_id)
+        await asyncio.sleep(self.runner.batch_pause)
+        return deleted
+
+    # each_batch, if given, sees every page (with fields loaded) before it is deleted
+    async def purge(self, collection: str, query: dict, fields=(), each_batch=None) -> int:
+        total = 0
+        while True:
+            documents = await self.runner.job_dao.find_documents(collection, query, fields, self.runner.batch_size)
+            if not documents:
+                return total
+            if each_batch is not None:
+                each_batch(documents)
+            total += await self.delete_ids(collection, [document["_id"] for document in documents])
+
+# Persistent background jobs. Jobs live in the jobs collection, so any worker can claim
+# one; a job whose owner dies is claimed again once its lease runs out. A failed attempt is
+# retried after a growing delay, and a job stops being claimed after max_attempts, whether
+# its attempts failed or timed out. Handlers must be idempotent, since a job may run more than once.
+class JobRunner:
+    def __init__(self, job_dao, handlers, batch_size=JOB_BATCH_SIZE, batch_pause_ms=JOB_BATCH_PAUSE_MS,
+                 poll_seconds=JOB_POLL_SECONDS, lease_seconds=JOB_LEASE_SECONDS, max_attempts=JOB_MAX_ATTEMPTS,
+                 retry_delay=JOB_RETRY_DELAY_SECONDS):
+        self.job_dao = job_dao
+        self.handlers = handlers
+        self.batch_size = batch_size
+        self.batch_pause = batch_pause_ms / 1000
+        self.poll_seconds = poll_seconds
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay
+        self.owner = f"{socket.gethostname()}:{os.getpid()}"
+        self._wakeup = asyncio.Event()
+        self._task = None
+        self.completed = 0
+        self.failed = 0
+        self.retried = 0
+        self.running = 0
+
+    async def enqueue(self, job_type: str, params: dict, created_by: str) -> str:
+        job_id = await self.job_dao.create_job(Job(job_type, params, created_by))
+        self._wakeup.set()
+        return job_id
+
+    async def get(self, job_id: str):
+        return await self.job_dao.find_by_id(job_id)
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def close(self):
+        # An interrupted job keeps its lease and is resumed after it expires
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _run(self):
+        while True:
+            try:
+                job = await self.job_dao.claim_job(self.owner, self.lease_seconds, self.max_attempts)
+                if job is None:
+                    self.failed += await self.job_dao.fail_expired_jobs(self.max_attempts)
+            except Exception as e:
+                logger.error(f"Failed to claim job: {e}")
+                job = None
+            if job is None:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_seconds)
+                except asyncio.TimeoutError:
+                    pass
+                self._wakeup.clear()
+                continue
+            # A failure outside the handler (e.g. releasing the job) must not stop the runner;
+            # the job's lease runs out and it is claimed again or failed by fail_expired_jobs
+            try:
+                await self._execute(job)
+            except Exception as e:
+                logger.error(f"Job {job.job_id} could not be completed: {e}")
+
+    async def _execute(self, job: Job):
+        handler = self.handlers.get(job.job_type)
+        if handler is None:
+            logger.error(f"No handler for job {job.job_id} of type {job.job_type}")
+            await self.job_dao.release_job(job.job_id, self.owner, "failed", f"Unknown job type {job.job_type}")
+            self.failed += 1
+            return
+        logger.info(f"Running job {job.job_id} ({job.job_type}), attempt {job.attempts}")
+        self.running += 1
+        try:
+            await handler(JobRun(self, job), job.params)
+        except asyncio.CancelledError:
+            raise
+        except LeaseLost:
+            logger.warning(f"Lost the lease on job {job.job_id}, another worker took it over")
+            return
+        except Exception as e:
+            logger.error(f"Job {job.job_id} attempt {job.attempts} failed: {e}")
+            if job.attempts >= self.max_attempts:
+                await self.job_dao.release_job(job.job_id, self.owner, "failed", str(e))
+                self.failed += 1
+            else:
+                run_after = datetime.utcnow() + timedelta(seconds=self.retry_delay * 2 ** (job.attempts - 1))
+                await self.job_dao.release_job(job.job_id, self.owner, "pending", str(e), run_after)
+                self.retried += 1
+            return
+        finally:
+            self.running -= 1
+        await self.job_dao.release_job(job.job_id, self.owner, "done")
+        self.completed += 1
+        logger.info(f"Job {job.job_id} finished")
+
+    def stats(self):
+        return {"running": self.running, "completed": self.completed, "failed": self.failed, "retried": self.retried}
+
+# Cascades for deleted classes and meetings. The parent document is removed in the request;
+# these clean up everything that points at it. Children go before parents so an interrupted
+# run still finds what is left on the next attempt.
+async def delete_meeting_data(run: JobRun, meeting_ids):
+    # Close the chat rooms on every worker first, so open sockets and presence stop writing
+    # participants and chat buckets behind the purge
+    for meeting_id in meeting_ids:
+        backplane.publish("meeting.closed", meeting_id, None)
+    await run.purge("meeting_participants", {"meeting_id": {"$in": meeting_ids}})
+    await run.purge("chat_buckets", {"meeting_id": {"$in": meeting_ids}})
+    # Per-message history from before bucketing, until chat_archive migrate has moved it
+    await run.purge("chat_messages", {"meeting_id": {"$in": meeting_ids}})
+
+async def cascade_meeting_delete(run: JobRun, params: dict):
+    await delete_meeting_data(run, [params["meeting_id"]])
+
+async def cascade_class_delete(run: JobRun, params: dict):
+    class_id = params["class_id"]
+    # Members hear about the deletion one page of memberships at a time, as the pages are removed.
+    # A page interrupted before its delete is notified again on the next attempt.
+    await run.purge("class_memberships", {"class_id": class_id}, ("user_id",), lambda memberships: notification_bus.publish(
+        [membership["user_id"] for membership in memberships], "class.deleted", {"class_id": class_id}))
+    while True:
+        ids = await run.find_ids("meetings", {"class_id": class_id})
+        if not ids:
+            break
+        await delete_meeting_data(run, [str(meeting_id) for meeting_id in ids])
+        await run.delete_ids("meetings", ids)
+
+JOB_HANDLERS = {
+    "class.delete": cascade_class_delete,
+    "meeting.delete": cascade_meeting_delete,
+}
\ No newline at end of file
@@ -2,13 +2,28 @@ from fastapi import HTTPException
 from dao.user.user_dao import UserDAO
 from dao.classes.class_dao import ClassDAO
 from dao.meeting.meeting_dao import MeetingDAO
+from dao.meeting.chat_buffer import ChatWriteBuffer
+from dao.meeting.participant_batcher import ParticipantWriteBatcher
+from dao.jobs.job_dao import JobDAO
+from dao.cache import DAO_CACHE_ENABLED
+from dao.user.cached_user_dao import CachedUserDAO
+from dao.classes.cached_class_dao import CachedClassDAO
+from dao.meeting.cached_meeting_dao import CachedMeetingDAO
 from dao.user.object import User
 from dao.classes.object import Class
 from dao.meeting.object import Meeting
+from management.passwords import password_hasher
+from management.notifications import notification_bus
+from management.presence import PresenceRegistry
+from management.backplane import backplane
+from management.jobs import JobRunner, JOB_HANDLERS
+from management.exports import EXPORT_BATCH_SIZE, batched
 from dao.user.interface import UserRegistrationRequest, UserLoginRequest
-from dao.classes.interface import ClassCreateRequest, ClassJoinRequest, ClassResponse
-from dao.meeting.interface import MeetingCreateRequest, MeetingResponse
-from datetime import datetime, timedelta
+from dao.classes.interface import ClassCreateRequest, ClassJoinRequest, ClassBulkEnrollRequest, ClassBulkEnrollResult, ClassBulkEnrollResponse
+from dao.jobs.interface import JobResponse
+from dao.meeting.interface import MeetingCreateRequest
+from bson import ObjectId
+from datetime import datetime, timedelta, timezone
 import jwt
 import logging
 from dotenv import load_dotenv
@@ -22,21 +37,46 @@ logger = logging.getLogger(__name__)
 SECRET_KEY = os.getenv("SECRET_KEY")
 JWT_EXPIRATION = int(os.getenv("JWT_EXPIRATION"))
 ALGORITHM = "HS256"
+# "mongo" for production; "memory" runs the app on in-process DAOs for benchmarks and local runs
+DAO_BACKEND = os.getenv("DAO_BACKEND", "mongo")
+AGENDA_DEFAULT_DAYS = int(os.getenv("AGENDA_DEFAULT_DAYS", 14))
+AGENDA_MAX_DAYS = int(os.getenv("AGENDA_MAX_DAYS", 366))
+# Memberships read per round trip when an event goes out to a whole class
+NOTIFY_BATCH_SIZE = int(os.getenv("NOTIFY_BATCH_SIZE", 1000))
 
-# Initialize DAOs
-user_dao = UserDAO()
-class_dao = ClassDAO()
-meeting_dao = MeetingDAO()
+# Initialize DAOs; the API modules share these instances so cache invalidation is seen everywhere
+if DAO_BACKEND == "memory":
+    from dao.user.memory_user_dao import InMemoryUserDAO
+    from dao.classes.memory_class_dao import InMemoryClassDAO
+    from dao.meeting.memory_meeting_dao import InMemoryMeetingDAO
+    from dao.jobs.memory_job_dao import InMemoryJobDAO
+    user_dao = InMemoryUserDAO()
+    class_dao = InMemoryClassDAO()
+    meeting_dao = InMemoryMeetingDAO()
+    job_dao = InMemoryJobDAO()
+else:
+    user_dao = UserDAO()
+    class_dao = ClassDAO()
+    meeting_dao = MeetingDAO()
+    job_dao = JobDAO()
+if DAO_CACHE_ENABLED:
+    user_dao = CachedUserDAO(user_dao)
+    class_dao = CachedClassDAO(class_dao)
+    meeting_dao = CachedMeetingDAO(meeting_dao)
+chat_buffer = ChatWriteBuffer(meeting_dao.insert_messages)
+participant_writes = ParticipantWriteBatcher(meeting_dao.apply_participant_changes)
+presence = PresenceRegistry(meeting_dao.sync_participants)
+backplane.subscribe("presence", presence.deliver)
+backplane.subscribe("meeting.closed", presence.close_meeting)
+backplane.subscribe("meeting.closed", chat_buffer.discard)
+job_runner = JobRunner(job_dao, JOB_HANDLERS)
 
 # User Management
 async def register_user(request: UserRegistrationRequest):
     logger.info(f"Registration request for email: {request.email}")
-    if await user_dao.find_by_email(request.email):
-        raise HTTPException(status_code=400, detail="Email already registered")
-    if await user_dao.find_by_username(request.username):
-        raise HTTPException(status_code=400, detail="Username already exists")
-
-    new_user = User(username=request.username, email=request.email, password=request.password)
+    # No pre-checks: create_user reports a taken email or username from the unique indexes
+    password_hash = await password_hasher.hash(request.password)
+    new_user = User(username=request.username, email=request.email, password_hash=password_hash)
     user_id = await user_dao.create_user(new_user)
     logger.info(f"User created with ID: {user_id}")
 
@@ -45,8 +85,8 @@ async def register_user(request: UserRegistrationRequest):
 
 async def login_user(request: UserLoginRequest):
     logger.info(f"Login request for email: {request.email}")
-    user = await user_dao.find_by_email(request.email)
-    if not user or not user.verify_password(request.password):
+    user = await user_dao.find_by_email(request.email, ("password_hash",))
+    if not user or not await password_hasher.verify(request.password, user.password_hash):
         raise HTTPException(status_code=401, detail="Invalid email or password")
 
     token = create_access_token(user.user_id)
@@ -56,17 +96,8 @@ async def login_user(request: UserLoginRequest):
 async def create_class(data: ClassCreateRequest, user_id: str):
     logger.info(f"Create class request for: {data.class_name}")
     new_class = Class(class_name=data.class_name, created_by=user_id, description=data.description)
-    if await class_dao.find_by_class_code(new_class.class_code):
-        raise HTTPException(status_code=400, detail="Class code already exists")
-    class_id = await class_dao.create_class(new_class)
-    created_class = await class_dao.find_by_id(class_id)
-    return ClassResponse(
-        class_id=created_class.class_id,
-        class_name=created_class.class_name,
-        description=created_class.description,
-        class_code=created_class.class_code,
-        created_by=created_class.created_by
-    )
+    await class_dao.create_class(new_class)
+    return new_class.to_response()
 
 async def join_class(data: ClassJoinRequest, user_id: str):
     logger.info(f"User {user_id} joining class with code: {data.class_code}")
@@ -74,29 +105,123 @@ async def join_class(data: ClassJoinRequest, user_id: str):
     if not class_obj:
         raise HTTPException(status_code=404, detail="Class not found")
     await class_dao.add_user_to_class(class_obj.class_id, user_id)
-    return ClassResponse(
-        class_id=class_obj.class_id,
-        class_name=class_obj.class_name,
-        description=class_obj.description,
-        class_code=class_obj.class_code,
-        created_by=class_obj.created_by
+    notification_bus.publish([class_obj.created_by, user_id], "class.member_joined",
+                             {"class_id": class_obj.class_id, "user_id": user_id})
+    return class_obj.to_response()
+
+# Resolves the whole roster in one query and inserts the new memberships in one batch
+async def bulk_enroll(class_id: str, data: ClassBulkEnrollRequest, user_id: str):
+    logger.info(f"User {user_id} enrolling {len(data.user_ids) + len(data.emails)} users into class: {class_id}")
+    class_obj = await class_dao.find_by_id(class_id, ("created_by",))
+    if not class_obj:
+        raise HTTPException(status_code=404, detail="Class not found")
+    if class_obj.created_by != user_id:
+        raise HTTPException(status_code=403, detail="Only class creator can enroll members")
+    emails = [email.strip() for email in data.emails]
+    users = await user_dao.find_many(data.user_ids, emails) if data.user_ids or emails else []
+    known_ids = {user.user_id for user in users}
+    by_email = {user.email: user.user_id for user in users}
+
+    rows = [(identifier, identifier if identifier in known_ids else None) for identifier in data.user_ids]
+    rows += [(email, by_email.get(email)) for email in emails]
+    resolved = list(dict.fromkeys(member_id for _, member_id in rows if member_id))
+    already_member = await class_dao.add_users_to_class(class_id, resolved)
+    added = [member_id for member_id in resolved if member_id not in already_member]
+    if added:
+        notification_bus.publish(added, "class.member_added", {"class_id": class_id})
+
+    results = []
+    reported = set()
+    for identifier, member_id in rows:
+        if member_id is None:
+            status = "unknown_user"
+        elif member_id in already_member or member_id in reported:
+            # Listed twice in the same request counts as already a member the second time
+            status = "already_member"
+        else:
+            status = "added"
+            reported.add(member_id)
+        results.append(ClassBulkEnrollResult(identifier=identifier, user_id=member_id, status=status))
+    return ClassBulkEnrollResponse(
+        added=sum(1 for result in results if result.status == "added"),
+        already_member=sum(1 for result in results if result.status == "already_member"),
+        unknown_user=sum(1 for result in results if result.status == "unknown_user"),
+        results=results
     )
 
-async def get_user_classes(user_id: str):
+async def get_user_classes(user_id: str, limit: int = 50, after: str = None):
     logger.info(f"Fetching classes for user: {user_id}")
-    memberships = await class_dao.get_user_memberships(user_id)
-    classes = []
-    for membership in memberships:
-        class_obj = await class_dao.find_by_id(membership["class_id"])
-        if class_obj:
-            classes.append(ClassResponse(
-                class_id=class_obj.class_id,
-                class_name=class_obj.class_name,
-                description=class_obj.description,
-                class_code=class_obj.class_code,
-                created_by=class_obj.created_by
-            ))
-    return classes
+    classes, next_cursor = await class_dao.get_user_classes(user_id, limit, after)
+    return [class_obj.to_response() for class_obj in classes], next_cursor
+
+# Keyset page of a class roster; X-Next-Cursor is the last user_id on the page
+async def get_class_members(class_id: str, user_id: str, limit: int = 100, after: str = None, include: str = None):
+    logger.info(f"User {user_id} listing members of class: {class_id}")
+    class_obj = await class_dao.find_by_id(class_id, ("_id",))
+    if not class_obj:
+        raise HTTPException(status_code=404, detail="Class not found")
+    return await class_dao.list_class_members(class_id, limit, after, include == "profile")
+
+async def remove_class_member(class_id: str, member_id: str, user_id: str):
+    logger.info(f"User {user_id} removing member {member_id} from class: {class_id}")
+    class_obj = await class_dao.find_by_id(class_id, ("created_by",))
+    if not class_obj:
+        raise HTTPException(status_code=404, detail="Class not found")
+    if class_obj.created_by != user_id:
+        raise HTTPException(status_code=403, detail="Only class creator can remove members")
+    await class_dao.remove_user_from_class(class_id, member_id)
+    notification_bus.publish([member_id], "class.member_removed", {"class_id": class_id, "user_id": member_id})
+    return {"message": "Member removed successfully"}
+
+async def leave_class(class_id: str, user_id: str):
+    logger.info(f"User {user_id} leaving class: {class_id}")
+    class_obj = await class_dao.find_by_id(class_id, ("created_by",))
+    if not class_obj:
+        raise HTTPException(status_code=404, detail="Class not found")
+    await class_dao.remove_user_from_class(class_id, user_id)
+    notification_bus.publish([class_obj.created_by, user_id], "class.member_left", {"class_id": class_id, "user_id": user_id})
+    return {"message": "User left class successfully"}
+
+async def delete_class(class_id: str, user_id: str):
+    logger.info(f"User {user_id} deleting class: {class_id}")
+    class_obj = await class_dao.find_by_id(class_id, ("created_by",))
+    if not class_obj:
+        raise HTTPException(status_code=404, detail="Class not found")
+    if class_obj.created_by != user_id:
+        raise HTTPException(status_code=403, detail="Only class creator can delete class")
+    await class_dao.delete_class(class_id)
+    # Memberships, meetings, participants and chat history are removed in the background,
+    # and the members are notified as their memberships go
+    job_id = await job_runner.enqueue("class.delete", {"class_id": class_id}, user_id)
+    notification_bus.publish([user_id], "class.deleted", {"class_id": class_id})
+    return {"message": "Class deleted successfully", "job_id": job_id}
+
+ROSTER_COLUMNS = ("user_id", "username", "email", "joined_at")
+
+# Checks access up front and returns the roster as an async iterator of row batches; each
+# batch of memberships is resolved to profiles with one find_many
+async def export_class_roster(class_id: str, user_id: str):
+    logger.info(f"User {user_id} exporting roster of class: {class_id}")
+    class_obj = await class_dao.find_by_id(class_id, ("created_by",))
+    if not class_obj:
+        raise HTTPException(status_code=404, detail="Class not found")
+    if class_obj.created_by != user_id:
+        raise HTTPException(status_code=403, detail="Only class creator can export the roster")
+
+    async def rows():
+        async for memberships in batched(class_dao.iter_class_members(class_id, EXPORT_BATCH_SIZE)):
+            users = {user.user_id: user for user in await user_dao.find_many([m["user_id"] for m in memberships], [])}
+            batch = []
+            for membership in memberships:
+                user = users.get(membership["user_id"])
+                batch.append({
+                    "user_id": membership["user_id"],
+                    "username": user.username if user else None,
+                    "email": user.email if user else None,
+                    "joined_at": membership.get("joined_at"),
+                })
+            yield batch
+    return rows()
 
 # Meeting Management
 async def create_meeting(data: MeetingCreateRequest, user_id: str):
@@ -105,39 +230,154 @@ async def create_meeting(data: MeetingCreateRequest, user_id: str):
         title=data.title,
         class_id=data.class_id,
         created_by=user_id,
-        start_time=datetime.fromisoformat(data.start_time),
-        end_time=datetime.fromisoformat(data.end_time)
+        start_time=_to_utc(datetime.fromisoformat(data.start_time)),
+        end_time=_to_utc(datetime.fromisoformat(data.end_time))
     )
-    class_obj = await class_dao.find_by_id(data.class_id)
+    class_obj = await class_dao.find_by_id(data.class_id, ("created_by",))
     if not class_obj:
         raise HTTPException(status_code=404, detail="Class not found")
-    meeting_id = await meeting_dao.create_meeting(new_meeting)
-    created_meeting = await meeting_dao.find_by_id(meeting_id)
-    return MeetingResponse(
-        meeting_id=created_meeting.meeting_id,
-        title=created_meeting.title,
-        class_id=created_meeting.class_id,
-        created_by=created_meeting.created_by,
-        start_time=created_meeting.start_time.isoformat(),
-        end_time=created_meeting.end_time.isoformat() if created_meeting.end_time else None
-    )
+    await meeting_dao.create_meeting(new_meeting)
+    response = new_meeting.to_response()
+    notification_bus.publish([class_obj.created_by], "meeting.created", response)
+    await notify_class(data.class_id, "meeting.created", response)
+    return response
+
+# Streams the roster and publishes one event per batch, so a large class is never held in memory
+async def notify_class(class_id: str, event_type: str, data: dict):
+    async for memberships in batched(class_dao.iter_class_members(class_id, NOTIFY_BATCH_SIZE), NOTIFY_BATCH_SIZE):
+        notification_bus.publish([m["user_id"] for m in memberships], event_type, data)
+
+def _to_utc(value: datetime) -> datetime:
+    # Meeting times are stored as naive UTC
+    return value.astimezone(timezone.utc).replace(tzinfo=None) if value.tzinfo else value
+
+async def get_agenda(user_id: str, start: datetime = None, end: datetime = None, limit: int = 50, after: str = None):
+    logger.info(f"Fetching agenda for user: {user_id}")
+    start = _to_utc(start) if start else datetime.utcnow()
+    end = _to_utc(end) if end else start + timedelta(days=AGENDA_DEFAULT_DAYS)
+    if end <= start:
+        raise HTTPException(status_code=400, detail="to must be after from")
+    if end - start > timedelta(days=AGENDA_MAX_DAYS):
+        raise HTTPException(status_code=400, detail=f"Window is limited to {AGENDA_MAX_DAYS} days")
+    cursor = None
+    if after:
+        # Cursor is "<start_time>|<meeting_id>" of the last meeting on the previous page
+        after_time, _, after_id = after.rpartition("|")
+        try:
+            cursor = (_to_utc(datetime.fromisoformat(after_time)), after_id)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        if not ObjectId.is_valid(after_id):
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+    meetings, next_cursor = await meeting_dao.get_agenda(user_id, start, end, limit, cursor)
+    if next_cursor:
+        next_cursor = f"{next_cursor[0].isoformat()}|{next_cursor[1]}"
+    return [meeting.to_response() for meeting in meetings], next_cursor
 
 async def join_meeting(meeting_id: str, user_id: str):
     logger.info(f"User {user_id} joining meeting: {meeting_id}")
-    meeting = await meeting_dao.find_by_id(meeting_id)
+    meeting = await meeting_dao.find_by_id(meeting_id, ("created_by",))
     if not meeting:
         raise HTTPException(status_code=404, detail="Meeting not found")
-    await meeting_dao.add_user_to_meeting(meeting_id, user_id)
+    if not await participant_writes.join(meeting_id, user_id):
+        raise HTTPException(status_code=400, detail="User already in meeting")
+    presence.heartbeat(meeting_id, user_id)
     return {"message": "User successfully joined the meeting"}
 
 async def leave_meeting(meeting_id: str, user_id: str):
     logger.info(f"User {user_id} leaving meeting: {meeting_id}")
-    meeting = await meeting_dao.find_by_id(meeting_id)
+    meeting = await meeting_dao.find_by_id(meeting_id, ("created_by",))
     if not meeting:
         raise HTTPException(status_code=404, detail="Meeting not found")
-    await meeting_dao.remove_user_from_meeting(meeting_id, user_id)
+    if not await participant_writes.leave(meeting_id, user_id):
+        raise HTTPException(status_code=404, detail="User not in meeting")
+    presence.leave(meeting_id, user_id)
     return {"message": "User successfully left the meeting"}
 
+async def get_online_participants(meeting_id: str, user_id: str):
+    logger.info(f"User {user_id} fetching online participants for meeting: {meeting_id}")
+    meeting = await meeting_dao.find_by_id(meeting_id, ("created_by",))
+    if not meeting:
+        raise HTTPException(status_code=404, detail="Meeting not found")
+    online = presence.online(meeting_id)
+    return {
+        "meeting_id": meeting_id,
+        "count": len(online),
+        "participants": [{"user_id": participant_id, "online_since": since} for participant_id, since in online.items()]
+    }
+
+async def delete_meeting(meeting_id: str, user_id: str):
+    logger.info(f"User {user_id} deleting meeting: {meeting_id}")
+    meeting = await meeting_dao.find_by_id(meeting_id, ("created_by",))
+    if not meeting:
+        raise HTTPException(status_code=404, detail="Meeting not found")
+    if meeting.created_by != user_id:
+        raise HTTPException(status_code=403, detail="Only meeting creator can delete meeting")
+    await meeting_dao.delete_meeting(meeting_id)
+    job_id = await job_runner.enqueue("meeting.delete", {"meeting_id": meeting_id}, user_id)
+    return {"message": "Meeting deleted successfully", "job_id": job_id}
+
+async def get_meeting_messages(meeting_id: str, user_id: str, limit: int = 50, before: str = None, after: str = None):
+    logger.info(f"User {user_id} fetching messages for meeting: {meeting_id}")
+    if before and after:
+        raise HTTPException(status_code=400, detail="Use either before or after, not both")
+    for cursor in (before, after):
+        if cursor and not ObjectId.is_valid(cursor):
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+    meeting = await meeting_dao.find_by_id(meeting_id, ("created_by", "class_id"))
+    if not meeting:
+        raise HTTPException(status_code=404, detail="Meeting not found")
+    # Chat history is for the class: its members, its creator and the meeting's creator
+    if meeting.created_by != user_id and not await class_dao.is_class_member(meeting.class_id, user_id):
+        class_obj = await class_dao.find_by_id(meeting.class_id, ("created_by",))
+        if not class_obj or class_obj.created_by != user_id:
+            raise HTTPException(status_code=403, detail="Only class members can read the meeting chat")
+    messages, next_cursor = await meeting_dao.get_messages(meeting_id, limit, before, after)
+    return [{
+        "message_id": str(message["_id"]),
+        "meeting_id": message["meeting_id"],
+        "user_id": message["user_id"],
+        "message": message["message"],
+        "timestamp": message["timestamp"].isoformat()
+    } for message in messages], next_cursor
+
+TRANSCRIPT_COLUMNS = ("message_id", "user_id", "message", "timestamp")
+
+async def export_meeting_transcript(meeting_id: str, user_id: str):
+    logger.info(f"User {user_id} exporting transcript of meeting: {meeting_id}")
+    meeting = await meeting_dao.find_by_id(meeting_id, ("created_by",))
+    if not meeting:
+        raise HTTPException(status_code=404, detail="Meeting not found")
+    if meeting.created_by != user_id:
+        raise HTTPException(status_code=403, detail="Only meeting creator can export the transcript")
+
+    async def rows():
+        async for messages in batched(meeting_dao.iter_messages(meeting_id, EXPORT_BATCH_SIZE)):
+            yield [{
+                "message_id": str(message["_id"]),
+                "user_id": message["user_id"],
+                "message": message["message"],
+                "timestamp": message["timestamp"],
+            } for message in messages]
+    return rows()
+
+# Background Jobs
+async def get_job(job_id: str, user_id: str):
+    job = await job_runner.get(job_id)
+    if not job or job.created_by != user_id:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return JobResponse(
+        job_id=job.job_id,
+        type=job.job_type,
+        status=job.status,
+        progress=job.progress,
+        attempts=job.attempts,
+        error=job.error,
+        created_at=job.created_at.isoformat(),
+        updated_at=job.updated_at.isoformat(),
+        finished_at=job.finished_at.isoformat() if job.finished_at else None
+    )
+
 # Helper Functions
 def create_access_token(user_id: str):
     expire = datetime.utcnow() + timedelta(minutes=JWT_EXPIRATION)
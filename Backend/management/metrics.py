@@ -0,0 +1,206 @@
+from bisect import bisect_left
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SEND_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.5)
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+def _format_labels(names, values, extra=None) -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+def _format_value(value) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+# Minimal Prometheus-style metric types. Series are keyed by a tuple of label values
+# so recording is a dict lookup plus an add, cheap enough to leave on in production.
+class Counter:
+    kind = "counter"
+
+    def __init__(self, name, help_text, labels=()):
+        self.name = name
+        self.help = help_text
+        self.labels = labels
+        self.values = {}
+
+    def inc(self, label_values=(), amount=1):
+        self.values[label_values] = self.values.get(label_values, 0) + amount
+
+    def samples(self):
+        for label_values, value in self.values.items():
+            yield self.name + _format_labels(self.labels, label_values), value
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def dec(self, label_values=(), amount=1):
+        self.inc(label_values, -amount)
+
+    def set(self, value, label_values=()):
+        self.values[label_values] = value
+
+class Histogram:
+    kind = "histogram"
+
+    def __init__(self, name, help_text, labels=(), buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.help = help_text
+        self.labels = labels
+        self.buckets = tuple(buckets)
+        self.series = {}
+
+    def observe(self, value, label_values=()):
+        series = self.series.get(label_values)
+        if series is None:
+            series = self.series[label_values] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+        series[0][bisect_left(self.buckets, value)] += 1
+        series[1] += value
+        series[2] += 1
+
+    def samples(self):
+        for label_values, (counts, total, count) in self.series.items():
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += bucket_count
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                yield self.name + "_bucket" + _format_labels(self.labels, label_values, f'le="{le}"'), cumulative
+            yield self.name + "_sum" + _format_labels(self.labels, label_values), total
+            yield self.name + "_count" + _format_labels(self.labels, label_values), count
+
+class MetricsRegistry:
+    def __init__(self, namespace="classmeet"):
+        self.namespace = namespace
+        self.metrics = []
+        self.collectors = []
+
+    def _register(self, metric):
+        self.metrics.append(metric)
+        return metric
+
+    # Metric names are given without the namespace, which is prefixed here as for collected stats
+    def counter(self, name, help_text, labels=()):
+        return self._register(Counter(f"{self.namespace}_{name}", help_text, labels))
+
+    def gauge(self, name, help_text, labels=()):
+        return self._register(Gauge(f"{self.namespace}_{name}", help_text, labels))
+
+    def histogram(self, name, help_text, labels=(), buckets=LATENCY_BUCKETS):
+        return self._register(Histogram(f"{self.namespace}_{name}", help_text, labels, buckets))
+
+    # Exposes a component's stats() dict as gauges at scrape time. With a label,
+    # the dict is expected to map that label's values to per-series stats dicts.
+    def register_stats(self, prefix, stats_fn, label=None):
+        self.collectors.append((prefix, stats_fn, label))
+
+    def _collect(self, prefix, stats_fn, label):
+        try:
+            stats = stats_fn()
+        except Exception as e:
+            logger.warning(f"Metrics collector {prefix} failed: {e}")
+            return []
+        rows = stats.items() if label else [(None, stats)]
+        gauges = {}
+        for label_value, values in rows:
+            for key, value in values.items():
+                if isinstance(value, bool) or not isinstance(value, (int, float)):
+                    continue
+                name = f"{self.namespace}_{prefix}_{key}"
+                gauge = gauges.get(name)
+                if gauge is None:
+                    gauge = gauges[name] = Gauge(name, f"{prefix} {key}", (label,) if label else ())
+                gauge.set(value, (label_value,) if label else ())
+        return gauges.values()
+
+    def render(self) -> str:
+        lines = []
+        collected = [metric for collector in self.collectors for metric in self._collect(*collector)]
+        for metric in self.metrics + collected:
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            for sample, value in metric.samples():
+                lines.append(f"{sample} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+registry = MetricsRegistry()
+
+http_requests = registry.counter("http_requests_total", "HTTP requests by route and status", ("method", "route", "status"))
+http_latency = registry.histogram("http_request_duration_seconds", "HTTP request latency by route", ("method", "route"))
+http_in_flight = registry.gauge("http_requests_in_flight", "HTTP requests currently being served")
+ws_active = registry.gauge("websocket_connections_active", "Open WebSocket connections", ("route",))
+ws_received = registry.counter("websocket_messages_received_total", "WebSocket messages received", ("route",))
+ws_sent = registry.counter("websocket_messages_sent_total", "WebSocket messages sent", ("route",))
+ws_send_latency = registry.histogram("websocket_send_duration_seconds", "Time to hand a WebSocket frame to the server", ("route",), SEND_BUCKETS)
+
+def _route_path(scope) -> str:
+    route = scope.get("route")
+    return route.path if route is not None else "unmatched"
+
+# Pure ASGI middleware: labels by route template (not raw path) so cardinality stays bounded
+class MetricsMiddleware:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http":
+            await self._http(scope, receive, send)
+        elif scope["type"] == "websocket":
+            await self._websocket(scope, receive, send)
+        else:
+            await self.app(scope, receive, send)
+
+    async def _http(self, scope, receive, send):
+        status = 500
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        http_in_flight.inc()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - started
+            http_in_flight.dec()
+            route = _route_path(scope)
+            http_requests.inc((scope["method"], route, str(status)))
+            http_latency.observe(elapsed, (scope["method"], route))
+
+    async def _websocket(self, scope, receive, send):
+        accepted = False
+        labels = ()
+
+        async def receive_wrapper():
+            message = await receive()
+            if message["type"] == "websocket.receive":
+                ws_received.inc(labels)
+            return message
+
+        async def send_wrapper(message):
+            nonlocal accepted, labels
+            if message["type"] == "websocket.send":
+                started = time.perf_counter()
+                await send(message)
+                ws_send_latency.observe(time.perf_counter() - started, labels)
+                ws_sent.inc(labels)
+                return
+            if message["type"] == "websocket.accept" and not accepted:
+                accepted = True
+                labels = (_route_path(scope),)
+                ws_active.inc(labels)
+            await send(message)
+
+        try:
+            await self.app(scope, receive_wrapper, send_wrapper)
+        finally:
+            if accepted:
+                ws_active.dec(labels)
\ No newline at end of file
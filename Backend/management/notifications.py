@@ -0,0 +1,77 @@
+import asyncio
+import logging
+import os
+from datetime import datetime
+from dotenv import load_dotenv
+from management.backplane import backplane
+
+# Load environment variables from .env
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+NOTIFY_BACKLOG = int(os.getenv("NOTIFY_BACKLOG", 100))
+NOTIFY_HEARTBEAT_SECONDS = float(os.getenv("NOTIFY_HEARTBEAT_SECONDS", 25))
+NOTIFY_IDLE_TIMEOUT_SECONDS = float(os.getenv("NOTIFY_IDLE_TIMEOUT_SECONDS", 120))
+
+# One open notifications socket. The backlog is bounded; when a client falls behind
+# the oldest events are dropped, since newer ones supersede them for a dashboard.
+class Subscription:
+    def __init__(self, user_id: str, backlog: int = NOTIFY_BACKLOG):
+        self.user_id = user_id
+        self.queue = asyncio.Queue(maxsize=backlog)
+        self.dropped = 0
+
+    def push(self, event):
+        if self.queue.full():
+            self.queue.get_nowait()
+            self.dropped += 1
+        self.queue.put_nowait(event)
+
+# In-process event bus: domain events are pushed to every open socket of the affected users
+class NotificationBus:
+    def __init__(self, backlog: int = NOTIFY_BACKLOG):
+        self.backlog = backlog
+        self._subscribers = {}
+        self.published = 0
+        self.delivered = 0
+        self.dropped = 0
+
+    def subscribe(self, user_id: str) -> Subscription:
+        subscription = Subscription(user_id, self.backlog)
+        self._subscribers.setdefault(user_id, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        subscriptions = self._subscribers.get(subscription.user_id)
+        if subscriptions is not None:
+            subscriptions.discard(subscription)
+            if not subscriptions:
+                del self._subscribers[subscription.user_id]
+        self.dropped += subscription.dropped
+
+    def publish(self, user_ids, event_type: str, data: dict):
+        event = {"type": event_type, "data": data, "timestamp": datetime.utcnow().isoformat()}
+        self.published += 1
+        backplane.publish("notify", event_type, {"user_ids": list(set(user_ids)), "event": event})
+
+    def deliver(self, event_type: str, payload: dict):
+        event = payload["event"]
+        for user_id in payload["user_ids"]:
+            for subscription in self._subscribers.get(user_id, ()):
+                subscription.push(event)
+                self.delivered += 1
+
+    def stats(self):
+        subscriptions = [s for group in self._subscribers.values() for s in group]
+        return {
+            "users": len(self._subscribers),
+            "subscriptions": len(subscriptions),
+            "published": self.published,
+            "delivered": self.delivered,
+            "dropped": self.dropped + sum(s.dropped for s in subscriptions),
+            "backlog_max": max((s.queue.qsize() for s in subscriptions), default=0),
+        }
+
+notification_bus = NotificationBus()
+backplane.subscribe("notify", notification_bus.deliver)
\ No newline at end of file
@@ -0,0 +1,86 @@
+import asyncio
+import bcrypt
+import logging
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from fastapi import HTTPException
+from dotenv import load_dotenv
+
+# Load environment variables from .env
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+# bcrypt releases the GIL, so threads are enough for most deployments;
+# "process" isolates the work completely at the cost of pickling per call.
+BCRYPT_EXECUTOR = os.getenv("BCRYPT_EXECUTOR", "thread")
+BCRYPT_WORKERS = int(os.getenv("BCRYPT_WORKERS", os.cpu_count() or 2))
+BCRYPT_MAX_PENDING = int(os.getenv("BCRYPT_MAX_PENDING", 64))
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", 12))
+
+def _hash(password: bytes) -> bytes:
+    return bcrypt.hashpw(password, bcrypt.gensalt(BCRYPT_ROUNDS))
+
+def _check(password: bytes, password_hash: bytes) -> bool:
+    return bcrypt.checkpw(password, password_hash)
+
+# Runs bcrypt on a bounded pool so hashing never blocks the event loop.
+# At most max_pending calls may be running or queued; the rest get a 503.
+class PasswordHasher:
+    def __init__(self, executor=BCRYPT_EXECUTOR, workers=BCRYPT_WORKERS, max_pending=BCRYPT_MAX_PENDING):
+        self.executor_kind = executor
+        self.workers = workers
+        self.max_pending = max_pending
+        self._executor = None
+        self.pending = 0
+        self.completed = 0
+        self.rejected = 0
+        self.total_seconds = 0.0
+
+    def _get_executor(self):
+        if self._executor is None:
+            if self.executor_kind == "process":
+                self._executor = ProcessPoolExecutor(max_workers=self.workers)
+            else:
+                self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="bcrypt")
+        return self._executor
+
+    async def _run(self, func, *args):
+        if self.pending >= self.max_pending:
+            self.rejected += 1
+            logger.warning("Password hashing queue full, rejecting request")
+            raise HTTPException(status_code=503, detail="Server busy, try again shortly", headers={"Retry-After": "1"})
+        self.pending += 1
+        started = time.perf_counter()
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._get_executor(), func, *args)
+        finally:
+            self.pending -= 1
+            self.completed += 1
+            self.total_seconds += time.perf_counter() - started
+
+    async def hash(self, password: str) -> bytes:
+        return await self._run(_hash, password.encode("utf-8"))
+
+    async def verify(self, password: str, password_hash) -> bool:
+        if not password or not password_hash:
+            return False
+        return await self._run(_check, password.encode("utf-8"), password_hash)
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    def stats(self):
+        return {
+            "executor": self.executor_kind,
+            "workers": self.workers,
+            "pending": self.pending,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "avg_ms": self.total_seconds * 1000 / self.completed if self.completed else 0.0,
+        }
+
+password_hasher = PasswordHasher()
\ No newline at end of file
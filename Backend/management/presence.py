@@ -0,0 +1,206 @@
+import asyncio
+import logging
+import os
+import time
+from datetime import datetime
+from dotenv import load_dotenv
+from management.backplane import backplane
+
+# Load environment variables from .env
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+PRESENCE_IDLE_TIMEOUT_SECONDS = float(os.getenv("PRESENCE_IDLE_TIMEOUT_SECONDS", 60))
+PRESENCE_FLUSH_INTERVAL_SECONDS = float(os.getenv("PRESENCE_FLUSH_INTERVAL_SECONDS", 5))
+# Each worker re-announces its sessions this often; a room entry not heard of for three
+# intervals belonged to a worker that died and is dropped
+PRESENCE_REFRESH_SECONDS = float(os.getenv("PRESENCE_REFRESH_SECONDS", 30))
+
+# Who is in which meeting, kept in memory and driven by chat sockets and heartbeats.
+# Each worker tracks its own sessions and evicts the idle ones; online/offline transitions
+# go through the backplane so every worker holds the same room view, and the owning worker
+# persists them to meeting_participants in batches through write_snapshot
+# (MeetingDAO.sync_participants). Going offline only removes rows presence itself created;
+# rows written by the join/leave API stay until the user leaves through it.
+class PresenceRegistry:
+    def __init__(self, write_snapshot=None, idle_timeout: float = PRESENCE_IDLE_TIMEOUT_SECONDS,
+                 flush_interval: float = PRESENCE_FLUSH_INTERVAL_SECONDS, refresh_interval: float = PRESENCE_REFRESH_SECONDS):
+        self.write_snapshot = write_snapshot
+        self.idle_timeout = idle_timeout
+        self.flush_interval = flush_interval
+        self.refresh_interval = refresh_interval
+        # (meeting_id, user_id) -> [open sockets, last seen, online since] for sessions on this worker
+        self._sessions = {}
+        # meeting_id -> {user_id: online since}, across all workers
+        self._rooms = {}
+        # (meeting_id, user_id) -> when its owning worker last announced it
+        self._heard = {}
+        self._last_refresh = time.monotonic()
+        # (meeting_id, user_id) -> (online, at), waiting to be persisted
+        self._changes = {}
+        self._task = None
+        self.evicted = 0
+        self.expired = 0
+        self.snapshots = 0
+        self.snapshot_failures = 0
+
+    def connect(self, meeting_id: str, user_id: str):
+        session = self._touch(meeting_id, user_id)
+        session[0] += 1
+
+    def disconnect(self, meeting_id: str, user_id: str):
+        session = self._sessions.get((meeting_id, user_id))
+        if session is None:
+            return
+        session[0] -= 1
+        if session[0] <= 0:
+            self._end(meeting_id, user_id)
+
+    # Any sign of life: a chat frame, a heartbeat frame or a REST join
+    def heartbeat(self, meeting_id: str, user_id: str):
+        self._touch(meeting_id, user_id)
+
+    def leave(self, meeting_id: str, user_id: str):
+        if (meeting_id, user_id) in self._sessions:
+            self._end(meeting_id, user_id)
+
+    def _touch(self, meeting_id: str, user_id: str):
+        session = self._sessions.get((meeting_id, user_id))
+        if session is None:
+            at = self._announce(meeting_id, user_id, True)
+            session = self._sessions[(meeting_id, user_id)] = [0, time.monotonic(), at.isoformat()]
+        else:
+            session[1] = time.monotonic()
+        return session
+
+    def _end(self, meeting_id: str, user_id: str):
+        del self._sessions[(meeting_id, user_id)]
+        self._announce(meeting_id, user_id, False)
+
+    def _announce(self, meeting_id: str, user_id: str, online: bool):
+        at = datetime.utcnow()
+        self._changes[(meeting_id, user_id)] = (online, at)
+        backplane.publish("presence", meeting_id, {"user_id": user_id, "online": online, "at": at.isoformat()})
+        return at
+
+    # One event per meeting with every session this worker still holds there
+    def refresh(self):
+        rooms = {}
+        for (meeting_id, user_id), (_, _, since) in self._sessions.items():
+            rooms.setdefault(meeting_id, {})[user_id] = since
+        for meeting_id, users in rooms.items():
+            backplane.publish("presence", meeting_id, {"refresh": users})
+        self._last_refresh = time.monotonic()
+
+    def deliver(self, meeting_id: str, payload: dict):
+        now = time.monotonic()
+        if "refresh" in payload:
+            room = self._rooms.setdefault(meeting_id, {})
+            for user_id, since in payload["refresh"].items():
+                room.setdefault(user_id, since)
+                self._heard[(meeting_id, user_id)] = now
+            return
+        if payload["online"]:
+            self._rooms.setdefault(meeting_id, {})[payload["user_id"]] = payload["at"]
+            self._heard[(meeting_id, payload["user_id"])] = now
+            return
+        self._drop(meeting_id, payload["user_id"])
+
+    def _drop(self, meeting_id: str, user_id: str):
+        self._heard.pop((meeting_id, user_id), None)
+        room = self._rooms.get(meeting_id)
+        if room is not None:
+            room.pop(user_id, None)
+            if not room:
+                del self._rooms[meeting_id]
+
+    # Room entries whose worker stopped re-announcing them, e.g. because it crashed
+    def expire_rooms(self) -> int:
+        deadline = time.monotonic() - 3 * self.refresh_interval
+        stale = [key for key, heard in self._heard.items() if heard < deadline]
+        for meeting_id, user_id in stale:
+            self._drop(meeting_id, user_id)
+        self.expired += len(stale)
+        return len(stale)
+
+    def online(self, meeting_id: str):
+        return self._rooms.get(meeting_id, {})
+
+    def is_online(self, meeting_id: str, user_id: str) -> bool:
+        return user_id in self._rooms.get(meeting_id, ())
+
+    def online_count(self, meeting_id: str) -> int:
+        return len(self._rooms.get(meeting_id, ()))
+
+    # The meeting was deleted: forget its sessions and room without writing anything, since
+    # the cascade is removing its participants
+    def close_meeting(self, meeting_id: str, payload=None):
+        for key in [key for key in self._sessions if key[0] == meeting_id]:
+            del self._sessions[key]
+        for key in [key for key in self._changes if key[0] == meeting_id]:
+            del self._changes[key]
+        for key in [key for key in self._heard if key[0] == meeting_id]:
+            del self._heard[key]
+        self._rooms.pop(meeting_id, None)
+
+    def evict_idle(self) -> int:
+        deadline = time.monotonic() - self.idle_timeout
+        # An open socket keeps its session; the server pings it and a dead one ends through disconnect
+        idle = [key for key, (sockets, last_seen, _) in self._sessions.items() if sockets <= 0 and last_seen < deadline]
+        for meeting_id, user_id in idle:
+            logger.info(f"Evicting idle user {user_id} from meeting {meeting_id}")
+            self._end(meeting_id, user_id)
+        self.evicted += len(idle)
+        return len(idle)
+
+    async def flush(self):
+        if not self._changes or self.write_snapshot is None:
+            return
+        changes, self._changes = self._changes, {}
+        joined = [(meeting_id, user_id, at) for (meeting_id, user_id), (online, at) in changes.items() if online]
+        left = [(meeting_id, user_id) for (meeting_id, user_id), (online, _) in changes.items() if not online]
+        try:
+            await self.write_snapshot(joined, left)
+            self.snapshots += 1
+        except Exception as e:
+            self.snapshot_failures += 1
+            logger.error(f"Failed to persist presence snapshot: {e}")
+            # Keep anything that changed again since, retry the rest on the next tick
+            for key, change in changes.items():
+                self._changes.setdefault(key, change)
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            self.evict_idle()
+            if time.monotonic() - self._last_refresh >= self.refresh_interval:
+                self.refresh()
+            self.expire_rooms()
+            await self.flush()
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def close(self):
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        # This worker's sessions end with it
+        for meeting_id, user_id in list(self._sessions):
+            self._end(meeting_id, user_id)
+        await self.flush()
+
+    def stats(self):
+        return {
+            "sessions": len(self._sessions),
+            "rooms": len(self._rooms),
+            "online": sum(len(room) for room in self._rooms.values()),
+            "pending_changes": len(self._changes),
+            "evicted": self.evicted,
+            "expired": self.expired,
+            "snapshots": self.snapshots,
+            "snapshot_failures": self.snapshot_failures,
+        }
\ No newline at end of file
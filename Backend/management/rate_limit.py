@@ -0,0 +1,122 @@
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from fastapi import Depends, HTTPException, Request
+from management.auth import get_current_user
+import logging
+import math
+import os
+import time
+from dotenv import load_dotenv
+
+# Load environment variables from .env
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+RATE_LIMIT_ENABLED = os.getenv("RATE_LIMIT_ENABLED", "True").lower() in ("1", "true", "yes")
+RATE_LIMIT_MAX_KEYS = int(os.getenv("RATE_LIMIT_MAX_KEYS", 100000))
+# Behind a reverse proxy every request comes from the proxy; trust its X-Forwarded-For instead
+RATE_LIMIT_TRUST_FORWARDED = os.getenv("RATE_LIMIT_TRUST_FORWARDED", "False").lower() in ("1", "true", "yes")
+
+# A policy allows bursts of up to `burst` calls, refilled evenly over `per_seconds`.
+# Override with RATE_LIMIT_<NAME>="<burst>/<per_seconds>", e.g. RATE_LIMIT_LOGIN="10/60".
+class RateLimitPolicy:
+    def __init__(self, name: str, burst: int, per_seconds: float):
+        self.name = name
+        self.burst = burst
+        self.rate = burst / per_seconds
+
+    @classmethod
+    def from_env(cls, name: str, default: str):
+        burst, _, per_seconds = os.getenv(f"RATE_LIMIT_{name.upper()}", default).partition("/")
+        return cls(name, int(burst), float(per_seconds))
+
+# Token bucket state. The in-process store is the default; a shared store (Redis, Mongo)
+# only has to implement take() to enforce limits across workers.
+class BucketStore(ABC):
+    @abstractmethod
+    def take(self, key: str, rate: float, burst: int, cost: float = 1) -> float:
+        # Returns 0 if the tokens were taken, otherwise the seconds until they would be available
+        pass
+
+class InMemoryBucketStore(BucketStore):
+    def __init__(self, max_keys: int = RATE_LIMIT_MAX_KEYS):
+        self.max_keys = max_keys
+        self._buckets = OrderedDict()
+
+    def take(self, key: str, rate: float, burst: int, cost: float = 1) -> float:
+        now = time.monotonic()
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            tokens = burst
+        else:
+            tokens = min(burst, bucket[0] + (now - bucket[1]) * rate)
+            self._buckets.move_to_end(key)
+        if tokens < cost:
+            self._buckets[key] = (tokens, now)
+            return (cost - tokens) / rate
+        self._buckets[key] = (tokens - cost, now)
+        # The least recently used bucket has been idle longest, so it is the closest to full;
+        # dropping it at worst hands that client a fresh burst
+        if len(self._buckets) > self.max_keys:
+            self._buckets.popitem(last=False)
+        return 0.0
+
+    def __len__(self):
+        return len(self._buckets)
+
+class RateLimiter:
+    def __init__(self, store: BucketStore = None, enabled: bool = RATE_LIMIT_ENABLED):
+        self.store = store if store is not None else InMemoryBucketStore()
+        self.enabled = enabled
+        self.allowed = {}
+        self.limited = {}
+
+    # Returns 0 when allowed, otherwise the seconds the caller should wait
+    def check(self, policy: RateLimitPolicy, key: str) -> float:
+        if not self.enabled:
+            return 0.0
+        retry_after = self.store.take(f"{policy.name}:{key}", policy.rate, policy.burst)
+        counts = self.limited if retry_after else self.allowed
+        counts[policy.name] = counts.get(policy.name, 0) + 1
+        return retry_after
+
+    def enforce(self, policy: RateLimitPolicy, key: str):
+        retry_after = self.check(policy, key)
+        if retry_after:
+            logger.warning(f"Rate limit {policy.name} exceeded by {key}")
+            raise HTTPException(status_code=429, detail="Too many requests",
+                                headers={"Retry-After": str(math.ceil(retry_after))})
+
+    def stats(self):
+        return {
+            name: {"allowed": self.allowed.get(name, 0), "limited": self.limited.get(name, 0)}
+            for name in set(self.allowed) | set(self.limited)
+        }
+
+rate_limiter = RateLimiter()
+
+LOGIN_POLICY = RateLimitPolicy.from_env("login", "10/60")
+REGISTER_POLICY = RateLimitPolicy.from_env("register", "5/60")
+CHAT_POLICY = RateLimitPolicy.from_env("chat", "30/10")
+BULK_ENROLL_POLICY = RateLimitPolicy.from_env("bulk_enroll", "10/60")
+
+def client_ip(request: Request) -> str:
+    if RATE_LIMIT_TRUST_FORWARDED:
+        forwarded = request.headers.get("x-forwarded-for")
+        if forwarded:
+            return forwarded.split(",")[0].strip()
+    return request.client.host if request.client else "unknown"
+
+# Route dependencies. Unauthenticated routes are limited per client address,
+# authenticated ones per user.
+def limit_by_ip(policy: RateLimitPolicy):
+    async def dependency(request: Request):
+        rate_limiter.enforce(policy, client_ip(request))
+    return dependency
+
+def limit_by_user(policy: RateLimitPolicy):
+    async def dependency(user_id: str = Depends(get_current_user)):
+        rate_limiter.enforce(policy, user_id)
+        return user_id
+    return dependency
\ No newline at end of file
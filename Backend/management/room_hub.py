@@ -0,0 +1,135 @@
+import asyncio
+import logging
+import os
+from dotenv import load_dotenv
+from management.backplane import backplane
+
+# Load environment variables from .env
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+CHAT_SEND_QUEUE_SIZE = int(os.getenv("CHAT_SEND_QUEUE_SIZE", 100))
+
+# One live WebSocket in a room, drained by its own writer task
+class Connection:
+    def __init__(self, websocket, user_id: str, max_queue: int = CHAT_SEND_QUEUE_SIZE):
+        self.websocket = websocket
+        self.user_id = user_id
+        self.queue = asyncio.Queue(maxsize=max_queue)
+        self.sent = 0
+        self.dropped = 0
+        self.closed = False
+        self._writer = None
+
+    def start(self):
+        self._writer = asyncio.create_task(self._write_loop())
+
+    async def stop(self):
+        if self._writer:
+            self._writer.cancel()
+            try:
+                await self._writer
+            except asyncio.CancelledError:
+                pass
+            self._writer = None
+
+    def enqueue(self, message: str) -> bool:
+        # A full queue means the client is not keeping up; drop the frame
+        # instead of making the whole room wait on it.
+        try:
+            self.queue.put_nowait(message)
+            return True
+        except asyncio.QueueFull:
+            self.dropped += 1
+            return False
+
+    async def _write_loop(self):
+        try:
+            while True:
+                message = await self.queue.get()
+                await self.websocket.send_text(message)
+                self.sent += 1
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning(f"Writer for user {self.user_id} stopped: {e}")
+
+# Registry of live chat connections per meeting; each message is fanned out once
+class RoomHub:
+    def __init__(self, max_queue: int = CHAT_SEND_QUEUE_SIZE):
+        self.max_queue = max_queue
+        self._rooms = {}
+        self._closing = set()
+        self.messages_broadcast = 0
+        self.frames_dropped = 0
+        self.rooms_closed = 0
+
+    async def connect(self, meeting_id: str, websocket, user_id: str) -> Connection:
+        connection = Connection(websocket, user_id, self.max_queue)
+        connection.start()
+        self._rooms.setdefault(meeting_id, set()).add(connection)
+        logger.info(f"User {user_id} connected to meeting {meeting_id} chat")
+        return connection
+
+    async def disconnect(self, meeting_id: str, connection: Connection):
+        room = self._rooms.get(meeting_id)
+        if room is not None:
+            room.discard(connection)
+            if not room:
+                del self._rooms[meeting_id]
+        self.frames_dropped += connection.dropped
+        await connection.stop()
+        logger.info(f"User {connection.user_id} disconnected from meeting {meeting_id} chat")
+
+    # Goes through the backplane so participants connected to other workers receive it too
+    def broadcast(self, meeting_id: str, message: str):
+        backplane.publish("chat", meeting_id, message)
+
+    def deliver(self, meeting_id: str, message: str) -> int:
+        delivered = 0
+        for connection in self._rooms.get(meeting_id, ()):
+            if connection.enqueue(message):
+                delivered += 1
+        self.messages_broadcast += 1
+        return delivered
+
+    # The meeting is gone: every socket in the room is closed and its handler stops reading
+    def close_room(self, meeting_id: str, payload=None):
+        room = self._rooms.pop(meeting_id, None)
+        if not room:
+            return
+        for connection in room:
+            connection.closed = True
+            task = asyncio.create_task(self._close(connection))
+            self._closing.add(task)
+            task.add_done_callback(self._closing.discard)
+        self.rooms_closed += 1
+        logger.info(f"Closed the chat of deleted meeting {meeting_id} ({len(room)} connections)")
+
+    async def _close(self, connection: Connection):
+        await connection.stop()
+        try:
+            await connection.websocket.close(code=1000, reason="Meeting deleted")
+        except Exception as e:
+            logger.warning(f"Failed to close the socket of user {connection.user_id}: {e}")
+
+    def connection_count(self, meeting_id: str) -> int:
+        return len(self._rooms.get(meeting_id, ()))
+
+    def stats(self):
+        connections = [c for room in self._rooms.values() for c in room]
+        depths = [c.queue.qsize() for c in connections]
+        return {
+            "rooms": len(self._rooms),
+            "connections": len(connections),
+            "messages_broadcast": self.messages_broadcast,
+            "frames_dropped": self.frames_dropped + sum(c.dropped for c in connections),
+            "rooms_closed": self.rooms_closed,
+            "queue_depth_total": sum(depths),
+            "queue_depth_max": max(depths, default=0),
+        }
+
+room_hub = RoomHub()
+backplane.subscribe("chat", room_hub.deliver)
+backplane.subscribe("meeting.closed", room_hub.close_room)
\ No newline at end of file